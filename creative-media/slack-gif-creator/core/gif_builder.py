@@ -6,13 +6,454 @@ This module provides the main interface for creating GIFs from programmatically
 generated frames, with automatic optimization for Slack's requirements.
 """
 
+from collections.abc import MutableSequence
 from pathlib import Path
 from typing import Optional
-import imageio.v3 as imageio
-from PIL import Image
+import struct
+from PIL import GifImagePlugin, Image
 import numpy as np
 
 
+# Palette sizes save_to_budget() tries, best first
+BUDGET_COLORS = (256, 192, 128, 96, 64, 48, 32, 24, 16, 8)
+
+# Dimension scales save_to_budget() tries, best first
+BUDGET_SCALES = (1.0, 0.75, 0.5, 0.375, 0.25)
+
+
+def abs_diff_sums(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Sum of absolute differences between two stacks of uint8 frames.
+
+    Works in integers: max - min of two uint8 values cannot overflow, and
+    frames small enough are summed in uint32, which is twice as fast.
+
+    Args:
+        a: Frames, shape (N, H, W, C)
+        b: Frames of the same shape
+
+    Returns:
+        int64 array of N sums
+    """
+    diff = np.maximum(a, b)
+    diff -= np.minimum(a, b)
+    diff = diff.reshape(len(diff), -1)
+    accumulator = np.uint32 if diff.shape[1] * 255 < 2 ** 32 else np.int64
+    return diff.sum(axis=1, dtype=accumulator).astype(np.int64)
+
+
+def consecutive_diff_sums(frames: np.ndarray, step: int = 1, batch: int = 4) -> np.ndarray:
+    """
+    Sum of absolute differences between each frame and the one before it.
+
+    Frames are compared a few at a time so the temporaries stay in cache.
+
+    Args:
+        frames: Frames, shape (N, H, W, 3)
+        step: Only compare every step-th row and column (1 = every pixel)
+        batch: Frame pairs compared per batch
+
+    Returns:
+        int64 array of N - 1 sums; entry i compares frames i and i + 1
+    """
+    if step > 1:
+        frames = frames[:, ::step, ::step]
+
+    sums = np.empty(max(0, len(frames) - 1), dtype=np.int64)
+    for start in range(0, len(sums), batch):
+        stop = min(start + batch, len(sums))
+        sums[start:stop] = abs_diff_sums(frames[start:stop], frames[start + 1:stop + 1])
+    return sums
+
+
+def gif_delays(durations: np.ndarray) -> list[int]:
+    """
+    Convert frame durations to GIF frame delays.
+
+    GIF delays are whole centiseconds. Rounding the running total instead
+    of each frame keeps the loop length right (15 fps would otherwise play
+    at 60 ms instead of 66.7 ms per frame). Browsers play delays under
+    20 ms as 100 ms, so no frame gets less than that.
+
+    Args:
+        durations: Frame durations in milliseconds
+
+    Returns:
+        Delays in milliseconds, each a multiple of 10
+    """
+    ends = np.rint(np.cumsum(durations) / 10).astype(np.int64)
+    centiseconds = np.diff(ends, prepend=0)
+    return (np.maximum(centiseconds, 2) * 10).tolist()
+
+
+def quantize_indexed(frames: np.ndarray, num_colors: int = 128,
+                     dither: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a stack of frames to indices into one global palette.
+
+    Args:
+        frames: Frames, shape (N, H, W, 3)
+        num_colors: Target number of colors (8-256)
+        dither: Floyd-Steinberg dithering (smoother gradients, larger files)
+
+    Returns:
+        Tuple of (palette indices, shape (N, H, W), and palette colors,
+        shape (K, 3))
+    """
+    dither_mode = Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE
+
+    # Build the palette from a few sample frames stacked into one tall
+    # image; the samples are the only frames copied
+    sample_size = min(5, len(frames))
+    sample_indices = [int(i * len(frames) / sample_size) for i in range(sample_size)]
+    samples = frames[sample_indices].reshape(-1, frames.shape[2], 3)
+    global_palette = Image.fromarray(samples, mode='RGB').quantize(colors=num_colors, method=2)
+
+    # Apply global palette to all frames. Dithering spreads a change over
+    # the rest of the frame, so pixels whose color did not change keep
+    # the previous frame's index; that keeps delta frames small
+    indices = np.empty(frames.shape[:3], dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        quantized = Image.fromarray(frame).quantize(palette=global_palette, dither=dither_mode)
+        indices[i] = np.asarray(quantized)
+        if i and dither:
+            unchanged = (frame == frames[i - 1]).all(axis=2)
+            indices[i][unchanged] = indices[i - 1][unchanged]
+
+    palette = np.array(global_palette.getpalette()[:3 * 256], dtype=np.uint8).reshape(-1, 3)
+    return indices, palette
+
+
+def quantize_frames(frames: np.ndarray, num_colors: int = 128,
+                    use_global_palette: bool = True, dither: bool = True) -> np.ndarray:
+    """
+    Reduce the colors of a stack of frames.
+
+    Args:
+        frames: Frames, shape (N, H, W, 3)
+        num_colors: Target number of colors (8-256)
+        use_global_palette: Use a single palette for all frames (better compression)
+        dither: Floyd-Steinberg dithering (smoother gradients, larger files)
+
+    Returns:
+        Color-reduced frames, shape (N, H, W, 3)
+    """
+    if use_global_palette and len(frames) > 1:
+        indices, palette = quantize_indexed(frames, num_colors, dither)
+        return palette[indices]
+
+    # Use per-frame quantization
+    optimized = np.empty_like(frames)
+    dither_mode = Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE
+    for i, frame in enumerate(frames):
+        quantized = Image.fromarray(frame).quantize(colors=num_colors, method=2, dither=dither_mode)
+        optimized[i] = np.asarray(quantized.convert('RGB'))
+    return optimized
+
+
+def changed_box(previous: np.ndarray, current: np.ndarray) -> Optional[tuple[int, int, int, int]]:
+    """
+    Bounding box of the pixels that differ between two index frames.
+
+    Args:
+        previous: Palette indices of the previous frame, shape (H, W)
+        current: Palette indices of the frame, shape (H, W)
+
+    Returns:
+        (left, top, right, bottom), exclusive, or None if nothing changed
+    """
+    changed = previous != current
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(changed.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def encode_gif(indices: np.ndarray, palette: np.ndarray, durations: np.ndarray) -> bytes:
+    """
+    Encode palette-indexed frames as a looping GIF in memory.
+
+    Frames after the first only store the rectangle that changed since the
+    previous one, with unchanged pixels in it transparent, and are drawn
+    over the previous frame (disposal 1, "do not dispose"). All frames
+    share the global color table; a frame that does not change merges its
+    delay into the previous one.
+
+    Args:
+        indices: Palette indices, shape (N, H, W)
+        palette: Palette colors, shape (K, 3), K <= 256
+        durations: Frame durations in milliseconds
+
+    Returns:
+        GIF file contents
+    """
+    height, width = indices.shape[1:]
+    delays = gif_delays(durations)
+
+    # Transparency needs a color table slot no frame uses; the table
+    # grows to a power of two anyway, so look there first
+    used = np.bincount(indices.ravel(), minlength=256) > 0
+    colors = int(np.flatnonzero(used)[-1]) + 1
+    bits = max(1, (colors - 1).bit_length())
+    free = np.flatnonzero(~used[:1 << bits])
+    if not len(free) and bits < 8:
+        bits += 1
+        free = np.flatnonzero(~used[:1 << bits])
+    transparency = int(free[0]) if len(free) else None
+
+    table = np.zeros((1 << bits, 3), dtype=np.uint8)
+    table[:min(len(palette), 1 << bits)] = palette[:1 << bits]
+
+    # Changed rectangle of each frame, merging the delays of unchanged ones
+    rects = [[0, (0, 0, width, height), delays[0]]]
+    for i in range(1, len(indices)):
+        box = changed_box(indices[i - 1], indices[i])
+        if box is None:
+            rects[-1][2] += delays[i]
+        else:
+            rects.append([i, box, delays[i]])
+
+    chunks = [
+        b'GIF89a',
+        struct.pack('<HHBBB', width, height, 0x80 | (bits - 1) << 4 | (bits - 1), 0, 0),
+        table.tobytes(),
+        # Loop forever
+        b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', 0) + b'\x00'
+    ]
+    for i, (left, top, right, bottom), delay in rects:
+        rect = indices[i, top:bottom, left:right]
+        params = {'duration': delay, 'disposal': 1}
+        if i and transparency is not None:
+            rect = np.where(indices[i - 1, top:bottom, left:right] == rect, transparency, rect)
+            params['transparency'] = transparency
+        image = Image.fromarray(np.ascontiguousarray(rect, dtype=np.uint8), mode='L')
+        chunks += GifImagePlugin.getdata(image, offset=(left, top), **params)
+    chunks.append(b';')
+
+    return b''.join(chunks)
+
+
+def resize_frames(frames: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize a stack of frames (LANCZOS) into a new array."""
+    resized = np.empty((len(frames), height, width, 3), dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        resized[i] = np.asarray(
+            Image.fromarray(frame).resize((width, height), Image.Resampling.LANCZOS)
+        )
+    return resized
+
+
+class FrameStore:
+    """
+    Frames of one size kept in a single contiguous (N, H, W, 3) uint8 buffer.
+
+    The buffer grows geometrically, so appending stays cheap, and frames are
+    dropped or reordered in place. Everything read from the store is a view.
+    Each frame has a display duration in milliseconds.
+    """
+
+    def __init__(self, width: int, height: int, capacity: int = 16):
+        """
+        Initialize frame store.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            capacity: Number of frames to allocate room for up front
+        """
+        self.width = width
+        self.height = height
+        self._buffer = np.empty((max(1, capacity), height, width, 3), dtype=np.uint8)
+        self._durations = np.empty(max(1, capacity), dtype=np.float64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def array(self) -> np.ndarray:
+        """View of the stored frames, shape (N, H, W, 3)."""
+        return self._buffer[:self._count]
+
+    @property
+    def durations(self) -> np.ndarray:
+        """View of the frame durations in milliseconds, shape (N,)."""
+        return self._durations[:self._count]
+
+    def reserve(self, count: int):
+        """Make room for at least count frames in total."""
+        if count <= len(self._buffer):
+            return
+        buffer = np.empty((count, self.height, self.width, 3), dtype=np.uint8)
+        buffer[:self._count] = self._buffer[:self._count]
+        self._buffer = buffer
+
+        durations = np.empty(count, dtype=np.float64)
+        durations[:self._count] = self._durations[:self._count]
+        self._durations = durations
+
+    def _write(self, index: int, frame: np.ndarray | Image.Image):
+        """
+        Copy a frame into slot index, resizing it if needed.
+
+        PIL images are resized and converted to RGB by PIL itself, then
+        copied straight from their array interface into the slot.
+        """
+        if not isinstance(frame, Image.Image) and frame.shape[:2] != (self.height, self.width):
+            frame = Image.fromarray(np.ascontiguousarray(frame))
+
+        if isinstance(frame, Image.Image):
+            if frame.mode != 'RGB':
+                frame = frame.convert('RGB')
+            if frame.size != (self.width, self.height):
+                frame = frame.resize((self.width, self.height), Image.Resampling.LANCZOS)
+            np.copyto(self._buffer[index], frame)
+        else:
+            np.copyto(self._buffer[index], frame[..., :3], casting='unsafe')
+
+    def append(self, frame: np.ndarray | Image.Image, duration: float):
+        """
+        Copy a frame into the store, resizing it if needed.
+
+        Args:
+            frame: Frame as numpy array (H, W, 3 or 4) or PIL Image
+            duration: Display time in milliseconds
+        """
+        if self._count == len(self._buffer):
+            self.reserve(len(self._buffer) * 2)
+
+        self._write(self._count, frame)
+        self._durations[self._count] = duration
+        self._count += 1
+
+    def insert(self, index: int, frame: np.ndarray | Image.Image, duration: float):
+        """Copy a frame into the store before frame index, moving the rest up."""
+        if isinstance(frame, np.ndarray) and np.shares_memory(frame, self._buffer):
+            frame = frame.copy()
+        if self._count == len(self._buffer):
+            self.reserve(len(self._buffer) * 2)
+
+        self._buffer[index + 1:self._count + 1] = self._buffer[index:self._count]
+        self._durations[index + 1:self._count + 1] = self._durations[index:self._count]
+        self._write(index, frame)
+        self._durations[index] = duration
+        self._count += 1
+
+    def replace(self, index: int, frame: np.ndarray | Image.Image):
+        """Overwrite frame index, keeping its duration."""
+        self._write(index, frame)
+
+    def keep(self, indices, durations: Optional[np.ndarray] = None) -> None:
+        """
+        Keep only the given frames, compacting the buffer in place.
+
+        Args:
+            indices: Increasing frame indices to keep
+            durations: New durations of the kept frames (default: unchanged)
+        """
+        count = 0
+        for index in indices:
+            if index != count:
+                self._buffer[count] = self._buffer[index]
+                self._durations[count] = self._durations[index]
+            count += 1
+        self._count = count
+
+        if durations is not None:
+            self._durations[:count] = durations
+
+    def resize(self, width: int, height: int):
+        """Resize every frame (LANCZOS) into a new buffer of the new size."""
+        if (width, height) == (self.width, self.height):
+            return
+        if self._count:
+            self._buffer = resize_frames(self._buffer[:self._count], width, height)
+        else:
+            self._buffer = np.empty((1, height, width, 3), dtype=np.uint8)
+        self._durations = self._durations[:max(1, self._count)].copy()
+        self.width = width
+        self.height = height
+
+    def clear(self):
+        """Drop all frames, keeping the allocated buffer."""
+        self._count = 0
+
+
+class FrameList(MutableSequence):
+    """
+    List-like view of a builder's frames; changes go to its FrameStore.
+
+    Frames read through it are views into the store, and frames added
+    through it are shown for the builder's default duration (1000 / fps).
+    """
+
+    def __init__(self, builder: 'GIFBuilder'):
+        self._builder = builder
+
+    @property
+    def _store(self) -> FrameStore:
+        return self._builder.store
+
+    def _default_duration(self) -> float:
+        return 1000 / self._builder.fps
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._store.array[index])
+        return self._store.array[index]
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, slice):
+            self._store.replace(range(len(self))[index], value)
+            return
+
+        positions = range(len(self))[index]
+        # Copy frames that are views into the store before moving it around
+        value = [np.array(frame) if isinstance(frame, np.ndarray) else frame for frame in value]
+        if index.step not in (None, 1):
+            if len(value) != len(positions):
+                raise ValueError(
+                    f"attempt to assign sequence of size {len(value)} "
+                    f"to extended slice of size {len(positions)}"
+                )
+            for position, frame in zip(positions, value):
+                self._store.replace(position, frame)
+            return
+
+        del self[index]
+        for offset, frame in enumerate(value):
+            self.insert(positions.start + offset, frame)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            dropped = set(range(len(self))[index])
+        else:
+            dropped = {range(len(self))[index]}
+        self._store.keep([i for i in range(len(self)) if i not in dropped])
+
+    def insert(self, index: int, frame: np.ndarray | Image.Image):
+        count = len(self)
+        if index < 0:
+            index = max(0, count + index)
+        self._store.insert(min(index, count), frame, self._default_duration())
+
+    def clear(self):
+        self._store.clear()
+
+    def __array__(self, dtype=None, copy=None):
+        array = self._store.array
+        if copy:
+            return np.array(array, dtype=dtype)
+        return array if dtype is None else array.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f'<FrameList of {len(self)} {self._store.width}x{self._store.height} frames>'
+
+
 class GIFBuilder:
     """Builder for creating optimized GIFs from frames."""
 
@@ -23,126 +464,169 @@ class GIFBuilder:
         Args:
             width: Frame width in pixels
             height: Frame height in pixels
-            fps: Frames per second
+            fps: Frames per second; sets the default frame duration
         """
         self.width = width
         self.height = height
         self.fps = fps
-        self.frames: list[np.ndarray] = []
+        self.store = FrameStore(width, height)
+
+    @property
+    def frames(self) -> FrameList:
+        """
+        The frames added so far, as a list of (H, W, 3) arrays.
 
-    def add_frame(self, frame: np.ndarray | Image.Image):
+        Changes made through it (append, assignment, del, ...) go to the
+        frame store; new frames get the default duration.
+        """
+        return FrameList(self)
+
+    @frames.setter
+    def frames(self, frames: list[np.ndarray | Image.Image]):
+        store = FrameStore(self.width, self.height, len(frames))
+        for frame in frames:
+            store.append(frame, 1000 / self.fps)
+        self.store = store
+
+    @property
+    def durations(self) -> np.ndarray:
+        """View of the frame durations in milliseconds, shape (N,)."""
+        return self.store.durations
+
+    def add_frame(self, frame: np.ndarray | Image.Image, duration: Optional[float] = None):
         """
         Add a frame to the GIF.
 
         Args:
             frame: Frame as numpy array or PIL Image (will be converted to RGB)
+            duration: How long to show the frame in milliseconds
+                (default: 1000 / fps)
         """
-        if isinstance(frame, Image.Image):
-            frame = np.array(frame.convert('RGB'))
+        self.store.append(frame, 1000 / self.fps if duration is None else duration)
+
+    def add_frames(self, frames: list[np.ndarray | Image.Image], duration: Optional[float] = None):
+        """Add multiple frames at once, each shown for duration ms (default: 1000 / fps)."""
+        if hasattr(frames, '__len__'):
+            self.store.reserve(len(self.store) + len(frames))
+        for frame in frames:
+            self.add_frame(frame, duration)
 
-        # Ensure frame is correct size
-        if frame.shape[:2] != (self.height, self.width):
-            pil_frame = Image.fromarray(frame)
-            pil_frame = pil_frame.resize((self.width, self.height), Image.Resampling.LANCZOS)
-            frame = np.array(pil_frame)
+    def hold(self, duration: Optional[float] = None, frames: Optional[int] = None):
+        """
+        Show the last frame longer, for a pause, without adding frames.
 
-        self.frames.append(frame)
+        Holding costs no bytes, where adding the same frame again costs a
+        frame. Give either duration or frames.
 
-    def add_frames(self, frames: list[np.ndarray | Image.Image]):
-        """Add multiple frames at once."""
-        for frame in frames:
-            self.add_frame(frame)
+        Args:
+            duration: Extra display time in milliseconds
+            frames: Extra display time in frames at the builder's fps
+        """
+        if not len(self.store):
+            raise ValueError("No frame to hold. Add a frame with add_frame() first.")
+        if frames is not None:
+            duration = frames * 1000 / self.fps
+        if duration is None:
+            raise ValueError("hold() needs a duration or a number of frames")
+        self.store.durations[-1] += duration
+
+    def decimate(self, keep_every: int) -> int:
+        """
+        Keep every keep_every-th frame, giving it the time of the frames it replaces.
+
+        Playback length is unchanged; motion just gets coarser.
+
+        Args:
+            keep_every: Keep one frame out of this many
+
+        Returns:
+            Number of frames removed
+        """
+        count = len(self.store)
+        if keep_every <= 1 or count < 2:
+            return 0
+        kept = np.arange(0, count, keep_every)
+        self.store.keep(kept, np.add.reduceat(self.store.durations, kept))
+        return count - len(kept)
 
-    def optimize_colors(self, num_colors: int = 128, use_global_palette: bool = True) -> list[np.ndarray]:
+    def optimize_colors(self, num_colors: int = 128, use_global_palette: bool = True,
+                        dither: bool = True) -> np.ndarray:
         """
         Reduce colors in all frames using quantization.
 
         Args:
             num_colors: Target number of colors (8-256)
             use_global_palette: Use a single palette for all frames (better compression)
+            dither: Floyd-Steinberg dithering (smoother gradients, larger files)
 
         Returns:
-            List of color-optimized frames
-        """
-        optimized = []
-
-        if use_global_palette and len(self.frames) > 1:
-            # Create a global palette from all frames
-            # Sample frames to build palette
-            sample_size = min(5, len(self.frames))
-            sample_indices = [int(i * len(self.frames) / sample_size) for i in range(sample_size)]
-            sample_frames = [self.frames[i] for i in sample_indices]
-
-            # Combine sample frames into a single image for palette generation
-            # Flatten each frame to get all pixels, then stack them
-            all_pixels = np.vstack([f.reshape(-1, 3) for f in sample_frames])  # (total_pixels, 3)
-
-            # Create a properly-shaped RGB image from the pixel data
-            # We'll make a roughly square image from all the pixels
-            total_pixels = len(all_pixels)
-            width = min(512, int(np.sqrt(total_pixels)))  # Reasonable width, max 512
-            height = (total_pixels + width - 1) // width  # Ceiling division
-
-            # Pad if necessary to fill the rectangle
-            pixels_needed = width * height
-            if pixels_needed > total_pixels:
-                padding = np.zeros((pixels_needed - total_pixels, 3), dtype=np.uint8)
-                all_pixels = np.vstack([all_pixels, padding])
-
-            # Reshape to proper RGB image format (H, W, 3)
-            img_array = all_pixels[:pixels_needed].reshape(height, width, 3).astype(np.uint8)
-            combined_img = Image.fromarray(img_array, mode='RGB')
-
-            # Generate global palette
-            global_palette = combined_img.quantize(colors=num_colors, method=2)
-
-            # Apply global palette to all frames
-            for frame in self.frames:
-                pil_frame = Image.fromarray(frame)
-                quantized = pil_frame.quantize(palette=global_palette, dither=1)
-                optimized.append(np.array(quantized.convert('RGB')))
-        else:
-            # Use per-frame quantization
-            for frame in self.frames:
-                pil_frame = Image.fromarray(frame)
-                quantized = pil_frame.quantize(colors=num_colors, method=2, dither=1)
-                optimized.append(np.array(quantized.convert('RGB')))
-
-        return optimized
+            Color-optimized frames, shape (N, H, W, 3)
+        """
+        return quantize_frames(self.store.array, num_colors, use_global_palette, dither)
 
-    def deduplicate_frames(self, threshold: float = 0.995) -> int:
+    def deduplicate_frames(self, threshold: float = 0.995, sample: int = 1) -> int:
         """
-        Remove duplicate or near-duplicate consecutive frames.
+        Merge duplicate or near-duplicate consecutive frames.
+
+        A frame is merged when its mean absolute difference from the last
+        kept frame is within (1 - threshold) * 255. Merged frames add their
+        duration to the kept frame, so playback timing is preserved.
+
+        Differences between consecutive frames are computed for the whole
+        stack at once in integer arithmetic. After a merge, the distance of
+        the next frame to the kept frame is bounded by the triangle
+        inequality from the consecutive differences, so a frame is only
+        compared with the kept frame itself when the bounds straddle the
+        limit.
 
         Args:
             threshold: Similarity threshold (0.0-1.0). Higher = more strict (0.995 = very similar).
+            sample: Prefilter on every sample-th row and column first; pairs
+                that differ by more than twice the limit there are taken to
+                differ without a full comparison (1 = compare every pixel)
 
         Returns:
             Number of frames removed
         """
-        if len(self.frames) < 2:
+        frames = self.store.array
+        count = len(frames)
+        if count < 2:
             return 0
 
-        deduplicated = [self.frames[0]]
-        removed_count = 0
+        values = frames[0].size
+        limit = (1.0 - threshold) * 255.0 * values
 
-        for i in range(1, len(self.frames)):
-            # Compare with previous frame
-            prev_frame = np.array(deduplicated[-1], dtype=np.float32)
-            curr_frame = np.array(self.frames[i], dtype=np.float32)
+        if sample > 1 and min(self.width, self.height) >= 8 * sample:
+            coarse = consecutive_diff_sums(frames, step=sample)
+            coarse_values = frames[0, ::sample, ::sample].size
+            candidates = np.flatnonzero(coarse * values <= 2.0 * limit * coarse_values) + 1
 
-            # Calculate similarity (normalized)
-            diff = np.abs(prev_frame - curr_frame)
-            similarity = 1.0 - (np.mean(diff) / 255.0)
-
-            # Keep frame if sufficiently different
-            # High threshold (0.995) means only remove truly identical frames
-            if similarity < threshold:
-                deduplicated.append(self.frames[i])
+            # Pairs ruled out by the prefilter count as different
+            pair_sums = np.full(count - 1, np.iinfo(np.int64).max, dtype=np.int64)
+            for start in range(0, len(candidates), 4):
+                chunk = candidates[start:start + 4]
+                pair_sums[chunk - 1] = abs_diff_sums(frames[chunk - 1], frames[chunk])
+        else:
+            pair_sums = consecutive_diff_sums(frames)
+
+        kept = [0]
+        # Bounds on the distance from the kept frame to the previous frame
+        low = high = 0
+        for i in range(1, count):
+            pair = int(pair_sums[i - 1])
+            if kept[-1] == i - 1:
+                low = high = pair
             else:
-                removed_count += 1
+                low, high = max(0, low - pair, pair - high), high + pair
+                if low <= limit < high:
+                    low = high = int(abs_diff_sums(frames[kept[-1]][None], frames[i][None])[0])
 
-        self.frames = deduplicated
+            if low > limit:
+                kept.append(i)
+
+        removed_count = count - len(kept)
+        if removed_count:
+            self.store.keep(kept, np.add.reduceat(self.store.durations, kept))
         return removed_count
 
     def save(self, output_path: str | Path, num_colors: int = 128,
@@ -154,22 +638,25 @@ class GIFBuilder:
             output_path: Where to save the GIF
             num_colors: Number of colors to use (fewer = smaller file)
             optimize_for_emoji: If True, optimize for <64KB emoji size
-            remove_duplicates: Remove duplicate consecutive frames
+            remove_duplicates: Merge near-duplicate consecutive frames
+                (identical frames are always merged), keeping their
+                combined display time
 
         Returns:
-            Dictionary with file info (path, size, dimensions, frame_count)
+            Dictionary with file info (path, size, dimensions, frame_count,
+            per-frame durations_ms)
         """
-        if not self.frames:
+        if not len(self.store):
             raise ValueError("No frames to save. Add frames with add_frame() first.")
 
         output_path = Path(output_path)
-        original_frame_count = len(self.frames)
+        original_frame_count = len(self.store)
 
         # Remove duplicate frames to reduce file size
-        if remove_duplicates:
-            removed = self.deduplicate_frames(threshold=0.98)
-            if removed > 0:
-                print(f"  Removed {removed} duplicate frames")
+        # Identical frames are merged either way; it loses nothing
+        removed = self.deduplicate_frames(threshold=0.98 if remove_duplicates else 1.0)
+        if removed > 0:
+            print(f"  Merged {removed} duplicate frames")
 
         # Optimize for emoji if requested
         if optimize_for_emoji:
@@ -177,59 +664,26 @@ class GIFBuilder:
                 print(f"  Resizing from {self.width}x{self.height} to 128x128 for emoji")
                 self.width = 128
                 self.height = 128
-                # Resize all frames
-                resized_frames = []
-                for frame in self.frames:
-                    pil_frame = Image.fromarray(frame)
-                    pil_frame = pil_frame.resize((128, 128), Image.Resampling.LANCZOS)
-                    resized_frames.append(np.array(pil_frame))
-                self.frames = resized_frames
+                self.store.resize(128, 128)
             num_colors = min(num_colors, 48)  # More aggressive color limit for emoji
 
             # More aggressive FPS reduction for emoji
-            if len(self.frames) > 12:
-                print(f"  Reducing frames from {len(self.frames)} to ~12 for emoji size")
-                # Keep every nth frame to get close to 12 frames
-                keep_every = max(1, len(self.frames) // 12)
-                self.frames = [self.frames[i] for i in range(0, len(self.frames), keep_every)]
+            if len(self.store) > 12:
+                print(f"  Reducing frames from {len(self.store)} to ~12 for emoji size")
+                # Keep every nth frame to get close to 12 frames; they
+                # take over the time of the dropped ones
+                self.decimate(max(1, len(self.store) // 12))
 
         # Optimize colors with global palette
-        optimized_frames = self.optimize_colors(num_colors, use_global_palette=True)
-
-        # Calculate frame duration in milliseconds
-        frame_duration = 1000 / self.fps
-
-        # Save GIF
-        imageio.imwrite(
-            output_path,
-            optimized_frames,
-            duration=frame_duration,
-            loop=0  # Infinite loop
-        )
+        indices, palette = quantize_indexed(self.store.array, num_colors)
 
-        # Get file info
-        file_size_kb = output_path.stat().st_size / 1024
-        file_size_mb = file_size_kb / 1024
+        # Save GIF; merged frames last longer
+        data = encode_gif(indices, palette, self.store.durations)
+        output_path.write_bytes(data)
 
-        info = {
-            'path': str(output_path),
-            'size_kb': file_size_kb,
-            'size_mb': file_size_mb,
-            'dimensions': f'{self.width}x{self.height}',
-            'frame_count': len(optimized_frames),
-            'fps': self.fps,
-            'duration_seconds': len(optimized_frames) / self.fps,
-            'colors': num_colors
-        }
-
-        # Print info
-        print(f"\n✓ GIF created successfully!")
-        print(f"  Path: {output_path}")
-        print(f"  Size: {file_size_kb:.1f} KB ({file_size_mb:.2f} MB)")
-        print(f"  Dimensions: {self.width}x{self.height}")
-        print(f"  Frames: {len(optimized_frames)} @ {self.fps} fps")
-        print(f"  Duration: {info['duration_seconds']:.1f}s")
-        print(f"  Colors: {num_colors}")
+        info = self._file_info(output_path, len(data), indices, num_colors)
+        self._print_info(info, original_frame_count)
+        file_size_kb = info['size_kb']
 
         # Warnings
         if optimize_for_emoji and file_size_kb > 64:
@@ -241,6 +695,156 @@ class GIFBuilder:
 
         return info
 
+    def save_to_budget(self, output_path: str | Path, max_bytes: int,
+                       max_colors: int = 256, scales: tuple[float, ...] = BUDGET_SCALES,
+                       max_keep_every: int = 4, remove_duplicates: bool = True) -> dict:
+        """
+        Save the best-looking GIF that fits in max_bytes.
+
+        Variants are ranked by dimensions, then frame count, then palette
+        size, then dithering, and encoded in memory; only the chosen one is
+        written. For each dimension and frame count the smallest variant
+        is tried first, and if it fits, a binary search over palette size
+        and dithering finds the best one that still fits (file size grows
+        with colors, though not strictly, so this may miss a variant one
+        step better).
+
+        Args:
+            output_path: Where to save the GIF
+            max_bytes: Size budget in bytes (e.g. 64 * 1024 for emoji)
+            max_colors: Largest palette to try
+            scales: Dimension scales to try, best first
+            max_keep_every: Most aggressive frame decimation to try (keep
+                one frame out of this many)
+            remove_duplicates: Merge near-duplicate consecutive frames first
+
+        Returns:
+            Dictionary with file info as save() returns it, plus 'budget':
+            max_bytes, whether it fits, the chosen num_colors, dither,
+            keep_every and dimensions, and the number of encode attempts
+        """
+        if not len(self.store):
+            raise ValueError("No frames to save. Add frames with add_frame() first.")
+
+        output_path = Path(output_path)
+        original_frame_count = len(self.store)
+
+        removed = self.deduplicate_frames(threshold=0.98 if remove_duplicates else 1.0)
+        if removed > 0:
+            print(f"  Merged {removed} duplicate frames")
+
+        # Best variant first: (colors, dither) pairs in quality order
+        ladder = [c for c in BUDGET_COLORS if c <= max_colors] or [max(2, max_colors)]
+        candidates = [(colors, dither) for colors in ladder for dither in (True, False)]
+
+        attempts = 0
+        chosen = None
+        smallest = None
+
+        def encode(frames, durations, keep_every, colors, dither):
+            nonlocal attempts, smallest
+            attempts += 1
+            optimized, palette = quantize_indexed(frames, colors, dither)
+            data = encode_gif(optimized, palette, durations)
+            if smallest is None or len(data) < len(smallest[0]):
+                smallest = (data, optimized, colors, dither, keep_every)
+            return data, optimized
+
+        for scale in scales:
+            width = max(1, round(self.width * scale))
+            height = max(1, round(self.height * scale))
+            scaled = resize_frames(self.store.array, width, height) if scale != 1.0 else self.store.array
+
+            for keep_every in range(1, max(1, max_keep_every) + 1):
+                if keep_every > 1 and len(scaled) <= keep_every:
+                    break
+                kept = np.arange(0, len(scaled), keep_every)
+                frames = scaled[kept]
+                durations = np.add.reduceat(self.store.durations, kept)
+
+                # Skip this frame count if even its smallest variant is too big
+                lo, hi = 0, len(candidates) - 1
+                data, optimized = encode(frames, durations, keep_every, *candidates[hi])
+                if len(data) > max_bytes:
+                    continue
+                best = (data, optimized, hi)
+
+                # Find the best candidate that fits
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    data, optimized = encode(frames, durations, keep_every, *candidates[mid])
+                    if len(data) <= max_bytes:
+                        best = (data, optimized, mid)
+                        hi = mid
+                    else:
+                        lo = mid + 1
+
+                colors, dither = candidates[best[2]]
+                chosen = (best[0], best[1], colors, dither, keep_every)
+                break
+            if chosen:
+                break
+
+        # If nothing fits, write the smallest variant seen
+        fits = chosen is not None
+        data, optimized, colors, dither, keep_every = chosen if fits else smallest
+
+        # Adopt the chosen variant so info and later saves match the file
+        if keep_every > 1:
+            self.decimate(keep_every)
+        height, width = optimized.shape[1:3]
+        if (width, height) != (self.width, self.height):
+            self.width = width
+            self.height = height
+            self.store.resize(width, height)
+
+        output_path.write_bytes(data)
+        info = self._file_info(output_path, len(data), optimized, colors)
+        info['budget'] = {
+            'max_bytes': max_bytes,
+            'fits': fits,
+            'attempts': attempts,
+            'num_colors': colors,
+            'dither': dither,
+            'keep_every': keep_every,
+            'dimensions': info['dimensions']
+        }
+
+        self._print_info(info, original_frame_count)
+        print(f"  Dither: {'on' if dither else 'off'}, keep every {keep_every} frame(s)")
+        print(f"  Encode attempts: {attempts}")
+        if not fits:
+            print(f"\n⚠️  WARNING: No variant fits in {max_bytes / 1024:.1f} KB; "
+                  f"wrote the smallest ({info['size_kb']:.1f} KB)")
+            print("   Try: smaller scales, more decimation, or simpler design")
+
+        return info
+
+    def _file_info(self, output_path: Path, size: int, frames: np.ndarray, num_colors: int) -> dict:
+        """File info dict of a saved GIF."""
+        durations = gif_delays(self.store.durations)
+        return {
+            'path': str(output_path),
+            'size_kb': size / 1024,
+            'size_mb': size / 1024 / 1024,
+            'dimensions': f'{self.width}x{self.height}',
+            'frame_count': len(frames),
+            'fps': self.fps,
+            'duration_seconds': sum(durations) / 1000,
+            'durations_ms': durations,
+            'colors': num_colors
+        }
+
+    def _print_info(self, info: dict, original_frame_count: int):
+        """Print the file info of a saved GIF."""
+        print(f"\n✓ GIF created successfully!")
+        print(f"  Path: {info['path']}")
+        print(f"  Size: {info['size_kb']:.1f} KB ({info['size_mb']:.2f} MB)")
+        print(f"  Dimensions: {info['dimensions']}")
+        print(f"  Frames: {info['frame_count']} (from {original_frame_count} at {self.fps} fps)")
+        print(f"  Duration: {info['duration_seconds']:.1f}s")
+        print(f"  Colors: {info['colors']}")
+
     def clear(self):
         """Clear all frames (useful for creating multiple GIFs)."""
-        self.frames = []
\ No newline at end of file
+        self.store.clear()
\ No newline at end of file
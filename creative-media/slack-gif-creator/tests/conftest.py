@@ -0,0 +1,17 @@
+"""
+Shared setup for the slack-gif-creator tests.
+
+Puts the skill directory on the import path, so tests import core.* the
+way the templates do.
+
+Run from the repository root:
+
+    python -m pytest creative-media/slack-gif-creator/tests
+"""
+import sys
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parent.parent
+
+if str(SKILL_DIR) not in sys.path:
+    sys.path.insert(0, str(SKILL_DIR))
@@ -0,0 +1,208 @@
+"""
+Tests for the slack-gif-creator GIFBuilder and its GIF writer.
+
+Run from the repository root:
+
+    python -m pytest creative-media/slack-gif-creator/tests
+"""
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from core.gif_builder import GIFBuilder, encode_gif, quantize_indexed
+
+RED, GREEN, BLUE = (255, 0, 0), (0, 255, 0), (0, 0, 255)
+
+
+def _solid(color, size=32):
+    return np.full((size, size, 3), color, dtype=np.uint8)
+
+
+def _colors(frames):
+    return [tuple(int(c) for c in frame[0, 0]) for frame in frames]
+
+
+def _moving_square(count, size=64):
+    """Frames of a white square moving over a gradient."""
+    ramp = np.linspace(0, 255, size, dtype=np.uint8)
+    background = np.stack(np.broadcast_arrays(ramp[None, :], ramp[:, None], 128), axis=-1)
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        x = (i * 3) % (size - 8)
+        frame[8:16, x:x + 8] = 255
+        frames.append(frame)
+    return frames
+
+
+def _decode(path):
+    """Fully composited RGB frames and their durations."""
+    with Image.open(path) as gif:
+        frames = [np.asarray(frame.convert('RGB')) for frame in ImageSequence.Iterator(gif)]
+        durations = []
+        for i in range(gif.n_frames):
+            gif.seek(i)
+            durations.append(gif.info['duration'])
+    return frames, durations
+
+
+def test_round_trip_keeps_colors(tmp_path):
+    builder = GIFBuilder(width=32, height=32, fps=10)
+    builder.add_frames([_solid(RED), _solid(GREEN), _solid(BLUE)])
+
+    info = builder.save(tmp_path / 'out.gif', num_colors=16)
+    frames, _ = _decode(tmp_path / 'out.gif')
+
+    assert _colors(frames) == [RED, GREEN, BLUE]
+    assert info['frame_count'] == 3
+
+
+def test_frames_are_copied_and_converted():
+    builder = GIFBuilder(width=32, height=32)
+    source = _solid(RED)
+    builder.add_frame(source)
+    source[:] = 0
+    builder.add_frame(Image.new('RGBA', (64, 64), GREEN + (255,)))
+    builder.add_frame(np.dstack([_solid(BLUE, size=16), np.full((16, 16), 255, np.uint8)]))
+
+    assert builder.store.array.shape == (3, 32, 32, 3)
+    assert _colors(builder.frames) == [RED, GREEN, BLUE]
+
+
+def test_frames_behave_like_a_list():
+    builder = GIFBuilder(width=32, height=32, fps=10)
+    builder.add_frame(_solid(RED), duration=300)
+
+    builder.frames.append(_solid(GREEN))
+    builder.frames.insert(0, _solid(BLUE))
+    builder.frames[1] = _solid(GREEN)
+    assert _colors(builder.frames) == [BLUE, GREEN, GREEN]
+    # Replacing a frame keeps its duration; new frames get 1000 / fps
+    assert builder.durations.tolist() == [100, 300, 100]
+
+    del builder.frames[0]
+    builder.frames[1:] = [_solid(RED), _solid(BLUE)]
+    assert _colors(builder.frames) == [GREEN, RED, BLUE]
+    assert _colors(builder.frames[::2]) == [GREEN, BLUE]
+    assert np.asarray(builder.frames).shape == (3, 32, 32, 3)
+
+    builder.frames = builder.frames[::-1]
+    assert _colors(builder.frames) == [BLUE, RED, GREEN]
+    assert len(builder.frames) == len(builder.store) == 3
+
+    builder.frames.clear()
+    assert len(builder.store) == 0
+
+
+def test_duplicate_frames_merge_their_durations(tmp_path):
+    builder = GIFBuilder(width=32, height=32, fps=10)
+    builder.add_frames([_solid(RED)] * 3 + [_solid(BLUE)] * 2)
+
+    info = builder.save(tmp_path / 'out.gif')
+    frames, durations = _decode(tmp_path / 'out.gif')
+
+    assert len(frames) == 2
+    assert durations == [300, 200]
+    assert info['duration_seconds'] == pytest.approx(0.5)
+
+
+def test_per_frame_durations_and_hold(tmp_path):
+    builder = GIFBuilder(width=32, height=32, fps=10)
+    builder.add_frame(_solid(RED))
+    builder.add_frame(_solid(GREEN), duration=250)
+    builder.add_frame(_solid(BLUE))
+    builder.hold(duration=400)
+
+    info = builder.save(tmp_path / 'out.gif', num_colors=16)
+    frames, durations = _decode(tmp_path / 'out.gif')
+
+    assert _colors(frames) == [RED, GREEN, BLUE]
+    assert durations == [100, 250, 500] == info['durations_ms']
+
+
+def test_template_pauses_become_one_held_frame(tmp_path):
+    from templates.pulse import create_pulse_animation
+
+    frames = create_pulse_animation(
+        object_type='circle', object_data={'radius': 20, 'color': RED},
+        num_frames=20, pulse_type='heartbeat', pulses=1.0,
+        center_pos=(32, 32), frame_width=64, frame_height=64
+    )
+    builder = GIFBuilder(width=64, height=64, fps=10)
+    builder.add_frames(frames)
+
+    info = builder.save(tmp_path / 'out.gif', remove_duplicates=False)
+    _, durations = _decode(tmp_path / 'out.gif')
+
+    assert info['frame_count'] < len(frames)
+    assert max(durations) >= 500
+    assert sum(durations) == 2000
+
+
+def test_save_to_budget_fits_the_budget(tmp_path):
+    builder = GIFBuilder(width=64, height=64, fps=20)
+    builder.add_frames(_moving_square(24))
+    indices, palette = quantize_indexed(builder.store.array, 256)
+    unconstrained = len(encode_gif(indices, palette, builder.durations))
+    budget = unconstrained // 2
+
+    info = builder.save_to_budget(tmp_path / 'out.gif', budget)
+
+    size = (tmp_path / 'out.gif').stat().st_size
+    assert info['budget']['fits']
+    assert size <= budget
+    assert info['size_kb'] * 1024 == size
+    frames, durations = _decode(tmp_path / 'out.gif')
+    assert len(frames) == info['frame_count']
+    assert sum(durations) == 24 * 50
+
+
+def test_save_to_budget_writes_smallest_when_nothing_fits(tmp_path):
+    builder = GIFBuilder(width=64, height=64, fps=20)
+    builder.add_frames(_moving_square(12))
+
+    info = builder.save_to_budget(tmp_path / 'out.gif', 100, scales=(1.0, 0.5))
+
+    assert not info['budget']['fits']
+    assert info['budget']['dimensions'] == '32x32'
+    assert (tmp_path / 'out.gif').stat().st_size > 100
+
+
+def test_delta_frames_store_only_the_changed_rectangle():
+    indices = np.zeros((3, 16, 16), dtype=np.uint8)
+    indices[1] = indices[0]
+    indices[1, 4:6, 10:13] = 1
+    indices[2] = indices[1]
+    palette = np.array([[0, 0, 0], [255, 255, 255]], dtype=np.uint8)
+
+    data = encode_gif(indices, palette, np.array([100.0, 100.0, 100.0]))
+
+    written = []
+    with Image.open(BytesIO(data)) as gif:
+        assert gif.n_frames == 2
+        for i in range(gif.n_frames):
+            gif.seek(i)
+            written.append((gif.tile[0][1], gif.info['duration'], gif.disposal_method))
+            composite = np.asarray(gif.convert('RGB'))
+            assert (composite[..., 0] == palette[indices[i], 0]).all()
+
+    (first_box, first_delay, _), (second_box, second_delay, disposal) = written
+    assert first_box == (0, 0, 16, 16) and first_delay == 100
+    # The unchanged last frame's time goes to the frame before it
+    assert second_box == (10, 4, 13, 6) and second_delay == 200
+    assert disposal == 1
+
+
+def test_delta_encoding_round_trips_motion(tmp_path):
+    builder = GIFBuilder(width=64, height=64, fps=20)
+    builder.add_frames(_moving_square(8))
+
+    builder.save(tmp_path / 'out.gif', num_colors=256, remove_duplicates=False)
+    frames, _ = _decode(tmp_path / 'out.gif')
+
+    assert len(frames) == 8
+    for i, frame in enumerate(frames):
+        x = (i * 3) % 56
+        assert (frame[8:16, x:x + 8] > 240).all()
@@ -8,6 +8,9 @@ import os
 import re
 from pathlib import Path
 
+# Frontmatter opens and closes with a line holding exactly this
+DELIMITER = '---'
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
@@ -17,17 +20,20 @@ def validate_skill(skill_path):
     if not skill_md.exists():
         return False, "SKILL.md not found"
     
-    # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
-    
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
-    
-    frontmatter = match.group(1)
+    # Read frontmatter only, stopping at the closing delimiter
+    with open(skill_md, encoding='utf-8-sig') as f:
+        if f.readline().rstrip() != DELIMITER:
+            return False, "No YAML frontmatter found"
+
+        lines = []
+        for line in f:
+            if line.rstrip() == DELIMITER:
+                break
+            lines.append(line)
+        else:
+            return False, "Invalid frontmatter format"
+
+    frontmatter = ''.join(lines)
     
     # Check required fields
     if 'name:' not in frontmatter:
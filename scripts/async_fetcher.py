@@ -0,0 +1,238 @@
+"""
+Async HTTP backend for downloading many files in parallel.
+
+Requires httpx (optional dependency); HTTP/2 additionally requires h2:
+
+    pip install "httpx[http2]"
+"""
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def is_available() -> bool:
+    """Check whether the async backend can be used."""
+    return httpx is not None
+
+
+def _write_file(path: Path, data: bytes):
+    """Write a downloaded file, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _connect_tracer(on_connect: Callable[[float], None], tls: bool) -> Callable:
+    """
+    Build an httpcore trace callback timing the setup of a new connection.
+
+    The time runs from the start of the TCP connect, which includes the DNS
+    lookup, to the end of the TLS handshake (or of the connect, without
+    TLS). Requests on a reused connection emit no connect events.
+
+    Args:
+        on_connect: Called with the setup time in milliseconds
+        tls: Whether the connection is set up with TLS
+    """
+    started = None
+    last_step = 'connection.start_tls.complete' if tls else 'connection.connect_tcp.complete'
+
+    async def trace(event: str, info: Dict):
+        nonlocal started
+        if event == 'connection.connect_tcp.started':
+            started = time.perf_counter()
+        elif event == last_step and started is not None:
+            on_connect((time.perf_counter() - started) * 1000)
+            started = None
+
+    return trace
+
+
+class AsyncDownloader:
+    """
+    Parallel file downloader on a pooled httpx client.
+
+    The client lives on a private event loop thread and is shared by every
+    caller, so keep-alive connections and per-host limits hold across all
+    concurrent fetch workers. download() is a plain blocking call and may be
+    used from any thread.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        max_per_host: int = 4,
+        http2: bool = False,
+        timeout: float = 30.0,
+        on_response: Optional[Callable] = None
+    ):
+        """
+        Initialize async downloader.
+
+        Args:
+            headers: Headers sent with every request
+            max_connections: Connection pool size
+            max_keepalive: Idle connections kept open for reuse
+            max_per_host: Maximum concurrent requests to a single host
+            http2: Negotiate HTTP/2 where the server supports it
+            timeout: Per-request timeout in seconds
+            on_response: Called with (url, headers, bytes) after each download
+        """
+        if httpx is None:
+            raise ImportError("The async backend requires httpx: pip install httpx")
+
+        self.headers = dict(headers or {})
+        self.max_per_host = max(1, max_per_host)
+        self.timeout = timeout
+        self.on_response = on_response
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+
+        self.http2 = http2
+        if http2 and importlib.util.find_spec('h2') is None:
+            logging.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+            self.http2 = False
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        """Start the event loop thread and client on first use."""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name='async-downloader', daemon=True
+            )
+            thread.start()
+
+            async def create_client():
+                return httpx.AsyncClient(
+                    headers=self.headers,
+                    limits=self.limits,
+                    http2=self.http2,
+                    timeout=self.timeout,
+                    follow_redirects=True
+                )
+
+            self._client = asyncio.run_coroutine_threadsafe(create_client(), loop).result()
+            self._loop = loop
+            self._thread = thread
+
+    def download(
+        self,
+        items: List[Tuple[str, Path]],
+        on_connect: Optional[Callable[[float], None]] = None
+    ) -> int:
+        """
+        Download files concurrently, blocking until all are written.
+
+        Args:
+            items: List of (url, target path) pairs
+            on_connect: Called with the setup time in milliseconds (DNS
+                lookup, TCP connect and TLS handshake) of each new
+                connection these downloads open, on the event loop thread
+
+        Returns:
+            Number of files downloaded
+
+        Raises:
+            Exception: The first download error, once the other downloads
+                are cancelled and have finished
+        """
+        if not items:
+            return 0
+
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._download_all(items, on_connect), self._loop
+        )
+        return future.result()
+
+    async def _download_all(
+        self,
+        items: List[Tuple[str, Path]],
+        on_connect: Optional[Callable[[float], None]]
+    ) -> int:
+        tasks = [
+            asyncio.ensure_future(self._download_one(url, path, on_connect))
+            for url, path in items
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            # Let the cancelled downloads close their files before the
+            # caller cleans up or retries; this also retrieves their errors
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return len(tasks)
+
+    async def _download_one(
+        self,
+        url: str,
+        path: Path,
+        on_connect: Optional[Callable[[float], None]] = None
+    ):
+        host = urlparse(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+
+        extensions = {}
+        if on_connect is not None:
+            extensions['trace'] = _connect_tracer(on_connect, url.startswith('https:'))
+
+        async with slot:
+            async with self._client.stream('GET', url, extensions=extensions) as response:
+                response.raise_for_status()
+                chunks = [chunk async for chunk in response.aiter_bytes()]
+
+        # Write on a worker thread so disk I/O does not stall the loop
+        data = b''.join(chunks)
+        received = len(data)
+        write = asyncio.get_running_loop().run_in_executor(None, _write_file, path, data)
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            # Finish the write before the caller cleans up
+            await asyncio.wait([write])
+            raise
+
+        logging.debug(f"Downloaded: {path}")
+        if self.on_response is not None:
+            self.on_response(url, response.headers, received)
+
+    def close(self):
+        """Close the client and stop the event loop thread."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            self._client = None
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Benchmark the skill fetch pipeline against a local mock GitHub.
+
+Each scenario generates repositories on a MockGitHubServer, drives
+SkillFetcher.run end to end in a fresh subprocess, and records wall time,
+request counts, bytes transferred and peak RSS. The mock server runs in
+a process of its own, so peak RSS is the fetcher's alone. Results are
+written as JSON so runs from different versions can be compared.
+
+Usage:
+    python benchmark_fetch.py [options]
+
+Options:
+    --skills N[,N...]     Number of skills per scenario (default: 10)
+    --files N[,N...]      Files per skill (default: 10)
+    --file-size BYTES     Size of each generated file (default: 4096)
+    --latency-ms MS       Latency added to every response (default: 20)
+    --error-rate P        Probability of a 502 on downloads (default: 0)
+    --layout L            'standalone', 'multi_skill' or 'mixed' (default: mixed)
+    --jobs N[,N...]       Concurrent jobs to try (default: 1,4)
+    --http-backend B      requests or httpx (default: requests)
+    --warm                Run each scenario twice and also report the warm run
+    --output PATH         Write JSON results to PATH
+    --compare PATH        Print a comparison against earlier JSON results
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def build_repositories(scenario: Dict) -> tuple:
+    """
+    Generate mock repositories and the matching skills config.
+
+    Args:
+        scenario: Scenario parameters
+
+    Returns:
+        Tuple of (list of MockRepository, list of skill config dicts)
+    """
+    from mock_github_server import MockRepository
+
+    rng = random.Random(scenario['seed'])
+    words = ['skill', 'claude', 'agent', 'vault', 'tool', 'prompt', 'docs', 'data']
+
+    def make_file(index: int) -> bytes:
+        text = ' '.join(rng.choice(words) for _ in range(scenario['file_size'] // 6))
+        return f'# Reference {index}\n\n{text}\n'.encode()[:scenario['file_size']]
+
+    def make_skill(name: str) -> Dict[str, bytes]:
+        files = {
+            'SKILL.md': (
+                f'---\nname: {name}\ndescription: Benchmark skill {name}\n---\n\n'
+                f'# {name}\n\nGenerated for benchmarking.\n'
+            ).encode()
+        }
+        for i in range(1, scenario['files']):
+            files[f'references/ref-{i:03d}.md'] = make_file(i)
+        return files
+
+    repos = []
+    skills = []
+    multi_files: Dict[str, bytes] = {'README.md': b'# Multi-skill repository\n'}
+
+    for i in range(scenario['skills']):
+        name = f'bench-skill-{i:03d}'
+        layout = scenario['layout']
+        if layout == 'mixed':
+            layout = 'standalone' if i % 2 == 0 else 'multi_skill'
+
+        if layout == 'standalone':
+            repos.append(MockRepository('bench', name, make_skill(name)))
+            github_url = f'https://github.com/bench/{name}'
+        else:
+            for path, content in make_skill(name).items():
+                multi_files[f'skills/{name}/{path}'] = content
+            github_url = f'https://github.com/bench/multi/tree/main/skills/{name}'
+
+        skills.append({
+            'id': name,
+            'name': name,
+            'github_url': github_url,
+            'repo_type': layout,
+            'target_folder': name,
+            'category': 'development',
+            'description': f'Benchmark skill {name}',
+            'author': 'bench',
+            'extraction_config': {'exclude_patterns': ['.git', '.github']}
+        })
+
+    if len(multi_files) > 1:
+        repos.append(MockRepository('bench', 'multi', multi_files))
+
+    return repos, skills
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KB, if measurable."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KB elsewhere
+        return peak // 1024 if sys.platform == 'darwin' else peak
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset // 1024
+        except Exception:
+            return None
+
+
+def serve_scenario(scenario: Dict, conn):
+    """
+    Server process: serve a scenario's repositories until told to stop.
+
+    Sends (environment, skills) once the server is up, then answers each
+    'stats' message with the server's stats until it receives 'stop'.
+
+    Args:
+        scenario: Scenario parameters
+        conn: Pipe connection to the fetcher process
+    """
+    from mock_github_server import MockGitHubServer
+
+    logging.basicConfig(level=logging.CRITICAL)
+    repos, skills = build_repositories(scenario)
+
+    server = MockGitHubServer(
+        latency=scenario['latency_ms'] / 1000,
+        error_rate=scenario['error_rate'],
+        seed=scenario['seed']
+    )
+    for repo in repos:
+        server.add_repository(repo)
+
+    with server:
+        conn.send((server.environment(), skills))
+        try:
+            while conn.recv() == 'stats':
+                conn.send(server.stats())
+        except EOFError:
+            pass
+
+
+def run_scenario(scenario: Dict) -> Dict:
+    """
+    Run one scenario's fetches in the current process.
+
+    The mock server runs in a child process so its repositories and
+    tarballs do not count towards this process's peak RSS.
+
+    Args:
+        scenario: Scenario parameters
+
+    Returns:
+        Result dict
+    """
+    logging.basicConfig(level=logging.CRITICAL)
+
+    conn, server_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=serve_scenario, args=(scenario, server_conn), daemon=True
+    )
+    server.start()
+
+    def server_stats() -> Dict:
+        conn.send('stats')
+        return conn.recv()
+
+    try:
+        environment, skills = conn.recv()
+    except EOFError:
+        server.join()
+        raise RuntimeError(f"Mock server for {scenario['name']} failed to start")
+
+    try:
+        with tempfile.TemporaryDirectory(prefix='skill_bench_') as work_dir:
+            os.environ.update(environment)
+            os.environ.pop('GITHUB_TOKEN', None)
+
+            # Imported after the environment points at the mock server
+            import fetch_external_skills
+
+            base_dir = Path(work_dir) / 'vault'
+            (base_dir / '.claude-plugin').mkdir(parents=True)
+            (base_dir / '.claude-plugin' / 'marketplace.json').write_text(json.dumps({
+                'name': 'bench',
+                'version': '1.0.0',
+                'description': 'Benchmark marketplace',
+                'owner': {'name': 'bench', 'email': 'bench@example.com'},
+                'plugins': []
+            }), encoding='utf-8')
+
+            config_path = Path(work_dir) / 'external_skills_config.json'
+            config_path.write_text(json.dumps({
+                'version': '1.0.0',
+                'output_directory': str(base_dir),
+                'skills': skills
+            }), encoding='utf-8')
+
+            runs = []
+            for _ in range(2 if scenario['warm'] else 1):
+                before = server_stats()
+                fetcher = fetch_external_skills.SkillFetcher(
+                    config_path=str(config_path),
+                    force=True,
+                    jobs=scenario['jobs'],
+                    http_backend=scenario['http_backend']
+                )
+
+                stdout = sys.stdout
+                sys.stdout = open(os.devnull, 'w')
+                start = time.perf_counter()
+                try:
+                    exit_code = fetcher.run()
+                finally:
+                    elapsed = time.perf_counter() - start
+                    sys.stdout.close()
+                    sys.stdout = stdout
+
+                after = server_stats()
+                runs.append({
+                    'wall_time_s': round(elapsed, 4),
+                    'exit_code': exit_code,
+                    'requests': after['requests'] - before['requests'],
+                    'requests_by_kind': {
+                        kind: count - before['by_kind'].get(kind, 0)
+                        for kind, count in after['by_kind'].items()
+                        if count - before['by_kind'].get(kind, 0)
+                    },
+                    'bytes_transferred': after['bytes_sent'] - before['bytes_sent'],
+                    'successful': fetcher.stats['successful'],
+                    'failed': fetcher.stats['failed']
+                })
+    finally:
+        conn.send('stop')
+        server.join(timeout=10)
+
+    result = dict(scenario)
+    result['cold'] = runs[0]
+    if len(runs) > 1:
+        result['warm'] = runs[1]
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+
+def run_in_subprocess(scenario: Dict) -> Dict:
+    """Run a scenario in a fresh interpreter so peak RSS is per scenario."""
+    completed = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '--scenario', json.dumps(scenario)],
+        capture_output=True,
+        text=True,
+        cwd=str(SCRIPTS_DIR)
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario['name']} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def scenario_name(scenario: Dict) -> str:
+    """Stable name used to match scenarios across result files."""
+    return (
+        f"{scenario['layout']}-s{scenario['skills']}-f{scenario['files']}"
+        f"-j{scenario['jobs']}-{scenario['http_backend']}"
+    )
+
+
+def compare_results(current: Dict, baseline_path: str) -> str:
+    """
+    Format a comparison of current results against a baseline file.
+
+    Args:
+        current: Results dict
+        baseline_path: Path to earlier results JSON
+
+    Returns:
+        Formatted comparison table
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {s['name']: s for s in json.load(f)['scenarios']}
+
+    lines = []
+    lines.append(f"{'Scenario':<40} {'Wall time':>20} {'Requests':>16}")
+    lines.append('-' * 78)
+    for scenario in current['scenarios']:
+        before = baseline.get(scenario['name'])
+        if before is None:
+            continue
+        old_t, new_t = before['cold']['wall_time_s'], scenario['cold']['wall_time_s']
+        old_r, new_r = before['cold']['requests'], scenario['cold']['requests']
+        change = (new_t - old_t) / old_t * 100 if old_t else 0
+        lines.append(
+            f"{scenario['name']:<40} {old_t:>7.2f}s → {new_t:>6.2f}s "
+            f"({change:+5.1f}%) {old_r:>6} → {new_r:<6}"
+        )
+    return '\n'.join(lines)
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the skill fetch pipeline against a local mock GitHub'
+    )
+    parser.add_argument('--skills', type=parse_int_list, default=[10],
+                        help='Number of skills per scenario (default: 10)')
+    parser.add_argument('--files', type=parse_int_list, default=[10],
+                        help='Files per skill (default: 10)')
+    parser.add_argument('--file-size', type=int, default=4096,
+                        help='Size of each generated file in bytes (default: 4096)')
+    parser.add_argument('--latency-ms', type=float, default=20,
+                        help='Latency added to every response (default: 20)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Probability of a 502 on downloads (default: 0)')
+    parser.add_argument('--layout', choices=['standalone', 'multi_skill', 'mixed'],
+                        default='mixed', help='Repository layout (default: mixed)')
+    parser.add_argument('--jobs', type=parse_int_list, default=[1, 4],
+                        help='Concurrent jobs to try (default: 1,4)')
+    parser.add_argument('--http-backend', choices=['requests', 'httpx'],
+                        default='requests', help='HTTP backend (default: requests)')
+    parser.add_argument('--warm', action='store_true',
+                        help='Run each scenario twice and also report the warm run')
+    parser.add_argument('--seed', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--output', metavar='PATH', help='Write JSON results to PATH')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='Compare against earlier JSON results')
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.scenario:
+        # Child process: run one scenario and print its result
+        sys.path.insert(0, str(SCRIPTS_DIR))
+        print(json.dumps(run_scenario(json.loads(args.scenario))))
+        return
+
+    scenarios = []
+    for skills, files, jobs in itertools.product(args.skills, args.files, args.jobs):
+        scenario = {
+            'skills': skills,
+            'files': files,
+            'file_size': args.file_size,
+            'latency_ms': args.latency_ms,
+            'error_rate': args.error_rate,
+            'layout': args.layout,
+            'jobs': jobs,
+            'http_backend': args.http_backend,
+            'warm': args.warm,
+            'seed': args.seed
+        }
+        scenario['name'] = scenario_name(scenario)
+        scenarios.append(scenario)
+
+    results = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scenarios': []
+    }
+
+    for scenario in scenarios:
+        result = run_in_subprocess(scenario)
+        results['scenarios'].append(result)
+        cold = result['cold']
+        print(
+            f"{scenario['name']:<40} {cold['wall_time_s']:>8.2f}s "
+            f"{cold['requests']:>6} req {cold['bytes_transferred'] / 1024:>9.1f} KB "
+            f"peak {result['peak_rss_kb'] or 0:>7} KB",
+            file=sys.stderr
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+    else:
+        print(output)
+
+    if args.compare:
+        print('\n' + compare_results(results, args.compare), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
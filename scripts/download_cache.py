@@ -0,0 +1,207 @@
+"""
+Download cache module for reusing fetched skill trees across runs.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class DownloadCache:
+    """
+    Content-addressed on-disk cache of extracted skill trees.
+
+    Entries are keyed by repository and commit SHA, so an entry never goes
+    stale: a new upstream commit simply produces a new key. Least recently
+    used entries are evicted once the cache grows past its size cap.
+
+    Trees are copied outside the lock, so parallel workers restore entries
+    concurrently; an entry being copied out is never evicted. The index
+    is written when put() changes it, and last-used times from get() are
+    written by save().
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize download cache.
+
+        Args:
+            cache_dir: Directory holding cached trees and the index
+            max_bytes: Evict least recently used entries above this size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / 'entries'
+        self.index_path = self.cache_dir / self.INDEX_FILE
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._readers: Dict[str, int] = {}
+        self._dirty = False
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+
+    @staticmethod
+    def make_key(
+        owner: str,
+        repo: str,
+        commit_sha: str,
+        path: Optional[str] = None,
+        exclude_patterns: Optional[List[str]] = None
+    ) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            commit_sha: Resolved commit SHA
+            path: Subfolder path within the repository (optional)
+            exclude_patterns: Exclude patterns applied when extracting
+
+        Returns:
+            Key such as 'owner/repo@sha:path'
+        """
+        key = f'{owner}/{repo}@{commit_sha}'
+        if path:
+            key += f':{path.strip("/")}'
+        if exclude_patterns:
+            digest = hashlib.sha1('\0'.join(sorted(exclude_patterns)).encode()).hexdigest()
+            key += f'#{digest[:12]}'
+        return key
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the entry index, dropping entries whose trees are missing."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable cache index {self.index_path}: {e}")
+            return {}
+
+        return {
+            key: entry for key, entry in index.items()
+            if (self.entries_dir / entry['dir']).is_dir()
+        }
+
+    def _save_index(self):
+        """Write the entry index atomically. Caller holds the lock."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.index_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def save(self):
+        """Write the entry index if get() changed it since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def get(self, key: str, target_dir: str) -> bool:
+        """
+        Copy a cached tree into target_dir if present.
+
+        Args:
+            key: Cache key from make_key()
+            target_dir: Directory to populate
+
+        Returns:
+            True on a cache hit, False on a miss
+        """
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                self.misses += 1
+                return False
+
+            entry['last_used'] = time.time()
+            self.hits += 1
+            self._dirty = True
+            # Pin the entry so eviction leaves it alone while it is copied
+            entry_name = entry['dir']
+            self._readers[entry_name] = self._readers.get(entry_name, 0) + 1
+
+        try:
+            shutil.copytree(self.entries_dir / entry_name, target_dir, dirs_exist_ok=True)
+        finally:
+            with self._lock:
+                self._readers[entry_name] -= 1
+                if not self._readers[entry_name]:
+                    del self._readers[entry_name]
+
+        logging.info(f"Cache hit: {key}")
+        return True
+
+    def put(self, key: str, source_dir: str):
+        """
+        Store a copy of source_dir under key.
+
+        Args:
+            key: Cache key from make_key()
+            source_dir: Directory to cache
+        """
+        entry_name = hashlib.sha256(key.encode()).hexdigest()[:32]
+
+        # Copy outside the lock, then swap into place
+        staging = Path(tempfile.mkdtemp(dir=self.entries_dir, prefix='.staging_'))
+        try:
+            shutil.copytree(source_dir, staging, dirs_exist_ok=True)
+            size = sum(p.stat().st_size for p in staging.rglob('*') if p.is_file())
+
+            with self._lock:
+                if entry_name in self._readers:
+                    # Being copied out; the key pins the commit, so the
+                    # cached tree is the same
+                    return
+
+                entry_path = self.entries_dir / entry_name
+                if entry_path.exists():
+                    shutil.rmtree(entry_path)
+                os.replace(staging, entry_path)
+
+                self.index[key] = {
+                    'dir': entry_name,
+                    'size': size,
+                    'last_used': time.time()
+                }
+                self._evict()
+                self._save_index()
+
+            logging.debug(f"Cached {key} ({size} bytes)")
+
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _evict(self):
+        """Drop least recently used entries until under the size cap."""
+        total = sum(entry['size'] for entry in self.index.values())
+        by_age = sorted(self.index.items(), key=lambda item: item[1]['last_used'])
+
+        for key, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            if entry['dir'] in self._readers:
+                continue
+
+            shutil.rmtree(self.entries_dir / entry['dir'], ignore_errors=True)
+            del self.index[key]
+            total -= entry['size']
+            logging.debug(f"Evicted from cache: {key}")
@@ -0,0 +1,159 @@
+"""
+ETag store module for replaying GitHub API responses on 304 Not Modified.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Entries kept at most; the least recently used go first
+MAX_ENTRIES = 2000
+
+# Entries not used for this long are dropped on save
+MAX_AGE_DAYS = 30
+
+
+class ETagStore:
+    """
+    Persistent map of request (URL + Accept header) to ETag and body.
+
+    GitHub answers a conditional request with 304 when nothing changed, and
+    304s do not count against the rate limit. Keeping the last body lets the
+    caller carry on as if it had received a full 200 response.
+
+    Many keys are pinned to a commit or tree SHA and go stale as soon as
+    upstream moves, so each entry records when it was last used and save()
+    drops entries that are too old or beyond the size cap.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = MAX_ENTRIES,
+        max_age_days: float = MAX_AGE_DAYS
+    ):
+        """
+        Initialize ETag store.
+
+        Args:
+            path: JSON file to persist entries in
+            max_entries: Entries kept on save, most recently used first
+            max_age_days: Drop entries unused for longer than this on save
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 3600
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(url: str, accept: Optional[str] = None) -> str:
+        """Build the store key for a request."""
+        return f'{accept or ""} {url}'
+
+    def _load(self):
+        """Load entries from disk, starting empty if unreadable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable ETag store {self.path}: {e}")
+
+    def lookup(self, url: str, accept: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get the stored entry for a request.
+
+        Args:
+            url: Request URL
+            accept: Accept header sent with the request
+
+        Returns:
+            Dict with 'etag', 'body' and 'content_type', or None
+        """
+        with self._lock:
+            entry = self.entries.get(self.make_key(url, accept))
+            if entry is not None:
+                entry['used'] = int(time.time())
+                self.dirty = True
+            return entry
+
+    def store(
+        self,
+        url: str,
+        accept: Optional[str],
+        etag: str,
+        body: str,
+        content_type: Optional[str] = None
+    ):
+        """
+        Remember a response for later conditional requests.
+
+        Args:
+            url: Request URL
+            accept: Accept header sent with the request
+            etag: ETag response header
+            body: Response body text
+            content_type: Content-Type response header
+        """
+        with self._lock:
+            self.entries[self.make_key(url, accept)] = {
+                'etag': etag,
+                'body': body,
+                'content_type': content_type,
+                'used': int(time.time())
+            }
+            self.dirty = True
+
+    def prune(self) -> int:
+        """
+        Drop entries unused for more than max_age_days, then the least
+        recently used ones beyond max_entries.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            cutoff = time.time() - self.max_age
+            recent = sorted(
+                (item for item in self.entries.items() if item[1].get('used', 0) >= cutoff),
+                key=lambda item: item[1].get('used', 0),
+                reverse=True
+            )[:self.max_entries]
+
+            dropped = len(self.entries) - len(recent)
+            if dropped:
+                self.entries = dict(recent)
+                self.dirty = True
+            return dropped
+
+    def save(self):
+        """Prune old entries and write the rest to disk atomically if anything changed."""
+        dropped = self.prune()
+        if dropped:
+            logging.debug(f"Dropped {dropped} stale ETags")
+
+        with self._lock:
+            if not self.dirty:
+                return
+            snapshot = dict(self.entries)
+            self.dirty = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.etags_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            logging.debug(f"Saved {len(snapshot)} ETags to {self.path}")
+        except Exception as e:
+            Path(tmp_path).unlink(missing_ok=True)
+            logging.warning(f"Failed to save ETag store {self.path}: {e}")
@@ -15,6 +15,26 @@ Options:
     --verbose           Enable verbose logging
     --no-marketplace    Skip marketplace.json update
     --force             Force re-fetch existing skills
+    --jobs N            Download up to N skills concurrently (default: 1)
+    --validate-workers N
+                        Validate up to N skills concurrently (default: 1)
+    --publish-workers N Move up to N skills into place concurrently
+                        (default: 1)
+    --queue-size N      Skills that may wait between pipeline stages
+                        (default: 4)
+    --max-per-host N    Limit concurrent requests per host (default: 4)
+    --cache-dir DIR     Download cache directory (default: .cache/downloads)
+    --cache-max-mb N    Download cache size cap in MB (default: 512)
+    --no-cache          Disable the download cache and stored ETags
+    --sync              Only re-fetch skills whose upstream tree changed
+                        (with --dry-run: just report stale skills)
+    --http-backend B    'requests' (default) or 'httpx' for parallel file
+                        downloads on an async connection pool
+    --http2             Use HTTP/2 with the httpx backend
+    --resume            Continue an interrupted run from its journal
+                        without re-downloading finished skills
+    --no-telemetry      Do not record timings in logs/fetch_telemetry.jsonl
+                        (summarize them with telemetry.py)
 """
 
 import argparse
@@ -24,18 +44,81 @@ import sys
 import tempfile
 import shutil
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 
 import utils
 import github_fetcher
+import github_graphql
+import fetch_pipeline
+import download_cache
+import etag_store
+import fetch_journal
+import skill_lockfile
+import telemetry
+import metadata_index
 import skill_processor
+import schemas
 import marketplace_updater
 
 
+class SkillJob:
+    """State of one skill as it moves through the fetch pipeline."""
+
+    def __init__(
+        self,
+        index: int,
+        total: int,
+        skill_config: Dict,
+        base_dir: str = '.',
+        revision: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize skill job.
+
+        Args:
+            index: 1-based position of the skill in this run
+            total: Number of skills in this run
+            skill_config: Skill configuration dict
+            base_dir: Directory the skill is published into
+            revision: Upstream 'commit' and 'tree' SHAs to fetch, if known
+        """
+        self.index = index
+        self.total = total
+        self.skill_config = skill_config
+        self.skill_id = skill_config['id']
+        self.target_path = Path(base_dir) / skill_config['target_folder']
+        self.revision = revision
+
+        # None while in progress, then 'successful', 'failed', 'skipped'
+        # or 'dry_run'
+        self.status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.metadata: Optional[Dict] = None
+        self.temp_dir: Optional[str] = None
+
+
 class SkillFetcher:
     """Main orchestrator for fetching external skills."""
 
-    def __init__(self, config_path: str, dry_run: bool = False, force: bool = False):
+    def __init__(
+        self,
+        config_path: str,
+        dry_run: bool = False,
+        force: bool = False,
+        jobs: int = 1,
+        max_per_host: int = 4,
+        cache_dir: Optional[str] = None,
+        cache_max_mb: int = 512,
+        use_cache: bool = True,
+        sync: bool = False,
+        http_backend: str = 'requests',
+        http2: bool = False,
+        validate_workers: int = 1,
+        publish_workers: int = 1,
+        queue_size: int = 4,
+        resume: bool = False,
+        use_telemetry: bool = True
+    ):
         """
         Initialize skill fetcher.
 
@@ -43,29 +126,82 @@ class SkillFetcher:
             config_path: Path to external_skills_config.json
             dry_run: If True, simulate without writing files
             force: If True, re-fetch existing skills
+            jobs: Number of skills to download concurrently
+            max_per_host: Maximum concurrent requests to a single host
+            cache_dir: Download cache directory (default: .cache/downloads
+                under the output directory)
+            cache_max_mb: Download cache size cap in megabytes
+            use_cache: If False, always download from GitHub and make
+                unconditional API requests
+            sync: If True, re-fetch only skills whose upstream tree SHA
+                differs from the lockfile
+            http_backend: 'requests' or 'httpx' (see GitHubFetcher)
+            http2: Use HTTP/2 with the httpx backend
+            validate_workers: Number of skills to validate concurrently
+            publish_workers: Number of skills to move into place concurrently
+            queue_size: Skills that may wait between two pipeline stages
+            resume: If True, continue an interrupted run from its journal
+                instead of starting over
+            use_telemetry: If True, append per-skill stage timings and
+                counters to logs/fetch_telemetry.jsonl under the output
+                directory
         """
         self.config_path = config_path
         self.dry_run = dry_run
         self.force = force
+        self.jobs = max(1, jobs)
+        self.max_per_host = max(1, max_per_host)
+        self.cache_dir = cache_dir
+        self.cache_max_mb = cache_max_mb
+        self.use_cache = use_cache
+        self.sync = sync
+        self.http_backend = http_backend
+        self.http2 = http2
+        self.validate_workers = max(1, validate_workers)
+        self.publish_workers = max(1, publish_workers)
+        self.queue_size = max(1, queue_size)
+        self.resume = resume
+        self.use_telemetry = use_telemetry
         self.config = None
         self.fetcher = None
+        self.cache = None
+        self.etags = None
+        self.lockfile = None
+        self.metadata_index = None
+        self.journal = None
+        self.telemetry = None
         self.base_dir = None
 
+        # Per-stage timings of the last pipeline run
+        self.stage_timings: Dict[str, Dict] = {}
+        self.stage_timings_wall = 0.0
+
+        # Upstream revisions resolved for --sync, by skill ID
+        self.upstream: Dict[str, Dict[str, str]] = {}
+
         # Stats
         self.stats = {
             'total': 0,
             'successful': 0,
             'failed': 0,
             'skipped': 0,
+            'stale': [],
             'errors': []
         }
 
     def load_config(self) -> bool:
-        """Load configuration file."""
+        """Load configuration file and check it against the config schema."""
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 self.config = json.load(f)
 
+            errors = schemas.schema_errors('skills_config', self.config)
+            if errors:
+                logging.error(f"Invalid configuration {self.config_path}:")
+                for error in errors:
+                    logging.error(f"  {error}")
+                return False
+
             self.base_dir = self.config.get('output_directory', '.')
             logging.info(f"Loaded configuration with {len(self.config['skills'])} skills")
             return True
@@ -95,22 +231,148 @@ class SkillFetcher:
         logging.info("Environment validation passed")
         return True
 
+    def validate_skill_configs(self, skills: List[Dict]) -> List[Dict]:
+        """
+        Check each skill entry against the skill config schema.
+
+        Invalid entries are reported, counted as failed and left out.
+
+        Args:
+            skills: List of skill configurations
+
+        Returns:
+            List of valid skill configurations
+        """
+        valid = []
+        for i, skill_config in enumerate(skills):
+            errors = schemas.schema_errors('skill_config', skill_config)
+            if not errors:
+                valid.append(skill_config)
+                continue
+
+            skill_id = skill_config.get('id', f'skills[{i}]')
+            error_msg = f"Invalid config for {skill_id}: {'; '.join(errors)}"
+            logging.error(error_msg)
+            self.stats['total'] += 1
+            self._record_result('failed', error_msg)
+
+        return valid
+
     def check_conflicts(self, skills: List[Dict]) -> List[str]:
         """Check for name conflicts with existing skills."""
         conflicts = []
 
+        # Targets written by the run being resumed are not conflicts
+        resumed = set(self.journal.in_target()) if self.resume and self.journal else set()
+
         for skill in skills:
+            if skill['id'] in resumed:
+                continue
+
             target_folder = skill['target_folder']
             conflict_path = skill_processor.check_name_conflicts(
                 target_folder, self.base_dir
             )
 
-            if conflict_path and not self.force:
+            if conflict_path and not (self.force or self.sync):
                 conflicts.append(target_folder)
                 logging.warning(f"Conflict: {target_folder} already exists")
 
         return conflicts
 
+    def resolve_upstream_batch(self, skills: List[Dict]) -> Dict[str, Dict[str, str]]:
+        """
+        Resolve the upstream revision of many skills in batched GraphQL queries.
+
+        Default branches learned along the way are handed to the fetcher so
+        it does not look them up again. Skills missing from the result are
+        left to the REST API.
+
+        Args:
+            skills: List of skill configurations
+
+        Returns:
+            Dict mapping skill IDs to dicts with 'commit' and 'tree' SHAs
+        """
+        targets = {}
+        for skill_config in skills:
+            try:
+                owner, repo, branch, subfolder_path = utils.parse_github_url(
+                    skill_config['github_url']
+                )
+            except ValueError:
+                continue
+
+            # Mirror resolve_skill_source: without a subfolder in the URL the
+            # default branch is fetched
+            ref = branch if subfolder_path else None
+            if skill_config['repo_type'] == 'standalone':
+                subfolder_path = None
+            targets[skill_config['id']] = (owner, repo, ref, subfolder_path)
+
+        resolver = github_graphql.GraphQLResolver(token=self.fetcher.token)
+        try:
+            results = resolver.resolve(list(targets.values()))
+        finally:
+            resolver.close()
+
+        revisions = {}
+        for skill_id, target in targets.items():
+            result = results.get(target)
+            if result is None:
+                continue
+            if result['default_branch']:
+                self.fetcher.default_branches[(target[0], target[1])] = result['default_branch']
+            revisions[skill_id] = {'commit': result['commit'], 'tree': result['tree']}
+
+        logging.info(
+            f"Resolved {len(revisions)} of {len(targets)} skills "
+            f"in {resolver.requests} GraphQL requests"
+        )
+        return revisions
+
+    def check_sync_status(self, skills: List[Dict]) -> List[str]:
+        """
+        Compare each skill's upstream tree SHA and extraction config against the lockfile.
+
+        With a token, revisions are resolved in batched GraphQL queries;
+        the REST API covers the rest. Resolved revisions are kept so the
+        fetch can be pinned to them.
+
+        Args:
+            skills: List of skill configurations
+
+        Returns:
+            IDs of skills that are missing locally, changed upstream or
+            whose extraction config changed
+        """
+        stale = []
+        resolved = self.resolve_upstream_batch(skills) if self.fetcher.token else {}
+
+        for skill_config in skills:
+            skill_id = skill_config['id']
+            revision = resolved.get(skill_id)
+            if revision is None:
+                owner, repo, branch, subfolder_path = self.fetcher.resolve_skill_source(
+                    skill_config['github_url'], skill_config['repo_type']
+                )
+                revision = self.fetcher.resolve_revision(owner, repo, branch, subfolder_path)
+            if revision is None:
+                logging.warning(f"Could not resolve upstream of {skill_id}, leaving as is")
+                continue
+
+            self.upstream[skill_id] = revision
+            target_path = Path(self.base_dir) / skill_config['target_folder']
+
+            if target_path.exists() and self.lockfile.is_current(skill_config, revision):
+                logging.debug(f"Up to date: {skill_id} ({revision['tree'][:12]})")
+            else:
+                stale.append(skill_id)
+                logging.info(f"Stale: {skill_id} (upstream tree {revision['tree'][:12]})")
+
+        logging.info(f"{len(stale)} of {len(skills)} skills need fetching")
+        return stale
+
     def fetch_skill(self, skill_config: Dict) -> bool:
         """
         Fetch a single skill.
@@ -121,77 +383,289 @@ class SkillFetcher:
         Returns:
             True if successful, False otherwise
         """
-        skill_id = skill_config['id']
+        status, error_msg, _ = self._fetch_skill(skill_config)
+        self._record_result(status, error_msg)
+        return status != 'failed'
+
+    def _existing_metadata(self, target_path: Path) -> Optional[Dict]:
+        """Frontmatter of an already present skill, if it validates."""
+        if not target_path.exists():
+            return None
+
+        validation = skill_processor.validate_skill(str(target_path), self.metadata_index)
+        return validation['metadata'] if validation['valid'] else None
+
+    def _fetch_skill(self, skill_config: Dict) -> Tuple[str, Optional[str], Optional[Dict]]:
+        """
+        Fetch a single skill without touching shared stats.
+
+        Runs the download, validate and publish steps back to back. Safe to
+        call from worker threads.
+
+        Args:
+            skill_config: Skill configuration dict
+
+        Returns:
+            Tuple of (status, error message, frontmatter metadata). Status is
+            one of 'successful', 'failed', 'skipped' or 'dry_run'; metadata
+            is None if the skill is not present and valid.
+        """
+        job = SkillJob(1, 1, skill_config, self.base_dir)
+        for step in (self._download_skill, self._validate_skill, self._publish_skill):
+            step(job)
+        return job.status, job.error, job.metadata
+
+    def _fail(self, job: SkillJob, reason: object):
+        """Mark a job failed and log why."""
+        job.status = 'failed'
+        job.error = f"Failed to fetch {job.skill_id}: {reason}"
+        logging.error(job.error)
+
+    def _download_skill(self, job: SkillJob):
+        """
+        Download step: decide whether to fetch, then fetch into a temp dir.
+
+        Tarballs are extracted while they stream in, so extraction is part
+        of this step rather than the next.
+        """
+        skill_config = job.skill_config
         target_folder = skill_config['target_folder']
-        target_path = Path(self.base_dir) / target_folder
 
-        logging.info(f"Fetching skill: {skill_id}")
+        logging.info(f"[{job.index}/{job.total}] Processing: {job.skill_id}")
+
+        if self.resume and self.journal is not None and self._resume_skill(job):
+            return
+
+        logging.info(f"Fetching skill: {job.skill_id}")
 
         # Check if already exists
-        if target_path.exists() and not self.force:
-            logging.info(f"Skill already exists, skipping: {target_folder}")
-            self.stats['skipped'] += 1
-            return True
+        if job.target_path.exists() and not self.force:
+            if not self.sync:
+                logging.info(f"Skill already exists, skipping: {target_folder}")
+                job.status = 'skipped'
+                return
+            if job.skill_id not in self.stats['stale']:
+                logging.info(f"Skill is up to date, skipping: {target_folder}")
+                job.status = 'skipped'
+                return
 
         if self.dry_run:
-            logging.info(f"[DRY RUN] Would fetch {skill_id} to {target_path}")
-            return True
-
-        # Create temp directory for fetching
-        temp_dir = tempfile.mkdtemp(prefix=f'skill_fetch_{skill_id}_')
+            logging.info(f"[DRY RUN] Would fetch {job.skill_id} to {job.target_path}")
+            job.status = 'dry_run'
+            return
+
+        # Fetch into a journaled work directory that survives an
+        # interruption, or a throwaway temp directory. Tarballs still
+        # stream into extraction; a copy kept in the archive directory
+        # lets --resume continue an interrupted download.
+        archive_dir = None
+        if self.journal is not None:
+            work_dir = self.journal.work_dir(job.skill_id)
+            job.temp_dir = str(work_dir / 'skill')
+            archive_dir = str(work_dir / 'archive')
+            Path(job.temp_dir).mkdir(parents=True, exist_ok=True)
+            self.journal.mark(job.skill_id, 'downloading', job.revision)
+        else:
+            job.temp_dir = tempfile.mkdtemp(prefix=f'skill_fetch_{job.skill_id}_')
 
         try:
             # Fetch from GitHub
             success = self.fetcher.fetch_skill(
                 github_url=skill_config['github_url'],
                 repo_type=skill_config['repo_type'],
-                target_folder=temp_dir,
-                extraction_config=skill_config['extraction_config']
+                target_folder=job.temp_dir,
+                extraction_config=skill_config['extraction_config'],
+                commit_sha=(job.revision or {}).get('commit'),
+                archive_dir=archive_dir
             )
 
             if not success:
-                raise Exception("GitHub fetch failed")
+                self._fail(job, "GitHub fetch failed")
+            elif self.journal is not None:
+                self.journal.mark(job.skill_id, 'downloaded')
+
+        except Exception as e:
+            self._fail(job, e)
+
+    def _resume_skill(self, job: SkillJob) -> bool:
+        """
+        Pick a skill up where the journaled run left it.
+
+        Skills already moved into place are done. Skills whose download
+        completed go straight on to validation with the files in their
+        work directory. Anything else is downloaded again, reusing whatever
+        the interrupted download left behind.
+
+        Returns:
+            True if the download step has nothing left to do
+        """
+        entry = self.journal.get(job.skill_id)
+        if entry is None:
+            return False
+
+        if entry.get('revision'):
+            job.revision = entry['revision']
+
+        work_dir = self.journal.work_dir(job.skill_id) / 'skill'
+
+        if entry['state'] in ('moved', 'published') and job.target_path.exists():
+            logging.info(f"Resuming: {job.skill_id} was already moved into place")
+            job.status = 'successful'
+            return True
+
+        if entry['state'] in ('downloaded', 'validated') and work_dir.is_dir():
+            logging.info(f"Resuming: reusing downloaded files of {job.skill_id}")
+            job.temp_dir = str(work_dir)
+            return True
+
+        return False
 
-            # Validate skill
-            validation = skill_processor.validate_skill(temp_dir)
+    def _validate_skill(self, job: SkillJob):
+        """Validate step: check the downloaded skill, or read an existing one."""
+        if job.status is not None:
+            if job.status != 'failed':
+                job.metadata = self._existing_metadata(job.target_path)
+            return
+
+        try:
+            validation = skill_processor.validate_skill(job.temp_dir)
             if not validation['valid']:
                 errors = ', '.join(validation['errors'])
-                raise Exception(f"Validation failed: {errors}")
+                self._fail(job, f"Validation failed: {errors}")
+                if self.journal is not None:
+                    # Do not resume from a download that fails validation
+                    self.journal.forget(job.skill_id)
+                return
 
             if validation['warnings']:
                 for warning in validation['warnings']:
                     logging.warning(f"  {warning}")
 
-            # Move to target location
+            job.metadata = validation['metadata']
+            if self.journal is not None:
+                self.journal.mark(job.skill_id, 'validated')
+
+        except Exception as e:
+            self._fail(job, e)
+
+    def _publish_skill(self, job: SkillJob):
+        """Publish step: move a validated skill into place and clean up."""
+        try:
+            if job.status is not None:
+                return
+
+            # Move to target location, or apply only what changed
+            target_path = job.target_path
             if target_path.exists():
-                logging.info(f"Removing existing skill: {target_path}")
-                shutil.rmtree(target_path)
+                changes = utils.sync_directory(job.temp_dir, str(target_path))
+                logging.info(
+                    f"Updated existing skill {target_path}: "
+                    f"{changes['written']} written, {changes['renamed']} renamed, "
+                    f"{changes['deleted']} deleted, {changes['unchanged']} unchanged"
+                )
+            else:
+                shutil.move(job.temp_dir, target_path)
 
-            shutil.move(temp_dir, target_path)
-            logging.info(f"Successfully fetched: {skill_id} -> {target_path}")
+            if self.metadata_index is not None:
+                self.metadata_index.store(str(target_path / 'SKILL.md'), job.metadata)
 
-            self.stats['successful'] += 1
-            return True
+            if self.journal is not None:
+                self.journal.mark(job.skill_id, 'moved')
+                self.journal.discard_work(job.skill_id)
+
+            logging.info(f"Successfully fetched: {job.skill_id} -> {target_path}")
+            job.status = 'successful'
 
         except Exception as e:
-            error_msg = f"Failed to fetch {skill_id}: {e}"
-            logging.error(error_msg)
-            self.stats['errors'].append(error_msg)
-            self.stats['failed'] += 1
-            return False
+            job.metadata = None
+            self._fail(job, e)
 
         finally:
-            # Cleanup temp directory if it still exists
-            if Path(temp_dir).exists():
+            # Cleanup temp directory if it still exists; journaled work
+            # directories are kept for --resume
+            if self.journal is None and job.temp_dir and Path(job.temp_dir).exists():
                 try:
-                    shutil.rmtree(temp_dir)
+                    shutil.rmtree(job.temp_dir)
                 except Exception as e:
-                    logging.warning(f"Failed to cleanup temp dir {temp_dir}: {e}")
+                    logging.warning(f"Failed to cleanup temp dir {job.temp_dir}: {e}")
+
+    def _record_result(self, status: str, error_msg: Optional[str] = None):
+        """Fold a single skill outcome into the run stats."""
+        if status in ('successful', 'failed', 'skipped'):
+            self.stats[status] += 1
+
+        if error_msg:
+            self.stats['errors'].append(error_msg)
+
+    def _in_log_context(self, stage: str, step):
+        """Wrap a pipeline step so its log records are grouped per skill and it is timed."""
+        def run(job: SkillJob):
+            with utils.log_context(job.index):
+                if self.telemetry is None:
+                    step(job)
+                    return
+                with self.telemetry.span(job.skill_id, stage):
+                    step(job)
+        return run
+
+    def _run_pipeline(self, jobs: List[SkillJob]) -> Iterator[SkillJob]:
+        """
+        Run jobs through the download, validate and publish stages.
+
+        Each skill's log records are held back and released as a block
+        once every earlier skill has been reported, so the log reads the
+        same as a sequential run.
+
+        Yields:
+            Finished jobs in config order
+        """
+        pipeline = fetch_pipeline.Pipeline(
+            [
+                ('download', self._in_log_context('download', self._download_skill), self.jobs),
+                (
+                    'validate',
+                    self._in_log_context('validate', self._validate_skill),
+                    self.validate_workers
+                ),
+                (
+                    'publish',
+                    self._in_log_context('publish', self._publish_skill),
+                    self.publish_workers
+                )
+            ],
+            queue_size=self.queue_size
+        )
+
+        logging.info(
+            f"Fetching with {self.jobs} download, {self.validate_workers} validate "
+            f"and {self.publish_workers} publish workers"
+        )
+
+        pending: Dict[int, SkillJob] = {}
+        next_index = 1
+
+        try:
+            with utils.ordered_log_capture() as log_buffer:
+                for job in pipeline.run(jobs):
+                    pending[job.index] = job
+                    while next_index in pending:
+                        log_buffer.flush_key(next_index)
+                        yield pending.pop(next_index)
+                        next_index += 1
+        finally:
+            self.stage_timings = pipeline.timings()
+            self.stage_timings_wall = pipeline.wall_time
 
     def fetch_all_skills(self, skills: List[Dict]) -> Dict[str, Dict]:
         """
         Fetch all skills.
 
+        Skills stream through a download, a validate and a publish stage,
+        so downloads overlap with validating and publishing earlier skills.
+        Stats and metadata are always folded in config order. Metadata
+        comes from the validation each fetch already ran, so no skill is
+        validated twice.
+
         Args:
             skills: List of skill configurations
 
@@ -200,28 +674,32 @@ class SkillFetcher:
         """
         skill_metadata = {}
 
-        self.stats['total'] = len(skills)
+        self.stats['total'] += len(skills)
         logging.info(f"Starting to fetch {len(skills)} skills...")
 
-        for i, skill_config in enumerate(skills, 1):
-            skill_id = skill_config['id']
-            logging.info(f"[{i}/{len(skills)}] Processing: {skill_id}")
+        jobs = [
+            SkillJob(
+                i, len(skills), skill_config, self.base_dir,
+                self.upstream.get(skill_config['id'])
+            )
+            for i, skill_config in enumerate(skills, 1)
+        ]
 
-            success = self.fetch_skill(skill_config)
+        for job in self._run_pipeline(jobs):
+            self._record_result(job.status, job.error)
+            skill_id = job.skill_id
+            if self.telemetry is not None:
+                self.telemetry.finish_skill(skill_id, job.status)
 
-            if success:
-                # Get metadata for marketplace
-                target_folder = skill_config['target_folder']
-                target_path = Path(self.base_dir) / target_folder
+            if job.status == 'successful' and job.revision and self.lockfile is not None:
+                self.lockfile.record(job.skill_config, job.revision)
 
-                if target_path.exists():
-                    validation = skill_processor.validate_skill(str(target_path))
-                    if validation['valid']:
-                        metadata = skill_processor.normalize_skill_metadata(
-                            skill_config,
-                            validation['metadata']
-                        )
-                        skill_metadata[skill_id] = metadata
+            # Get metadata for marketplace
+            if job.metadata is not None:
+                skill_metadata[skill_id] = skill_processor.normalize_skill_metadata(
+                    job.skill_config,
+                    job.metadata
+                )
 
         return skill_metadata
 
@@ -274,8 +752,33 @@ class SkillFetcher:
         lines.append(f"Successful:        {self.stats['successful']}")
         lines.append(f"Failed:            {self.stats['failed']}")
         lines.append(f"Skipped (exists):  {self.stats['skipped']}")
+        if self.sync:
+            lines.append(f"Stale (upstream):  {len(self.stats['stale'])}")
         lines.append("")
 
+        if self.cache is not None:
+            lines.append(f"Cache hits:        {self.cache.hits}")
+            lines.append(f"Cache misses:      {self.cache.misses}")
+            lines.append("")
+
+        if self.stage_timings:
+            lines.append(f"Pipeline wall time: {self.stage_timings_wall:.2f}s")
+            for stage, timing in self.stage_timings.items():
+                per_item = timing['busy_s'] / timing['items'] if timing['items'] else 0
+                lines.append(
+                    f"  {stage:<10} {timing['workers']} worker(s), "
+                    f"{timing['items']} skills, busy {timing['busy_s']:.2f}s "
+                    f"({per_item:.3f}s/skill), blocked {timing['blocked_s']:.2f}s"
+                )
+            lines.append("")
+
+        if self.stats['stale']:
+            lines.append("STALE SKILLS:")
+            lines.append("-" * 70)
+            for skill_id in self.stats['stale']:
+                lines.append(f"  • {skill_id}")
+            lines.append("")
+
         if self.stats['errors']:
             lines.append("ERRORS:")
             lines.append("-" * 70)
@@ -305,15 +808,57 @@ class SkillFetcher:
         if not self.validate_environment():
             return 1
 
+        # Initialize download cache; stored ETags also keep dry runs cheap
+        if self.use_cache:
+            cache_dir = self.cache_dir or str(Path(self.base_dir) / '.cache' / 'downloads')
+            self.etags = etag_store.ETagStore(
+                str(Path(cache_dir) / 'github_etags.json')
+            )
+            if not self.dry_run:
+                self.cache = download_cache.DownloadCache(
+                    cache_dir, max_bytes=self.cache_max_mb * 1024 * 1024
+                )
+
+        # Reuse parsed frontmatter of unchanged skills
+        self.metadata_index = metadata_index.MetadataIndex(
+            metadata_index.default_index_path(self.base_dir)
+        )
+
+        # Checkpoint progress so an interrupted run can be resumed
+        if not self.dry_run:
+            self.journal = fetch_journal.FetchJournal(
+                fetch_journal.default_journal_path(self.base_dir)
+            )
+            if not self.resume:
+                self.journal.reset()
+            elif self.journal.skills:
+                logging.info(f"Resuming interrupted run of {len(self.journal.skills)} skills")
+            else:
+                logging.info("No interrupted run to resume, starting a fresh run")
+
+        # Record stage timings for tuning concurrency settings
+        if self.use_telemetry and not self.dry_run:
+            self.telemetry = telemetry.Telemetry(
+                telemetry.default_telemetry_path(self.base_dir)
+            )
+
         # Initialize GitHub fetcher
         # GitHubFetcher will read GITHUB_TOKEN from environment automatically
-        self.fetcher = github_fetcher.GitHubFetcher(token=None)
+        self.fetcher = github_fetcher.GitHubFetcher(
+            token=None,
+            max_per_host=self.max_per_host,
+            cache=self.cache,
+            etags=self.etags,
+            backend=self.http_backend,
+            http2=self.http2,
+            telemetry=self.telemetry
+        )
 
         # Filter skills if specific IDs provided
         all_skills = self.config['skills']
         if skill_ids:
             skills_to_fetch = [
-                s for s in all_skills if s['id'] in skill_ids
+                s for s in all_skills if s.get('id') in skill_ids
             ]
             if not skills_to_fetch:
                 logging.error(f"No skills found matching IDs: {skill_ids}")
@@ -321,6 +866,14 @@ class SkillFetcher:
         else:
             skills_to_fetch = all_skills
 
+        skills_to_fetch = self.validate_skill_configs(skills_to_fetch)
+
+        # Finish skill updates an interrupted run left half-swapped
+        if not self.dry_run:
+            for skill_config in all_skills:
+                if skill_config.get('target_folder'):
+                    utils.recover_sync(str(Path(self.base_dir) / skill_config['target_folder']))
+
         # Check for conflicts
         conflicts = self.check_conflicts(skills_to_fetch)
         if conflicts and not self.force:
@@ -330,15 +883,58 @@ class SkillFetcher:
             )
             return 1
 
+        # Find skills whose upstream changed
+        if self.sync:
+            self.lockfile = skill_lockfile.SkillLockfile(
+                skill_lockfile.lockfile_path_for(self.config_path)
+            )
+            self.stats['stale'] = self.check_sync_status(skills_to_fetch)
+
         # Fetch skills
-        skill_metadata = self.fetch_all_skills(skills_to_fetch)
+        try:
+            skill_metadata = self.fetch_all_skills(skills_to_fetch)
+        finally:
+            self.fetcher.close()
+            if self.cache is not None:
+                self.cache.save()
+
+        if not self.dry_run:
+            if self.etags is not None:
+                self.etags.save()
+            if self.lockfile is not None:
+                self.lockfile.save()
+            self.metadata_index.save()
 
         # Update marketplace
+        published = True
         if skill_metadata and not self.dry_run:
-            if not self.update_marketplace(skill_metadata):
+            published = self.update_marketplace(skill_metadata)
+            if not published:
                 logging.error("Failed to update marketplace.json")
                 # Don't fail completely, skills are already fetched
 
+        # Keep the journal only while there is something left to resume
+        if self.journal is not None:
+            if published:
+                self.journal.mark_all('moved', 'published')
+            if published and self.stats['failed'] == 0:
+                self.journal.reset()
+            else:
+                logging.info("Run incomplete; use --resume to continue it")
+
+        if self.telemetry is not None:
+            self.telemetry.finish_run(
+                {
+                    'jobs': self.jobs,
+                    'validate_workers': self.validate_workers,
+                    'publish_workers': self.publish_workers,
+                    'queue_size': self.queue_size,
+                    'max_per_host': self.max_per_host,
+                    'http_backend': self.http_backend
+                },
+                {key: self.stats[key] for key in ('total', 'successful', 'failed', 'skipped')}
+            )
+
         # Generate report
         report = self.generate_report()
         print("\n" + report)
@@ -383,6 +979,84 @@ def main():
         action='store_true',
         help='Force re-fetch existing skills'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Download up to N skills concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--validate-workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Validate up to N skills concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--publish-workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Move up to N skills into place concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=4,
+        metavar='N',
+        help='Skills that may wait between pipeline stages (default: 4)'
+    )
+    parser.add_argument(
+        '--max-per-host',
+        type=int,
+        default=4,
+        metavar='N',
+        help='Limit concurrent requests per host (default: 4)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='Download cache directory (default: .cache/downloads)'
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=512,
+        metavar='N',
+        help='Download cache size cap in MB (default: 512)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the download cache and stored ETags'
+    )
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Only re-fetch skills whose upstream tree changed since the last sync'
+    )
+    parser.add_argument(
+        '--http-backend',
+        choices=['requests', 'httpx'],
+        default='requests',
+        help="HTTP backend for file downloads (default: requests)"
+    )
+    parser.add_argument(
+        '--http2',
+        action='store_true',
+        help='Use HTTP/2 with the httpx backend'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted run without re-downloading finished skills'
+    )
+    parser.add_argument(
+        '--no-telemetry',
+        action='store_true',
+        help='Do not record timings in logs/fetch_telemetry.jsonl'
+    )
     parser.add_argument(
         '--config',
         default='external_skills_config.json',
@@ -404,7 +1078,20 @@ def main():
     fetcher = SkillFetcher(
         config_path=args.config,
         dry_run=args.dry_run,
-        force=args.force
+        force=args.force,
+        jobs=args.jobs,
+        max_per_host=args.max_per_host,
+        cache_dir=args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        use_cache=not args.no_cache,
+        sync=args.sync,
+        http_backend=args.http_backend,
+        http2=args.http2,
+        validate_workers=args.validate_workers,
+        publish_workers=args.publish_workers,
+        queue_size=args.queue_size,
+        resume=args.resume,
+        use_telemetry=not args.no_telemetry
     )
 
     exit_code = fetcher.run(skill_ids=skill_ids)
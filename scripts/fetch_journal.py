@@ -0,0 +1,158 @@
+"""
+Fetch journal module for checkpointing fetch runs so they can be resumed.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+JOURNAL_VERSION = 1
+
+# Per-skill states, in the order a skill passes through them
+STATES = ('downloading', 'downloaded', 'validated', 'moved', 'published')
+
+
+def default_journal_path(base_dir: str) -> str:
+    """
+    Get the standard journal location for a skills vault.
+
+    Args:
+        base_dir: Root of the skills vault
+
+    Returns:
+        Path to .cache/fetch_journal.json under base_dir
+    """
+    return str(Path(base_dir) / '.cache' / 'fetch_journal.json')
+
+
+class FetchJournal:
+    """
+    Per-skill progress of a fetch run, saved after every change.
+
+    Each skill gets a work directory next to the journal that survives an
+    interrupted run: 'skill' holds the downloaded files and 'archive' any
+    (partially) downloaded tarball. An entry records the furthest state
+    the skill reached, its work directory and the revision it was fetched
+    at.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize journal, loading it if it exists.
+
+        Args:
+            path: Path to the journal file; work directories are created in
+                a 'fetch_work' directory beside it
+        """
+        self.path = Path(path)
+        self.work_root = self.path.parent / 'fetch_work'
+        self.skills: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == JOURNAL_VERSION:
+                self.skills = data.get('skills', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable fetch journal {self.path}: {e}")
+
+    def get(self, skill_id: str) -> Optional[Dict]:
+        """Get the journal entry of a skill, if any."""
+        with self._lock:
+            entry = self.skills.get(skill_id)
+            return dict(entry) if entry else None
+
+    def in_target(self) -> List[str]:
+        """IDs of skills already moved into place by the journaled run."""
+        with self._lock:
+            return [
+                skill_id for skill_id, entry in self.skills.items()
+                if entry['state'] in ('moved', 'published')
+            ]
+
+    def work_dir(self, skill_id: str) -> Path:
+        """
+        Work directory of a skill (not created).
+
+        Raises:
+            ValueError: If the skill ID would place it outside work_root
+        """
+        work_dir = self.work_root / skill_id
+        root = self.work_root.resolve()
+        resolved = work_dir.resolve()
+        if resolved == root or root not in resolved.parents:
+            raise ValueError(f"Invalid skill ID for a work directory: {skill_id!r}")
+        return work_dir
+
+    def mark(self, skill_id: str, state: str, revision: Optional[Dict] = None):
+        """
+        Record that a skill reached a state, and save the journal.
+
+        Args:
+            skill_id: Skill ID
+            state: One of STATES
+            revision: Dict with the 'commit' and 'tree' SHAs fetched, if known
+        """
+        if state not in STATES:
+            raise ValueError(f"Unknown journal state: {state}")
+
+        with self._lock:
+            entry = self.skills.setdefault(skill_id, {})
+            entry['state'] = state
+            entry['work_dir'] = str(self.work_dir(skill_id))
+            if revision:
+                entry['revision'] = revision
+            entry['updated_at'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            self._save()
+
+    def mark_all(self, from_state: str, to_state: str):
+        """Move every skill in from_state to to_state, and save the journal."""
+        with self._lock:
+            for entry in self.skills.values():
+                if entry['state'] == from_state:
+                    entry['state'] = to_state
+            self._save()
+
+    def forget(self, skill_id: str):
+        """Drop a skill's entry and work directory, and save the journal."""
+        with self._lock:
+            self.skills.pop(skill_id, None)
+            self._save()
+        self.discard_work(skill_id)
+
+    def discard_work(self, skill_id: str):
+        """Delete a skill's work directory."""
+        work_dir = self.work_dir(skill_id)
+        if work_dir.exists():
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def reset(self):
+        """Forget every entry and delete all work directories."""
+        with self._lock:
+            self.skills = {}
+            if self.work_root.exists():
+                shutil.rmtree(self.work_root, ignore_errors=True)
+            self.path.unlink(missing_ok=True)
+
+    def _save(self):
+        """Write the journal atomically. Caller holds the lock."""
+        data = {'version': JOURNAL_VERSION, 'skills': self.skills}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.journal_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            Path(tmp_path).unlink(missing_ok=True)
+            logging.warning(f"Failed to save fetch journal {self.path}: {e}")
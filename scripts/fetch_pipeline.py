@@ -0,0 +1,209 @@
+"""
+Fetch pipeline module for running work items through stages on worker threads.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class Stage:
+    """One step of a Pipeline with its own worker threads and timing."""
+
+    def __init__(self, name: str, func: Callable, workers: int = 1):
+        """
+        Initialize stage.
+
+        Args:
+            name: Stage name used in thread names and timings
+            func: Called with each item; must not raise for per-item
+                failures, but record them on the item instead
+            workers: Number of worker threads
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+        self.items = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.slowest = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float, blocked: float):
+        """Add one processed item to the stage timings."""
+        with self._lock:
+            self.items += 1
+            self.busy += elapsed
+            self.blocked += blocked
+            self.slowest = max(self.slowest, elapsed)
+
+    def timings(self) -> Dict:
+        """
+        Get the stage's timings.
+
+        Returns:
+            Dict with worker count, items processed, summed busy time,
+            time spent waiting on a full downstream queue and the slowest
+            item, all in seconds
+        """
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy_s': round(self.busy, 4),
+            'blocked_s': round(self.blocked, 4),
+            'slowest_s': round(self.slowest, 4)
+        }
+
+
+class Pipeline:
+    """
+    Streaming pipeline of stages joined by bounded queues.
+
+    Every item passes through every stage in order, so a slow stage only
+    holds back the items behind it while earlier stages keep working
+    until the queue in front of it fills up. A pipeline runs once.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable, int]], queue_size: int = 4):
+        """
+        Initialize pipeline.
+
+        Args:
+            stages: List of (name, function, worker count)
+            queue_size: Capacity of each queue between stages
+        """
+        self.stages = [Stage(name, func, workers) for name, func, workers in stages]
+        self.queue_size = max(1, queue_size)
+        self.wall_time = 0.0
+
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def _put(self, target: queue.Queue, item) -> float:
+        """Put an item on a queue unless the pipeline stops; return time blocked."""
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        return time.perf_counter() - start
+
+    def _get(self, source: queue.Queue):
+        """Take an item from a queue, or _DONE once the pipeline stops."""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, items: Iterable, target: queue.Queue, consumers: int):
+        for item in items:
+            if self._stop.is_set():
+                return
+            self._put(target, item)
+        for _ in range(consumers):
+            self._put(target, _DONE)
+
+    def _work(
+        self,
+        stage: Stage,
+        source: queue.Queue,
+        target: queue.Queue,
+        consumers: int,
+        remaining: List[int],
+        lock: threading.Lock
+    ):
+        try:
+            while True:
+                item = self._get(source)
+                if item is _DONE:
+                    break
+
+                start = time.perf_counter()
+                stage.func(item)
+                elapsed = time.perf_counter() - start
+                stage.record(elapsed, self._put(target, item))
+        except BaseException as e:
+            logging.error(f"Pipeline stage '{stage.name}' failed: {e}")
+            self._error = e
+            self._stop.set()
+        finally:
+            # The last worker of a stage closes the next stage's input
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(consumers):
+                    self._put(target, _DONE)
+
+    def run(self, items: Iterable) -> Iterator:
+        """
+        Push items through every stage.
+
+        Args:
+            items: Work items; each stage function is called with them
+
+        Yields:
+            Items as they leave the last stage, in completion order
+
+        Raises:
+            BaseException: Whatever a stage function raised, after the
+                pipeline has been stopped
+        """
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        queues.append(queue.Queue())
+        threads = [threading.Thread(
+            target=self._feed,
+            args=(items, queues[0], self.stages[0].workers),
+            name='pipeline-feed',
+            daemon=True
+        )]
+
+        for i, stage in enumerate(self.stages):
+            consumers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[i], queues[i + 1], consumers, remaining, lock),
+                    name=f'pipeline-{stage.name}-{n}',
+                    daemon=True
+                ))
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self.wall_time = time.perf_counter() - start
+
+        if self._error is not None:
+            raise self._error
+
+    def timings(self) -> Dict[str, Dict]:
+        """
+        Get per-stage timings of the last run.
+
+        Returns:
+            Dict mapping stage names to Stage.timings(), in stage order
+        """
+        return {stage.name: stage.timings() for stage in self.stages}
@@ -0,0 +1,64 @@
+"""
+Frontmatter reader module for parsing SKILL.md headers without reading the body.
+"""
+from typing import Dict, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+DELIMITER = '---'
+
+
+def read_frontmatter_text(path: str) -> Optional[str]:
+    """
+    Read the raw YAML header of a Markdown file.
+
+    Reading stops at the closing delimiter, so the body is never loaded.
+
+    Args:
+        path: Path to the Markdown file
+
+    Returns:
+        Header text between the delimiters, or None if the file has no
+        (closed) frontmatter block
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if f.readline().rstrip() != DELIMITER:
+            return None
+
+        lines = []
+        for line in f:
+            if line.rstrip() == DELIMITER:
+                return ''.join(lines)
+            lines.append(line)
+
+    return None
+
+
+def load_frontmatter(path: str) -> Dict:
+    """
+    Parse the YAML header of a Markdown file.
+
+    Drop-in for frontmatter.load(f).metadata: files without frontmatter
+    give an empty dict.
+
+    Args:
+        path: Path to the Markdown file
+
+    Returns:
+        Dict with frontmatter metadata
+
+    Raises:
+        yaml.YAMLError: If the header is not valid YAML
+    """
+    text = read_frontmatter_text(path)
+    if not text:
+        return {}
+
+    metadata = yaml.load(text, Loader=SafeLoader)
+    return metadata if isinstance(metadata, dict) else {}
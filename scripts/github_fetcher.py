@@ -1,29 +1,289 @@
 """
 GitHub fetcher module for downloading skills from GitHub repositories.
 """
+import functools
 import os
 import time
+import hashlib
 import logging
 import tarfile
-import io
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
+from urllib.parse import urlparse, quote
 import requests
+from requests.adapters import HTTPAdapter
+
+
+class RateLimitTracker:
+    """
+    Track the GitHub API request budget from response headers.
+
+    Every API response carries X-RateLimit-Remaining and X-RateLimit-Reset,
+    so the budget can be followed locally instead of polling /rate_limit.
+    Safe to share between threads.
+    """
+
+    def __init__(self, threshold: int = 10, resource: str = 'core'):
+        """
+        Initialize rate limit tracker.
+
+        Args:
+            threshold: Block new requests once this few remain
+            resource: Rate limit resource to follow ('core', 'graphql', ...)
+        """
+        self.threshold = threshold
+        self.resource = resource
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_time = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, headers) -> None:
+        """
+        Update the budget from a response's rate limit headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+
+        resource = headers.get('X-RateLimit-Resource')
+        if resource and resource != self.resource:
+            return
+
+        try:
+            self.observe(
+                int(remaining),
+                float(headers.get('X-RateLimit-Reset', 0)),
+                int(headers['X-RateLimit-Limit']) if 'X-RateLimit-Limit' in headers else None
+            )
+        except ValueError:
+            logging.debug(f"Ignoring malformed rate limit headers: {remaining}")
+
+    def observe(self, remaining: int, reset_time: float, limit: Optional[int] = None) -> None:
+        """
+        Record an observed budget.
+
+        Responses from concurrent workers can arrive out of order, so within
+        one window the lowest remaining count wins.
+
+        Args:
+            remaining: Requests remaining in the window
+            reset_time: Epoch seconds when the window resets
+            limit: Total requests allowed per window
+        """
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+
+            if reset_time > self.reset_time or self.remaining is None:
+                self.remaining = remaining
+                self.reset_time = reset_time
+            elif reset_time == self.reset_time:
+                self.remaining = min(self.remaining, remaining)
+
+    def acquire(self, reserve: bool = True) -> None:
+        """
+        Reserve one request from the budget.
+
+        Blocks until the window resets when the budget is nearly exhausted.
+        Does nothing until the first response has been observed.
+
+        Args:
+            reserve: If False, only wait; do not count a request
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+
+                if self.remaining is not None and now >= self.reset_time:
+                    # Window expired; wait for the next response to learn more
+                    self.remaining = None
+
+                if self.remaining is None:
+                    return
+
+                if self.remaining > self.threshold:
+                    if reserve:
+                        self.remaining -= 1
+                    return
+
+                remaining = self.remaining
+                wait_time = max(0, self.reset_time - now) + 5
+
+            logging.warning(
+                f"Approaching rate limit ({remaining} remaining). "
+                f"Waiting {wait_time:.0f} seconds..."
+            )
+            time.sleep(wait_time)
+
+    def release(self) -> None:
+        """Return a reserved request that turned out not to be counted."""
+        with self._lock:
+            if self.remaining is not None:
+                self.remaining += 1
+
+    def snapshot(self) -> Dict:
+        """Return the current budget in the shape of /rate_limit's 'rate'."""
+        with self._lock:
+            if self.remaining is None:
+                return {}
+            return {
+                'limit': self.limit,
+                'remaining': self.remaining,
+                'reset': int(self.reset_time)
+            }
+
+
+def is_commit_sha(ref: str) -> bool:
+    """Check whether a ref is a full 40-character commit SHA."""
+    return len(ref) == 40 and all(c in '0123456789abcdef' for c in ref.lower())
+
+
+# Rough cost of one extra HTTP round trip, expressed in bytes, used to
+# compare per-file downloads against a single tarball
+REQUEST_COST_BYTES = 32 * 1024
+
+# Typical gzip ratio for a source tarball
+TARBALL_COMPRESSION_RATIO = 0.35
+
+# Reject absolute paths and links escaping the target where supported
+EXTRACT_KWARGS = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+
+class _TimedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that reports how long each new connection takes to open.
+
+    The time covers the DNS lookup, the TCP connect and, for HTTPS, the TLS
+    handshake; urllib3 resolves inside the connect call, so the lookup is
+    not timed on its own. Reused pooled connections report nothing.
+    """
+
+    def __init__(self, on_connect: Callable[[float], None], **kwargs):
+        """
+        Initialize adapter.
+
+        Args:
+            on_connect: Called with the setup time in milliseconds of each
+                new connection, on the thread that opened it
+            **kwargs: Passed to HTTPAdapter
+        """
+        self.on_connect = on_connect
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_connect = self.on_connect
+
+        pools = {}
+        for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items():
+            connection_cls = pool_cls.ConnectionCls
+
+            def connect(conn, _connect=connection_cls.connect):
+                start = time.perf_counter()
+                _connect(conn)
+                on_connect((time.perf_counter() - start) * 1000)
+
+            timed = type(f'Timed{connection_cls.__name__}', (connection_cls,), {'connect': connect})
+            pools[scheme] = type(f'Timed{pool_cls.__name__}', (pool_cls,), {'ConnectionCls': timed})
+        self.poolmanager.pool_classes_by_scheme = pools
+
+
+class _TeeReader:
+    """File-like reader that copies everything read from a stream to a file."""
+
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.sink.write(data)
+        return data
+
+    def drain(self, chunk_size: int = 64 * 1024):
+        """Read (and copy) the rest of the stream."""
+        while self.read(chunk_size):
+            pass
+
+
+def blob_matches(path: Path, entry: Dict) -> bool:
+    """
+    Check whether a local file has the content of a Git tree entry.
+
+    Args:
+        path: Local file
+        entry: Tree entry with 'size' and 'sha'
+
+    Returns:
+        True if the file exists and its Git blob SHA equals entry['sha']
+    """
+    try:
+        if not entry.get('sha') or path.stat().st_size != entry['size']:
+            return False
+    except OSError:
+        return False
+
+    digest = hashlib.sha1(b'blob %d\0' % entry['size'])
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest() == entry['sha']
 
 
 class GitHubFetcher:
     """Handle GitHub API interactions and file downloads."""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_per_host: int = 4,
+        cache=None,
+        etags=None,
+        backend: str = 'requests',
+        http2: bool = False,
+        telemetry=None
+    ):
         """
         Initialize GitHub fetcher.
 
         Args:
             token: GitHub personal access token (optional, for rate limiting)
+            max_per_host: Maximum concurrent requests to a single host
+            cache: DownloadCache to serve unchanged repositories from (optional)
+            etags: ETagStore used to make API requests conditional (optional)
+            backend: 'requests' downloads files one at a time; 'httpx'
+                downloads subfolder files in parallel on an async client
+            http2: Use HTTP/2 for the httpx backend where supported
+            telemetry: Telemetry to count requests, bytes and cache hits
+                against the skill being fetched (optional)
         """
         self.token = token or os.getenv('GITHUB_TOKEN')
+        self.max_per_host = max(1, max_per_host)
+        self.cache = cache
+        self.etags = etags
+        self.telemetry = telemetry
         self.session = requests.Session()
 
+        # Size the connection pool so concurrent workers can reuse connections
+        adapter = _TimedAdapter(self._count_connect, pool_maxsize=max(10, self.max_per_host))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+        # Budget is learned from response headers and shared by all workers
+        self.rate_limit = RateLimitTracker()
+
+        # Default branches by (owner, repo), looked up once per run
+        self.default_branches: Dict[Tuple[str, str], str] = {}
+
         if self.token:
             self.session.headers.update({
                 'Authorization': f'token {self.token}',
@@ -34,40 +294,190 @@ class GitHubFetcher:
                 'Accept': 'application/vnd.github.v3+json'
             })
 
-        self.api_base = 'https://api.github.com'
+        # Created after the auth headers are set, so it sends them too
+        self.downloader = None
+        if backend == 'httpx':
+            import async_fetcher
+            self.downloader = async_fetcher.AsyncDownloader(
+                headers=dict(self.session.headers),
+                max_connections=max(10, self.max_per_host * 4),
+                max_per_host=self.max_per_host,
+                http2=http2,
+                on_response=lambda url, headers, size: self.rate_limit.update(headers)
+            )
+        elif backend != 'requests':
+            raise ValueError(f"Unknown HTTP backend: {backend}")
+
+        # Overridable for GitHub Enterprise or a local stand-in server
+        self.api_base = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.web_base = os.getenv('GITHUB_SERVER_URL', 'https://github.com').rstrip('/')
+        self.raw_base = os.getenv(
+            'GITHUB_RAW_URL', 'https://raw.githubusercontent.com'
+        ).rstrip('/')
+
+    def close(self):
+        """Release network resources held by the fetcher."""
+        if self.downloader is not None:
+            self.downloader.close()
+        self.session.close()
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        """
+        Hold one of the concurrency slots for the URL's host.
+
+        Args:
+            url: URL about to be requested
+        """
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+
+        with slot:
+            yield
+
+    def _count(self, **amounts):
+        """Add to the telemetry counters of the skill being fetched, if any."""
+        if self.telemetry is not None:
+            self.telemetry.count(**amounts)
+
+    def _count_connect(self, ms: float, skill_id: Optional[str] = None):
+        """Count a new connection and its setup time (default: for the current skill)."""
+        if self.telemetry is not None:
+            self.telemetry.count(skill_id, connections=1, connect_ms=ms)
+
+    @contextmanager
+    def _span(self, stage: str):
+        """Time a sub-stage of the skill being fetched, if any."""
+        skill_id = self.telemetry.current() if self.telemetry is not None else None
+        if skill_id is None:
+            yield
+            return
+        with self.telemetry.span(skill_id, stage):
+            yield
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Issue a GET request within the host's concurrency limit.
+
+        Streaming callers must hold _host_slot() themselves for as long as
+        they read the body, and call _send() directly.
+
+        Args:
+            url: URL to request
+            **kwargs: Extra arguments for requests
+
+        Returns:
+            Response object
+        """
+        with self._host_slot(url):
+            return self._send(url, **kwargs)
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        """
+        Issue a GET request on the shared session.
+
+        API requests draw from the shared rate limit budget, and every
+        response's rate limit headers are fed back into it. With an ETag
+        store, non-streaming API requests are made conditional and a 304
+        is answered from the stored body. Requests are counted in telemetry;
+        the bytes of a streamed body are left to the caller to count.
+        """
+        is_api = url.startswith(self.api_base)
+        counted = is_api and not url.endswith('/rate_limit')
+
+        cached = None
+        accept = None
+        if is_api and self.etags is not None and not kwargs.get('stream'):
+            headers = dict(kwargs.pop('headers', None) or {})
+            accept = headers.get('Accept', self.session.headers.get('Accept'))
+            cached = self.etags.lookup(url, accept)
+            if cached:
+                headers['If-None-Match'] = cached['etag']
+            kwargs['headers'] = headers
+
+        if counted:
+            self.rate_limit.acquire()
+
+        response = self.session.get(url, **kwargs)
+
+        if self.telemetry is not None:
+            self.telemetry.count(
+                requests=1,
+                bytes=0 if kwargs.get('stream') else len(response.content)
+            )
+
+        if cached and response.status_code == 304:
+            # Not Modified responses are free
+            if counted:
+                self.rate_limit.release()
+            self._count(not_modified=1)
+            response = self._replay(response, cached)
+        elif accept is not None and response.ok and response.headers.get('ETag'):
+            self.etags.store(
+                url, accept, response.headers['ETag'], response.text,
+                response.headers.get('Content-Type')
+            )
+
+        self.rate_limit.update(response.headers)
+        return response
+
+    @staticmethod
+    def _replay(not_modified: requests.Response, cached: Dict) -> requests.Response:
+        """
+        Turn a 304 into a 200 carrying the stored body.
+
+        Args:
+            not_modified: The 304 response
+            cached: Entry from the ETag store
+
+        Returns:
+            Response object
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK (not modified)'
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.headers = not_modified.headers
+        if cached.get('content_type'):
+            response.headers['Content-Type'] = cached['content_type']
+        response.encoding = 'utf-8'
+        response._content = cached['body'].encode('utf-8')
+        return response
 
     def check_rate_limit(self) -> Dict:
         """
         Check GitHub API rate limit status.
 
+        Queries /rate_limit (which does not count against the budget) and
+        refreshes the local tracker with the result.
+
         Returns:
             Dict with rate limit info
         """
         try:
-            response = self.session.get(f'{self.api_base}/rate_limit')
+            response = self._get(f'{self.api_base}/rate_limit')
             response.raise_for_status()
-            data = response.json()
-            return data['rate']
+            rate = response.json()['rate']
+            self.rate_limit.observe(
+                rate['remaining'], rate['reset'], rate.get('limit')
+            )
+            return rate
         except Exception as e:
             logging.warning(f"Failed to check rate limit: {e}")
             return {}
 
     def wait_for_rate_limit_reset(self):
-        """Wait until rate limit resets if approaching limit."""
-        rate = self.check_rate_limit()
-        if not rate:
-            return
-
-        remaining = rate.get('remaining', 100)
-        reset_time = rate.get('reset', 0)
+        """
+        Wait until rate limit resets if approaching limit.
 
-        if remaining < 10:
-            wait_time = max(0, reset_time - time.time()) + 5
-            logging.warning(
-                f"Approaching rate limit ({remaining} remaining). "
-                f"Waiting {wait_time:.0f} seconds..."
-            )
-            time.sleep(wait_time)
+        Uses the locally tracked budget; no request is made.
+        """
+        self.rate_limit.acquire(reserve=False)
 
     def get_default_branch(self, owner: str, repo: str) -> str:
         """
@@ -80,11 +490,17 @@ class GitHubFetcher:
         Returns:
             Default branch name (e.g., 'main', 'master')
         """
+        branch = self.default_branches.get((owner, repo))
+        if branch:
+            return branch
+
         try:
             url = f'{self.api_base}/repos/{owner}/{repo}'
-            response = self.session.get(url)
+            response = self._get(url)
             response.raise_for_status()
-            return response.json()['default_branch']
+            branch = response.json()['default_branch']
+            self.default_branches[(owner, repo)] = branch
+            return branch
         except Exception as e:
             logging.warning(
                 f"Failed to get default branch for {owner}/{repo}, "
@@ -92,13 +508,38 @@ class GitHubFetcher:
             )
             return 'main'
 
+    def resolve_commit(self, owner: str, repo: str, ref: str) -> Optional[str]:
+        """
+        Resolve a branch or ref to its current commit SHA.
+
+        Uses the SHA media type so the response is just the 40-character SHA.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch, tag or SHA
+
+        Returns:
+            Commit SHA, or None if it could not be resolved
+        """
+        try:
+            url = f'{self.api_base}/repos/{owner}/{repo}/commits/{quote(ref, safe="")}'
+            response = self._get(url, headers={'Accept': 'application/vnd.github.sha'})
+            response.raise_for_status()
+            sha = response.text.strip()
+            return sha if is_commit_sha(sha) else None
+        except Exception as e:
+            logging.warning(f"Failed to resolve {owner}/{repo}@{ref}: {e}")
+            return None
+
     def fetch_standalone_repo(
         self,
         owner: str,
         repo: str,
         branch: str,
         target_dir: str,
-        exclude_patterns: Optional[List[str]] = None
+        exclude_patterns: Optional[List[str]] = None,
+        archive_dir: Optional[str] = None
     ) -> bool:
         """
         Fetch entire repository as tarball and extract.
@@ -109,6 +550,8 @@ class GitHubFetcher:
             branch: Branch name
             target_dir: Target directory to extract to
             exclude_patterns: Patterns to exclude (e.g., '.git', '.github')
+            archive_dir: Keep the tarball here so an interrupted download
+                can be resumed (optional)
 
         Returns:
             True if successful, False otherwise
@@ -117,56 +560,228 @@ class GitHubFetcher:
             exclude_patterns = ['.git', '.github', '__pycache__', '*.pyc']
 
         try:
-            # Check rate limit
-            self.wait_for_rate_limit_reset()
-
             # Download tarball
-            tarball_url = f'https://github.com/{owner}/{repo}/archive/refs/heads/{branch}.tar.gz'
+            tarball_url = self._tarball_url(owner, repo, branch)
             logging.info(f"Downloading {owner}/{repo} from {tarball_url}")
 
-            response = self.session.get(tarball_url, stream=True)
-            response.raise_for_status()
+            extracted = self._download_tarball(
+                tarball_url, Path(target_dir), exclude_patterns,
+                archive_dir=archive_dir
+            )
+            if not extracted:
+                logging.error(f"Empty tarball for {owner}/{repo}")
+                return False
 
-            # Extract tarball
-            target_path = Path(target_dir)
-            target_path.mkdir(parents=True, exist_ok=True)
+            logging.info(f"Successfully extracted {owner}/{repo} to {target_dir}")
+            return True
 
-            with tarfile.open(fileobj=io.BytesIO(response.content), mode='r:gz') as tar:
-                # Get the root directory name from tarball
-                members = tar.getmembers()
-                if not members:
-                    logging.error(f"Empty tarball for {owner}/{repo}")
-                    return False
+        except Exception as e:
+            logging.error(f"Failed to fetch standalone repo {owner}/{repo}: {e}")
+            return False
 
-                root_dir = members[0].name.split('/')[0]
+    def _tarball_url(self, owner: str, repo: str, branch: str) -> str:
+        """Build the archive URL for a branch or commit SHA."""
+        if is_commit_sha(branch):
+            return f'{self.web_base}/{owner}/{repo}/archive/{branch}.tar.gz'
+        return f'{self.web_base}/{owner}/{repo}/archive/refs/heads/{branch}.tar.gz'
+
+    def _download_tarball(
+        self,
+        tarball_url: str,
+        target_path: Path,
+        exclude_patterns: List[str],
+        prefix: Optional[str] = None,
+        archive_dir: Optional[str] = None
+    ) -> int:
+        """
+        Download a repository tarball and extract it while it streams.
 
-                # Extract files, excluding patterns
-                for member in members:
-                    # Skip the root directory itself
-                    if member.name == root_dir:
-                        continue
+        The archive is read straight off the socket and members are written
+        as they arrive, so memory use does not grow with repository size.
 
-                    # Check exclude patterns
-                    should_exclude = False
-                    for pattern in exclude_patterns:
-                        if pattern in member.name:
-                            should_exclude = True
-                            break
+        With an archive_dir, a tarball pinned to a commit is also copied to
+        '<name>.part' there as it streams, and renamed once complete, so an
+        interrupted run leaves a prefix that a later run resumes from. If a
+        complete or partial archive is already there, it is finished with
+        _download_archive and extracted from the file instead.
 
-                    if should_exclude:
-                        continue
+        Args:
+            tarball_url: Archive URL
+            target_path: Directory to extract into
+            exclude_patterns: Patterns to exclude
+            prefix: Only extract this repository subfolder (optional)
+            archive_dir: Directory to keep the downloaded tarball in (optional)
 
-                    # Remove root directory from path
-                    member.name = member.name[len(root_dir) + 1:]
-                    if member.name:
-                        tar.extract(member, target_path)
+        Returns:
+            Number of members extracted
+        """
+        target_path.mkdir(parents=True, exist_ok=True)
 
-            logging.info(f"Successfully extracted {owner}/{repo} to {target_dir}")
-            return True
+        archive_path = part_path = None
+        if archive_dir is not None:
+            name = Path(urlparse(tarball_url).path).name
+            if is_commit_sha(name[:-len('.tar.gz')]):
+                archive_path = Path(archive_dir) / name
+                part_path = Path(archive_dir) / f'{name}.part'
 
-        except Exception as e:
-            logging.error(f"Failed to fetch standalone repo {owner}/{repo}: {e}")
-            return False
+        if archive_path is not None and (archive_path.exists() or part_path.exists()):
+            archive_path = self._download_archive(tarball_url, Path(archive_dir))
+            with self._span('extract'), tarfile.open(archive_path, mode='r|gz') as tar:
+                return self._extract_members(
+                    tar, tar, target_path, exclude_patterns, prefix
+                )
+
+        with self._host_slot(tarball_url):
+            with self._send(tarball_url, stream=True) as response:
+                response.raise_for_status()
+                # Undo any transfer encoding; the gzip layer is tarfile's job
+                response.raw.decode_content = True
+
+                source = response.raw
+                part = None
+                if part_path is not None:
+                    part_path.parent.mkdir(parents=True, exist_ok=True)
+                    part = open(part_path, 'wb')
+                    source = _TeeReader(response.raw, part)
+
+                try:
+                    # Extraction overlaps the download, so this span covers both
+                    with self._span('extract'), tarfile.open(fileobj=source, mode='r|gz') as tar:
+                        extracted = self._extract_members(
+                            tar, tar, target_path, exclude_patterns, prefix
+                        )
+                    if part is not None:
+                        # Keep the padding after the last member too
+                        source.drain()
+                finally:
+                    if part is not None:
+                        part.close()
+
+                if part_path is not None:
+                    os.replace(part_path, archive_path)
+                self._count(bytes=response.raw.tell())
+                return extracted
+
+    def _download_archive(self, tarball_url: str, archive_dir: Path) -> Path:
+        """
+        Download a tarball to a file, resuming an earlier partial download.
+
+        Bytes are appended to '<name>.part' as they arrive and the file is
+        renamed once complete, so an interrupted download leaves a usable
+        prefix behind. A later call asks only for the missing bytes with an
+        HTTP Range request, and starts over if the server answers with the
+        whole archive instead. Partial files are only resumed for archives
+        pinned to a commit SHA, whose content cannot change in between.
+
+        Args:
+            tarball_url: Archive URL
+            archive_dir: Directory to keep the tarball in
+
+        Returns:
+            Path to the complete tarball
+        """
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        name = Path(urlparse(tarball_url).path).name
+        archive_path = archive_dir / name
+        part_path = archive_dir / f'{name}.part'
+
+        pinned = is_commit_sha(name[:-len('.tar.gz')])
+        if archive_path.exists() and pinned:
+            logging.info(f"Reusing downloaded archive {archive_path}")
+            return archive_path
+
+        offset = part_path.stat().st_size if pinned and part_path.exists() else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        with self._host_slot(tarball_url):
+            with self._send(tarball_url, stream=True, headers=headers) as response:
+                if offset and response.status_code == 416:
+                    # Nothing left to fetch: the part file is already whole
+                    logging.info(f"Archive {part_path} already complete")
+                    os.replace(part_path, archive_path)
+                    return archive_path
+
+                response.raise_for_status()
+                if offset and response.status_code == 206:
+                    logging.info(f"Resuming {name} download at byte {offset}")
+                    mode = 'ab'
+                else:
+                    if offset:
+                        logging.info(f"Server ignored range request, downloading {name} again")
+                    mode = 'wb'
+
+                received = 0
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+                        received += len(chunk)
+                self._count(bytes=received)
+
+        os.replace(part_path, archive_path)
+        return archive_path
+
+    def _extract_members(
+        self,
+        tar: tarfile.TarFile,
+        members,
+        target_path: Path,
+        exclude_patterns: List[str],
+        prefix: Optional[str] = None
+    ) -> int:
+        """
+        Extract tarball members, stripping the archive root directory.
+
+        Works with stream-mode archives: each member is extracted before the
+        next one is read.
+
+        Args:
+            tar: Open tarball
+            members: Iterable of members to consider
+            target_path: Directory to extract into
+            exclude_patterns: Patterns to exclude
+            prefix: Only extract this repository subfolder (optional)
+
+        Returns:
+            Number of members extracted
+        """
+        root_dir = None
+        extracted = 0
+
+        for member in members:
+            # Get the root directory name from the first member
+            if root_dir is None:
+                root_dir = member.name.split('/')[0]
+
+            # Skip the root directory itself
+            if member.name == root_dir:
+                continue
+
+            # Remove root directory from path
+            relative_name = member.name[len(root_dir) + 1:]
+
+            if prefix:
+                if not relative_name.startswith(prefix.rstrip('/') + '/'):
+                    continue
+                relative_name = relative_name[len(prefix.rstrip('/')) + 1:]
+
+            if not relative_name:
+                continue
+
+            # Check exclude patterns
+            should_exclude = False
+            for pattern in exclude_patterns:
+                if pattern in relative_name:
+                    should_exclude = True
+                    break
+
+            if should_exclude:
+                continue
+
+            member.name = relative_name
+            tar.extract(member, target_path, **EXTRACT_KWARGS)
+            extracted += 1
+
+        return extracted
 
     def fetch_subfolder(
         self,
@@ -174,10 +789,18 @@ class GitHubFetcher:
         repo: str,
         branch: str,
         subfolder_path: str,
-        target_dir: str
+        target_dir: str,
+        strategy: str = 'auto',
+        archive_dir: Optional[str] = None
     ) -> bool:
         """
-        Fetch specific subdirectory from repository using Contents API.
+        Fetch specific subdirectory from repository.
+
+        The repository tree is listed with a single Git Trees API call, then
+        the subfolder is downloaded either file by file from the raw host or
+        as one tarball filtered to the subfolder, whichever is estimated to
+        be cheaper. Falls back to walking the Contents API if the tree
+        listing is unavailable or truncated.
 
         Args:
             owner: Repository owner
@@ -185,21 +808,60 @@ class GitHubFetcher:
             branch: Branch name
             subfolder_path: Path to subfolder in repository
             target_dir: Target directory to save files
+            strategy: 'auto', 'raw', 'tarball' or 'contents'
+            archive_dir: Keep a downloaded tarball here so an interrupted
+                download can be resumed (optional)
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Check rate limit
-            self.wait_for_rate_limit_reset()
-
             # Create target directory
             target_path = Path(target_dir)
             target_path.mkdir(parents=True, exist_ok=True)
 
-            # Fetch contents recursively
-            return self._fetch_contents_recursive(
-                owner, repo, branch, subfolder_path, target_path
+            subfolder_path = subfolder_path.strip('/')
+
+            listing = None
+            if strategy != 'contents':
+                listing = self.get_subtree(owner, repo, branch, subfolder_path)
+
+            if listing is None:
+                # Fetch contents recursively, downloading files in one batch
+                # at the end when the async backend is available
+                pending = [] if self.downloader is not None else None
+                fetched = self._fetch_contents_recursive(
+                    owner, repo, branch, subfolder_path, target_path, pending
+                )
+                if fetched and pending:
+                    self._download_async(pending)
+                return fetched
+
+            files, repo_bytes = listing
+            if not files:
+                logging.error(f"Subfolder {subfolder_path} not found in {owner}/{repo}")
+                return False
+
+            if strategy == 'auto':
+                strategy = self._choose_subfolder_strategy(files, repo_bytes)
+
+            logging.info(
+                f"Fetching {len(files)} files from {owner}/{repo}/{subfolder_path} "
+                f"(strategy: {strategy})"
+            )
+
+            if strategy == 'tarball':
+                extracted = self._download_tarball(
+                    self._tarball_url(owner, repo, branch),
+                    target_path,
+                    [],
+                    prefix=subfolder_path,
+                    archive_dir=archive_dir
+                )
+                return extracted > 0
+
+            return self._download_raw_files(
+                owner, repo, branch, subfolder_path, files, target_path
             )
 
         except Exception as e:
@@ -209,13 +871,164 @@ class GitHubFetcher:
             )
             return False
 
+    def get_subtree(
+        self,
+        owner: str,
+        repo: str,
+        branch: str,
+        subfolder_path: str
+    ) -> Optional[Tuple[List[Dict], int]]:
+        """
+        List all files under a repository subfolder in one request.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+            subfolder_path: Path to subfolder in repository
+
+        Returns:
+            Tuple of (file entries, total repository bytes), or None if the
+            listing failed or was truncated. File entries carry 'path'
+            (relative to the subfolder), 'size' and 'sha'.
+        """
+        try:
+            url = (
+                f'{self.api_base}/repos/{owner}/{repo}/git/trees/'
+                f'{quote(branch, safe="")}?recursive=1'
+            )
+            response = self._get(url)
+            response.raise_for_status()
+            data = response.json()
+
+            if data.get('truncated'):
+                logging.info(f"Tree listing for {owner}/{repo} is truncated")
+                return None
+
+            prefix = subfolder_path.strip('/') + '/'
+            files = []
+            repo_bytes = 0
+
+            for entry in data.get('tree', []):
+                if entry.get('type') != 'blob':
+                    continue
+
+                repo_bytes += entry.get('size', 0)
+                if entry['path'].startswith(prefix):
+                    files.append({
+                        'path': entry['path'][len(prefix):],
+                        'size': entry.get('size', 0),
+                        'sha': entry.get('sha')
+                    })
+
+            return files, repo_bytes
+
+        except Exception as e:
+            logging.warning(f"Failed to list tree for {owner}/{repo}: {e}")
+            return None
+
+    def _choose_subfolder_strategy(self, files: List[Dict], repo_bytes: int) -> str:
+        """
+        Pick the cheaper way to download a subfolder.
+
+        Per-file downloads cost one round trip per file but only transfer the
+        subfolder. A tarball is one round trip but transfers the whole
+        (compressed) repository.
+
+        Args:
+            files: File entries from get_subtree()
+            repo_bytes: Total uncompressed size of the repository
+
+        Returns:
+            'raw' or 'tarball'
+        """
+        subtree_bytes = sum(f['size'] for f in files)
+        raw_cost = len(files) * REQUEST_COST_BYTES + subtree_bytes
+        tarball_cost = REQUEST_COST_BYTES + repo_bytes * TARBALL_COMPRESSION_RATIO
+
+        return 'tarball' if tarball_cost < raw_cost else 'raw'
+
+    def _download_raw_files(
+        self,
+        owner: str,
+        repo: str,
+        branch: str,
+        subfolder_path: str,
+        files: List[Dict],
+        target_path: Path
+    ) -> bool:
+        """
+        Download listed files from the raw content host.
+
+        Raw downloads do not count against the API rate limit. With the
+        async backend all files are downloaded concurrently. Files already
+        present with the listed blob SHA (left by an interrupted run) are
+        not downloaded again.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+            subfolder_path: Path to subfolder in repository
+            files: File entries from get_subtree()
+            target_path: Directory to write files into
+
+        Returns:
+            True if successful
+        """
+        missing = [entry for entry in files if not blob_matches(target_path / entry['path'], entry)]
+        if len(missing) < len(files):
+            logging.info(f"Reusing {len(files) - len(missing)} already downloaded files")
+            files = missing
+
+        if self.downloader is not None:
+            self._download_async([
+                (
+                    self._raw_url(owner, repo, branch, f"{subfolder_path}/{entry['path']}"),
+                    target_path / entry['path']
+                )
+                for entry in files
+            ])
+            return True
+
+        for entry in files:
+            url = self._raw_url(owner, repo, branch, f"{subfolder_path}/{entry['path']}")
+            response = self._get(url)
+            response.raise_for_status()
+
+            item_path = target_path / entry['path']
+            item_path.parent.mkdir(parents=True, exist_ok=True)
+            item_path.write_bytes(response.content)
+            logging.debug(f"Downloaded: {item_path}")
+
+        return True
+
+    def _download_async(self, items: List[Tuple[str, Path]]):
+        """Download files on the async backend, counting them in telemetry."""
+        on_connect = None
+        if self.telemetry is not None:
+            # The downloads run on the downloader's thread, outside the span
+            skill_id = self.telemetry.current()
+            on_connect = functools.partial(self._count_connect, skill_id=skill_id)
+
+        self.downloader.download(items, on_connect=on_connect)
+        self._count(
+            requests=len(items),
+            bytes=sum(path.stat().st_size for _, path in items if path.exists())
+        )
+
+    def _raw_url(self, owner: str, repo: str, branch: str, path: str) -> str:
+        """Build the raw content URL for a file."""
+        return f'{self.raw_base}/{owner}/{repo}/{quote(branch)}/{quote(path)}'
+
     def _fetch_contents_recursive(
         self,
         owner: str,
         repo: str,
         branch: str,
         path: str,
-        target_dir: Path
+        target_dir: Path,
+        pending: Optional[List[Tuple[str, Path]]] = None
     ) -> bool:
         """
         Recursively fetch directory contents from GitHub.
@@ -226,13 +1039,15 @@ class GitHubFetcher:
             branch: Branch name
             path: Path in repository
             target_dir: Target directory
+            pending: If given, collect (download URL, path) pairs here
+                instead of downloading each file during the walk
 
         Returns:
             True if successful
         """
         try:
             url = f'{self.api_base}/repos/{owner}/{repo}/contents/{path}?ref={branch}'
-            response = self.session.get(url)
+            response = self._get(url)
             response.raise_for_status()
 
             contents = response.json()
@@ -244,11 +1059,13 @@ class GitHubFetcher:
                 item_type = item['type']
                 item_path = Path(target_dir) / item_name
 
-                if item_type == 'file':
+                if item_type == 'file' and pending is not None:
+                    pending.append((item['download_url'], item_path))
+
+                elif item_type == 'file':
                     # Download file
-                    self.wait_for_rate_limit_reset()
                     download_url = item['download_url']
-                    file_response = self.session.get(download_url)
+                    file_response = self._get(download_url)
                     file_response.raise_for_status()
 
                     item_path.write_bytes(file_response.content)
@@ -259,7 +1076,7 @@ class GitHubFetcher:
                     item_path.mkdir(exist_ok=True)
                     subpath = f"{path}/{item_name}"
                     self._fetch_contents_recursive(
-                        owner, repo, branch, subpath, item_path
+                        owner, repo, branch, subpath, item_path, pending
                     )
 
             return True
@@ -268,12 +1085,101 @@ class GitHubFetcher:
             logging.error(f"Failed to fetch contents at {path}: {e}")
             return False
 
+    def resolve_skill_source(
+        self,
+        github_url: str,
+        repo_type: str
+    ) -> Tuple[str, str, str, Optional[str]]:
+        """
+        Work out where a skill lives upstream.
+
+        Args:
+            github_url: GitHub URL
+            repo_type: Type of repository ('standalone', 'multi_skill')
+
+        Returns:
+            Tuple of (owner, repo, branch, subfolder path). The subfolder path
+            is None when the whole repository is fetched.
+        """
+        from utils import parse_github_url
+
+        owner, repo, branch, subfolder_path = parse_github_url(github_url)
+
+        # Get actual default branch if not specified
+        if not subfolder_path:
+            branch = self.get_default_branch(owner, repo)
+
+        if repo_type == 'standalone':
+            subfolder_path = None
+
+        return owner, repo, branch, subfolder_path
+
+    def resolve_revision(
+        self,
+        owner: str,
+        repo: str,
+        ref: str,
+        path: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
+        """
+        Resolve the current commit and tree SHA of a repository or subfolder.
+
+        Costs one API request for a whole repository and two for a subfolder
+        (the commit, then the listing of the subfolder's parent). Both are
+        conditional when an ETag store is configured.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch, tag or SHA
+            path: Subfolder path (optional)
+
+        Returns:
+            Dict with 'commit' and 'tree' SHAs, or None on failure
+        """
+        try:
+            url = f'{self.api_base}/repos/{owner}/{repo}/commits/{quote(ref, safe="")}'
+            response = self._get(url)
+            response.raise_for_status()
+            commit = response.json()
+
+            revision = {
+                'commit': commit['sha'],
+                'tree': commit['commit']['tree']['sha']
+            }
+
+            if path:
+                parent, _, name = path.strip('/').rpartition('/')
+                url = (
+                    f'{self.api_base}/repos/{owner}/{repo}/contents/'
+                    f'{quote(parent)}?ref={revision["commit"]}'
+                )
+                response = self._get(url)
+                response.raise_for_status()
+
+                entries = [
+                    entry for entry in response.json()
+                    if entry['name'] == name and entry['type'] == 'dir'
+                ]
+                if not entries:
+                    logging.warning(f"Path {path} not found in {owner}/{repo}@{ref}")
+                    return None
+                revision['tree'] = entries[0]['sha']
+
+            return revision
+
+        except Exception as e:
+            logging.warning(f"Failed to resolve revision of {owner}/{repo}@{ref}: {e}")
+            return None
+
     def fetch_skill(
         self,
         github_url: str,
         repo_type: str,
         target_folder: str,
-        extraction_config: Dict
+        extraction_config: Dict,
+        commit_sha: Optional[str] = None,
+        archive_dir: Optional[str] = None
     ) -> bool:
         """
         Fetch skill based on repository type and configuration.
@@ -283,39 +1189,68 @@ class GitHubFetcher:
             repo_type: Type of repository ('standalone', 'multi_skill')
             target_folder: Target folder name
             extraction_config: Extraction configuration dict
+            commit_sha: Fetch this commit instead of the branch head (optional)
+            archive_dir: Keep downloaded tarballs here so an interrupted
+                fetch can be resumed (optional)
 
         Returns:
             True if successful, False otherwise
         """
-        from utils import parse_github_url
-
         try:
-            owner, repo, branch, subfolder_path = parse_github_url(github_url)
-
-            # Get actual default branch if not specified
-            if not subfolder_path:
-                branch = self.get_default_branch(owner, repo)
+            owner, repo, branch, subfolder_path = self.resolve_skill_source(
+                github_url, repo_type
+            )
 
             logging.info(
                 f"Fetching {target_folder} from {owner}/{repo} "
                 f"(branch: {branch}, path: {subfolder_path or 'root'})"
             )
 
-            if repo_type == 'standalone' or not subfolder_path:
+            standalone = not subfolder_path
+            exclude_patterns = extraction_config.get(
+                'exclude_patterns',
+                ['.git', '.github', '__pycache__', '*.pyc']
+            )
+
+            # Pin the fetch to a commit so cached content matches its key
+            # and a resumed download continues the same archive
+            if commit_sha is None and (self.cache is not None or archive_dir is not None):
+                commit_sha = self.resolve_commit(owner, repo, branch)
+
+            cache_key = None
+            if commit_sha:
+                branch = commit_sha
+                if self.cache is not None:
+                    cache_key = self.cache.make_key(
+                        owner, repo, commit_sha,
+                        subfolder_path,
+                        exclude_patterns if standalone else None
+                    )
+                    if self.cache.get(cache_key, target_folder):
+                        self._count(cache_hits=1)
+                        return True
+
+            if standalone:
                 # Fetch entire repository
-                exclude_patterns = extraction_config.get(
-                    'exclude_patterns',
-                    ['.git', '.github', '__pycache__', '*.pyc']
-                )
-                return self.fetch_standalone_repo(
-                    owner, repo, branch, target_folder, exclude_patterns
+                fetched = self.fetch_standalone_repo(
+                    owner, repo, branch, target_folder, exclude_patterns,
+                    archive_dir=archive_dir
                 )
             else:
                 # Fetch specific subfolder
-                return self.fetch_subfolder(
-                    owner, repo, branch, subfolder_path, target_folder
+                fetched = self.fetch_subfolder(
+                    owner, repo, branch, subfolder_path, target_folder,
+                    archive_dir=archive_dir
                 )
 
+            if fetched and cache_key:
+                try:
+                    self.cache.put(cache_key, target_folder)
+                except Exception as e:
+                    logging.warning(f"Failed to cache {cache_key}: {e}")
+
+            return fetched
+
         except Exception as e:
             logging.error(f"Failed to fetch skill {target_folder}: {e}")
             return False
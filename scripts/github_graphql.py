@@ -0,0 +1,221 @@
+"""
+GitHub GraphQL module for resolving metadata of many repositories in a few requests.
+
+One query asks for any number of repositories through aliases, so the
+default branch, head commit, subfolder tree SHA and star count of every
+configured skill cost one request per batch instead of one to three REST
+requests per skill. The GraphQL API requires a token.
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from github_fetcher import RateLimitTracker
+
+
+# Repositories per query; keeps each query well below GitHub's node limits
+BATCH_SIZE = 50
+
+# (owner, repo, ref, path): ref None means the default branch, path None
+# means the whole repository
+Target = Tuple[str, str, Optional[str], Optional[str]]
+
+# Sends a query with its variables and returns the decoded JSON response
+Transport = Callable[[str, Dict], Dict]
+
+
+def build_query(
+    repos: List[Tuple[str, str]],
+    targets: Dict[Tuple[str, str], List[Target]]
+) -> Tuple[str, Dict]:
+    """
+    Build one aliased query for a batch of repositories.
+
+    Repository i is aliased r{i} and its owner and name are passed as $o{i}
+    and $n{i}. Target j of it asks for the commit at $c{i}_{j} and, for a
+    subfolder, the object at $p{i}_{j} ("<ref>:<path>").
+
+    Args:
+        repos: (owner, repo) pairs in the batch
+        targets: Targets of each repository
+
+    Returns:
+        Tuple of (query, variables)
+    """
+    declarations = []
+    fields = []
+    variables: Dict[str, str] = {}
+
+    for i, (owner, repo) in enumerate(repos):
+        declarations += [f'$o{i}: String!', f'$n{i}: String!']
+        variables[f'o{i}'] = owner
+        variables[f'n{i}'] = repo
+
+        objects = []
+        for j, (_, _, ref, path) in enumerate(targets[(owner, repo)]):
+            expression = ref or 'HEAD'
+            declarations.append(f'$c{i}_{j}: String!')
+            variables[f'c{i}_{j}'] = expression
+            objects.append(
+                f'c{j}: object(expression: $c{i}_{j}) {{ ... on Commit {{ oid tree {{ oid }} }} }}'
+            )
+            if path:
+                declarations.append(f'$p{i}_{j}: String!')
+                variables[f'p{i}_{j}'] = f'{expression}:{path.strip("/")}'
+                objects.append(f'p{j}: object(expression: $p{i}_{j}) {{ ... on Tree {{ oid }} }}')
+
+        fields.append(
+            f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ '
+            f'defaultBranchRef {{ name }} stargazerCount {" ".join(objects)} }}'
+        )
+
+    query = (
+        f'query({", ".join(declarations)}) {{ '
+        f'rateLimit {{ limit remaining resetAt }} {" ".join(fields)} }}'
+    )
+    return query, variables
+
+
+class GraphQLResolver:
+    """Resolve repository metadata in batched GraphQL queries."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        batch_size: int = BATCH_SIZE,
+        rate_limit: Optional[RateLimitTracker] = None
+    ):
+        """
+        Initialize resolver.
+
+        Args:
+            token: GitHub token; required by the default transport
+            transport: Function sending a query (optional); defaults to
+                POSTing to GITHUB_GRAPHQL_URL, or <GITHUB_API_URL>/graphql
+            batch_size: Maximum repositories per query
+            rate_limit: Tracker of the 'graphql' budget (optional)
+        """
+        self.token = token or os.getenv('GITHUB_TOKEN')
+        self.transport = transport or self._post
+        self.batch_size = max(1, batch_size)
+        self.rate_limit = rate_limit or RateLimitTracker(resource='graphql')
+        self.requests = 0
+
+        api_base = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.url = os.getenv('GITHUB_GRAPHQL_URL', f'{api_base}/graphql')
+        self._session: Optional[requests.Session] = None
+
+    def close(self):
+        """Release network resources held by the default transport."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _post(self, query: str, variables: Dict) -> Dict:
+        """Default transport: POST the query to the GraphQL endpoint."""
+        if not self.token:
+            raise RuntimeError("The GitHub GraphQL API requires a token")
+
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update({'Authorization': f'bearer {self.token}'})
+
+        response = self._session.post(
+            self.url, json={'query': query, 'variables': variables}, timeout=30
+        )
+        self.rate_limit.update(response.headers)
+        response.raise_for_status()
+        return response.json()
+
+    def _observe(self, rate: Optional[Dict]):
+        """Feed the rateLimit field of a response into the tracker."""
+        if not rate or rate.get('remaining') is None:
+            return
+        try:
+            reset = datetime.fromisoformat(rate['resetAt'].replace('Z', '+00:00')).timestamp()
+            self.rate_limit.observe(int(rate['remaining']), reset, rate.get('limit'))
+        except (KeyError, TypeError, ValueError):
+            logging.debug(f"Ignoring malformed GraphQL rate limit: {rate}")
+
+    def resolve(self, targets: List[Target]) -> Dict[Target, Optional[Dict]]:
+        """
+        Resolve the current revision of each target.
+
+        Args:
+            targets: List of (owner, repo, ref, path)
+
+        Returns:
+            Dict mapping each target to a dict with 'default_branch',
+            'branch', 'commit', 'tree' (of the subfolder, or the root tree)
+            and 'stars', or to None if it could not be resolved
+        """
+        by_repo: Dict[Tuple[str, str], List[Target]] = {}
+        for target in dict.fromkeys(targets):
+            by_repo.setdefault((target[0], target[1]), []).append(target)
+
+        results: Dict[Target, Optional[Dict]] = {}
+        repos = list(by_repo)
+        for start in range(0, len(repos), self.batch_size):
+            batch = repos[start:start + self.batch_size]
+            results.update(self._resolve_batch(batch, by_repo))
+
+        return results
+
+    def _resolve_batch(
+        self,
+        repos: List[Tuple[str, str]],
+        by_repo: Dict[Tuple[str, str], List[Target]]
+    ) -> Dict[Target, Optional[Dict]]:
+        """Resolve the targets of one batch of repositories in a single query."""
+        results = {target: None for repo in repos for target in by_repo[repo]}
+        query, variables = build_query(repos, by_repo)
+
+        self.rate_limit.acquire()
+        self.requests += 1
+        try:
+            response = self.transport(query, variables)
+        except Exception as e:
+            logging.warning(f"GraphQL query for {len(repos)} repositories failed: {e}")
+            return results
+
+        data = response.get('data') or {}
+        self._observe(data.get('rateLimit'))
+
+        for error in response.get('errors') or []:
+            logging.warning(f"GraphQL: {error.get('message', error)}")
+
+        for i, (owner, repo) in enumerate(repos):
+            node = data.get(f'r{i}')
+            if not node:
+                logging.warning(f"Could not resolve {owner}/{repo} through GraphQL")
+                continue
+
+            default_branch = (node.get('defaultBranchRef') or {}).get('name')
+            for j, target in enumerate(by_repo[(owner, repo)]):
+                ref, path = target[2], target[3]
+                commit = node.get(f'c{j}') or {}
+                if not commit.get('oid'):
+                    logging.warning(f"Ref {ref or 'HEAD'} not found in {owner}/{repo}")
+                    continue
+
+                tree = commit['tree']['oid']
+                if path:
+                    subtree = node.get(f'p{j}') or {}
+                    if not subtree.get('oid'):
+                        logging.warning(f"Path {path} not found in {owner}/{repo}@{ref or 'HEAD'}")
+                        continue
+                    tree = subtree['oid']
+
+                results[target] = {
+                    'default_branch': default_branch,
+                    'branch': ref or default_branch,
+                    'commit': commit['oid'],
+                    'tree': tree,
+                    'stars': node.get('stargazerCount')
+                }
+
+        return results
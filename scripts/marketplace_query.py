@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Search marketplace plugins by keyword, name prefix and category.
+
+Builds an in-memory inverted index over plugin names, descriptions and
+categories. Latin text is split into lowercase words (hyphenated names
+into their parts); CJK text is indexed as single characters and
+overlapping character pairs, so Chinese queries match without a
+dictionary. Indexes are cached per file and rebuilt only when
+marketplace.json changes.
+
+Usage:
+    python marketplace_query.py [query] [options]
+
+Options:
+    --marketplace PATH  Path to marketplace.json
+                        (default: .claude-plugin/marketplace.json)
+    --category NAME     Only return plugins in this category
+    --limit N           Maximum number of results (default: 20)
+    --json              Print results as JSON
+    --export PATH       Write a compact prebuilt index for the frontend
+"""
+import argparse
+import bisect
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+COMPACT_INDEX_VERSION = 3
+
+# Plugin fields kept in the compact index, category last
+COMPACT_FIELDS = ('name', 'description', 'source', 'category')
+
+# Relative weight of a term occurring in each field
+FIELD_WEIGHTS = {'name': 3, 'category': 2, 'description': 1}
+
+# Common English words left out of the index and queries
+STOPWORDS = frozenset(
+    'a an and are as at be by for from in into is it of on or the this to '
+    'use used using when with your'.split()
+)
+
+# Score factor for a query term matched only as a prefix of an indexed term
+PREFIX_FACTOR = 0.5
+
+CJK_RANGES = (
+    '぀-ヿ'   # Hiragana, Katakana
+    '㐀-䶿'   # CJK Extension A
+    '一-鿿'   # CJK Unified Ideographs
+    '가-힯'   # Hangul syllables
+    '豈-﫿'   # CJK Compatibility Ideographs
+)
+TOKEN_PATTERN = re.compile(f'([{CJK_RANGES}]+)|([^\\W_{CJK_RANGES}]+)')
+CJK_PATTERN = re.compile(f'[{CJK_RANGES}]')
+
+
+def tokenize(text: str, for_query: bool = False) -> List[str]:
+    """
+    Split text into index terms, dropping STOPWORDS.
+
+    Examples:
+        "PDF-form filler" → ["pdf", "form", "filler"]
+        "数据分析" → ["数", "据", "分", "析", "数据", "据分", "分析"]
+        "数据分析" (for_query) → ["数据", "据分", "分析"]
+
+    Args:
+        text: Text to tokenize
+        for_query: Use the minimal set of terms needed to match a query;
+            CJK runs of two or more characters give only their pairs
+
+    Returns:
+        List of terms, in order of appearance
+    """
+    tokens = []
+    for cjk, word in TOKEN_PATTERN.findall(text.lower()):
+        if word:
+            if word not in STOPWORDS:
+                tokens.append(word)
+            continue
+
+        pairs = [cjk[i:i + 2] for i in range(len(cjk) - 1)]
+        if for_query and pairs:
+            tokens.extend(pairs)
+        else:
+            tokens.extend(cjk)
+            tokens.extend(pairs)
+    return tokens
+
+
+class MarketplaceIndex:
+    """Inverted index over the plugins of one marketplace."""
+
+    def __init__(self, plugins: List[Dict]):
+        """
+        Build the index.
+
+        Args:
+            plugins: Plugin entries from marketplace.json
+        """
+        self.plugins = plugins
+        self.by_name: Dict[str, int] = {}
+        self.by_category: Dict[str, List[int]] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+
+        for doc, plugin in enumerate(plugins):
+            name = plugin.get('name')
+            if name:
+                self.by_name.setdefault(name, doc)
+            self.by_category.setdefault(plugin.get('category', ''), []).append(doc)
+
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(str(plugin.get(field, ''))):
+                    postings = self.postings.setdefault(token, {})
+                    postings[doc] = postings.get(doc, 0) + weight
+
+        # Sorted vocabulary for prefix lookups
+        self.vocabulary = sorted(self.postings)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Get a plugin by exact name."""
+        doc = self.by_name.get(name)
+        return None if doc is None else self.plugins[doc]
+
+    def names(self) -> List[str]:
+        """Plugin names in marketplace order."""
+        return [p['name'] for p in self.plugins if p.get('name')]
+
+    def categories(self) -> Dict[str, int]:
+        """Number of plugins in each category."""
+        return {category: len(docs) for category, docs in sorted(self.by_category.items())}
+
+    def _expand(self, term: str, prefix: bool) -> Dict[int, float]:
+        """Score documents for one query term, including prefix matches."""
+        scores: Dict[int, float] = {}
+        total = len(self.plugins)
+
+        candidates = [term]
+        if prefix:
+            start = bisect.bisect_left(self.vocabulary, term)
+            candidates = []
+            for token in self.vocabulary[start:]:
+                if not token.startswith(term):
+                    break
+                candidates.append(token)
+
+        for token in candidates:
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            factor = 1.0 if token == term else PREFIX_FACTOR
+            for doc, weight in postings.items():
+                score = weight * idf * factor
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(
+        self,
+        query: str = '',
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefix: bool = True
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Find plugins matching every term of a query.
+
+        Args:
+            query: Keywords; an empty query matches every plugin
+            category: Only return plugins in this category
+            limit: Maximum number of results (None = all)
+            prefix: Also match indexed terms that start with a query term
+                (CJK terms always match exactly)
+
+        Returns:
+            List of (plugin, score) pairs, best match first
+        """
+        if category is not None:
+            allowed = set(self.by_category.get(category, []))
+        else:
+            allowed = set(range(len(self.plugins)))
+
+        terms = list(dict.fromkeys(tokenize(query, for_query=True)))
+        if not terms:
+            results = [(doc, 0.0) for doc in sorted(allowed)]
+        else:
+            totals: Optional[Dict[int, float]] = None
+            for term in terms:
+                scores = self._expand(term, prefix and not CJK_PATTERN.match(term))
+                if totals is None:
+                    totals = {doc: s for doc, s in scores.items() if doc in allowed}
+                else:
+                    totals = {doc: s + scores[doc] for doc, s in totals.items() if doc in scores}
+                if not totals:
+                    return []
+
+            results = sorted(
+                totals.items(),
+                key=lambda item: (-item[1], self.plugins[item[0]].get('name', ''))
+            )
+
+        if limit is not None:
+            results = results[:limit]
+        return [(self.plugins[doc], round(score, 4)) for doc, score in results]
+
+    def to_compact(self) -> Dict:
+        """
+        Serialize the index in a compact form the frontend can load
+        instead of marketplace.json.
+
+        Plugins become arrays in 'fields' order with the category replaced
+        by its position in 'categories'. Terms with the same posting list
+        share one entry, [space-separated terms, postings], where postings
+        is a flat array of alternating plugin position gaps (from the
+        previous plugin in the list) and term weights. Nothing is dropped
+        or rounded, so from_compact() gives back an index that searches
+        exactly like this one.
+
+        Returns:
+            JSON-serializable dict
+        """
+        categories = sorted(self.by_category)
+        category_ids = {category: i for i, category in enumerate(categories)}
+
+        plugins = []
+        for plugin in self.plugins:
+            row = [plugin.get(field, '') for field in COMPACT_FIELDS]
+            row[-1] = category_ids[plugin.get('category', '')]
+            plugins.append(row)
+
+        groups: Dict[Tuple[int, ...], List[str]] = {}
+        for token in self.vocabulary:
+            flat = []
+            previous = 0
+            for doc, weight in sorted(self.postings[token].items()):
+                flat.extend((doc - previous, weight))
+                previous = doc
+            groups.setdefault(tuple(flat), []).append(token)
+
+        return {
+            'version': COMPACT_INDEX_VERSION,
+            'fields': list(COMPACT_FIELDS),
+            'categories': categories,
+            'plugins': plugins,
+            'postings': [[' '.join(tokens), list(flat)] for flat, tokens in groups.items()]
+        }
+
+    @classmethod
+    def from_compact(cls, data: Dict) -> 'MarketplaceIndex':
+        """
+        Rebuild an index from to_compact() output.
+
+        Plugins only carry the fields in COMPACT_FIELDS.
+
+        Args:
+            data: Dict as returned by to_compact()
+
+        Returns:
+            MarketplaceIndex
+        """
+        if data.get('version') != COMPACT_INDEX_VERSION:
+            raise ValueError(f"Unsupported compact index version: {data.get('version')}")
+
+        fields = data['fields']
+        plugins = []
+        for row in data['plugins']:
+            plugin = dict(zip(fields, row))
+            plugin['category'] = data['categories'][plugin['category']]
+            plugins.append(plugin)
+
+        index = cls([])
+        index.plugins = plugins
+        for doc, plugin in enumerate(plugins):
+            if plugin['name']:
+                index.by_name.setdefault(plugin['name'], doc)
+            index.by_category.setdefault(plugin['category'], []).append(doc)
+
+        for terms, flat in data['postings']:
+            postings = {}
+            doc = 0
+            for gap, weight in zip(flat[::2], flat[1::2]):
+                doc += gap
+                postings[doc] = weight
+            for token in terms.split(' '):
+                index.postings[token] = dict(postings)
+        index.vocabulary = sorted(index.postings)
+        return index
+
+
+# Loaded indexes by resolved path: (mtime_ns, size, index)
+_index_cache: Dict[str, Tuple[int, int, MarketplaceIndex]] = {}
+_index_lock = threading.Lock()
+
+
+def load_index(marketplace_path: str) -> Optional[MarketplaceIndex]:
+    """
+    Get the index for a marketplace file, rebuilding it only if the file changed.
+
+    Args:
+        marketplace_path: Path to marketplace.json
+
+    Returns:
+        MarketplaceIndex, or None if the file cannot be loaded
+    """
+    from marketplace_updater import load_marketplace
+
+    key = str(Path(marketplace_path).resolve())
+    try:
+        stat = os.stat(key)
+    except OSError as e:
+        logging.error(f"Failed to load marketplace from {marketplace_path}: {e}")
+        return None
+
+    with _index_lock:
+        cached = _index_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+    marketplace = load_marketplace(marketplace_path)
+    if not marketplace:
+        return None
+
+    index = MarketplaceIndex(marketplace.get('plugins', []))
+    with _index_lock:
+        _index_cache[key] = (stat.st_mtime_ns, stat.st_size, index)
+    return index
+
+
+def export_compact_index(marketplace_path: str, output_path: str) -> bool:
+    """
+    Write the compact index of a marketplace to a file.
+
+    Args:
+        marketplace_path: Path to marketplace.json
+        output_path: Path of the index file to write
+
+    Returns:
+        True if successful, False otherwise
+    """
+    index = load_index(marketplace_path)
+    if index is None:
+        return False
+
+    try:
+        data = json.dumps(index.to_compact(), ensure_ascii=False, separators=(',', ':'))
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+
+        logging.info(f"Wrote compact index to {output_path} ({len(data.encode('utf-8'))} bytes)")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to write compact index to {output_path}: {e}")
+        return False
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Search marketplace plugins')
+    parser.add_argument('query', nargs='*', help='Keywords to search for')
+    parser.add_argument(
+        '--marketplace',
+        default='.claude-plugin/marketplace.json',
+        help='Path to marketplace.json (default: .claude-plugin/marketplace.json)'
+    )
+    parser.add_argument('--category', help='Only return plugins in this category')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='Maximum number of results (default: 20)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--export', metavar='PATH',
+                        help='Write a compact prebuilt index for the frontend')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    if args.export:
+        sys.exit(0 if export_compact_index(args.marketplace, args.export) else 1)
+
+    index = load_index(args.marketplace)
+    if index is None:
+        sys.exit(1)
+
+    results = index.search(' '.join(args.query), category=args.category, limit=args.limit)
+
+    if args.json:
+        print(json.dumps(
+            [dict(plugin, score=score) for plugin, score in results],
+            indent=2, ensure_ascii=False
+        ))
+        return
+
+    for plugin, score in results:
+        print(f"{score:>7.2f}  {plugin['name']:<40} [{plugin.get('category', '')}]")
+    if not results:
+        print("No matching plugins")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,43 +3,28 @@ Marketplace updater module for managing marketplace.json.
 """
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional
-from jsonschema import validate, ValidationError
-
-
-# Marketplace schema
-MARKETPLACE_SCHEMA = {
-    "$schema": "http://json-schema.org/draft-07/schema#",
-    "type": "object",
-    "required": ["name", "version", "description", "owner", "plugins"],
-    "properties": {
-        "name": {"type": "string"},
-        "version": {"type": "string"},
-        "description": {"type": "string"},
-        "owner": {
-            "type": "object",
-            "required": ["name", "email"],
-            "properties": {
-                "name": {"type": "string"},
-                "email": {"type": "string"}
-            }
-        },
-        "plugins": {
-            "type": "array",
-            "items": {
-                "type": "object",
-                "required": ["name", "description", "source", "category"],
-                "properties": {
-                    "name": {"type": "string"},
-                    "description": {"type": "string"},
-                    "source": {"type": "string"},
-                    "category": {"type": "string"}
-                }
-            }
-        }
-    }
-}
+
+# Schemas are defined in schemas.py and re-exported here
+from schemas import MARKETPLACE_SCHEMA, PLUGIN_SCHEMA, schema_errors
+
+__all__ = [
+    'MARKETPLACE_SCHEMA',
+    'PLUGIN_SCHEMA',
+    'load_marketplace',
+    'serialize_marketplace',
+    'save_marketplace',
+    'validate_marketplace_schema',
+    'validate_plugin_entry',
+    'create_marketplace_entry',
+    'update_marketplace_plugins',
+    'update_marketplace_with_skills',
+    'get_plugin_by_name',
+    'list_marketplace_plugins',
+]
 
 
 def load_marketplace(marketplace_path: str) -> Optional[Dict]:
@@ -62,14 +47,37 @@ def load_marketplace(marketplace_path: str) -> Optional[Dict]:
         return None
 
 
-def save_marketplace(marketplace_path: str, data: Dict, create_backup: bool = True) -> bool:
+def serialize_marketplace(data: Dict, trailing_newline: bool = True) -> str:
+    """
+    Format marketplace data exactly as it is written to disk.
+
+    Args:
+        data: Marketplace data
+        trailing_newline: End the text with a newline
+
+    Returns:
+        Pretty-printed JSON
+    """
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    return text + '\n' if trailing_newline else text
+
+
+def save_marketplace(
+    marketplace_path: str,
+    data: Dict,
+    create_backup: bool = True,
+    trailing_newline: bool = True
+) -> bool:
     """
     Save marketplace data to file.
 
+    The file is replaced atomically, so readers never see a partial write.
+
     Args:
         marketplace_path: Path to marketplace.json
         data: Marketplace data
         create_backup: Whether to create backup before saving
+        trailing_newline: End the file with a newline
 
     Returns:
         True if successful, False otherwise
@@ -81,10 +89,16 @@ def save_marketplace(marketplace_path: str, data: Dict, create_backup: bool = Tr
         if create_backup and Path(marketplace_path).exists():
             backup_file(marketplace_path)
 
-        # Write to file with pretty formatting
-        with open(marketplace_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write('\n')  # Add trailing newline
+        # Write to a temp file next to the target, then rename over it
+        target = Path(marketplace_path)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.marketplace_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(serialize_marketplace(data, trailing_newline))
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
 
         logging.info(f"Saved marketplace to {marketplace_path}")
         return True
@@ -97,6 +111,8 @@ def validate_marketplace_schema(data: Dict) -> bool:
     """
     Validate marketplace data against schema.
 
+    Every error is logged, with the JSON pointer of the offending value.
+
     Args:
         data: Marketplace data
 
@@ -104,16 +120,36 @@ def validate_marketplace_schema(data: Dict) -> bool:
         True if valid, False otherwise
     """
     try:
-        validate(instance=data, schema=MARKETPLACE_SCHEMA)
-        logging.info("Marketplace schema validation passed")
-        return True
-    except ValidationError as e:
-        logging.error(f"Marketplace schema validation failed: {e.message}")
-        return False
+        errors = schema_errors('marketplace', data)
     except Exception as e:
         logging.error(f"Unexpected error during schema validation: {e}")
         return False
 
+    if errors:
+        logging.error(f"Marketplace schema validation failed with {len(errors)} error(s):")
+        for error in errors:
+            logging.error(f"  {error}")
+        return False
+
+    logging.info("Marketplace schema validation passed")
+    return True
+
+
+def validate_plugin_entry(entry: Dict) -> bool:
+    """
+    Validate a single plugin entry against the plugin schema.
+
+    Args:
+        entry: Plugin entry
+
+    Returns:
+        True if valid, False otherwise
+    """
+    errors = schema_errors('plugin', entry)
+    for error in errors:
+        logging.error(f"Invalid plugin entry {entry.get('name')!r}: {error}")
+    return not errors
+
 
 def create_marketplace_entry(
     skill_config: Dict,
@@ -144,53 +180,75 @@ def create_marketplace_entry(
     return entry
 
 
-def merge_plugins(
-    existing_plugins: List[Dict],
-    new_plugins: List[Dict]
-) -> List[Dict]:
+def update_marketplace_plugins(
+    marketplace_path: str,
+    entries: List[Dict],
+    replace_existing: bool = False,
+    sort_plugins: bool = True
+) -> bool:
     """
-    Merge existing and new plugin lists, deduplicating by name.
+    Apply a set of changed plugin entries to marketplace.json.
 
-    Existing plugins take precedence over new ones with same name.
+    Only the given entries are validated (against PLUGIN_SCHEMA); the rest
+    of the file is taken as-is. The file is rewritten, with a backup, only
+    if an entry is added or replaced, and keeps its trailing newline (or
+    lack of one).
 
     Args:
-        existing_plugins: Current plugins from marketplace
-        new_plugins: New plugins to add
+        marketplace_path: Path to marketplace.json
+        entries: Plugin entries to add or update
+        replace_existing: If True, entries replace existing plugins with the
+            same name; otherwise existing plugins take precedence
+        sort_plugins: Keep the plugin list sorted by name
 
     Returns:
-        Merged and deduplicated plugin list, sorted by name
+        True if successful (including when nothing changed), False otherwise
     """
-    # Create dict indexed by plugin name
-    plugins_dict = {}
-
-    # Add existing plugins first (they take precedence)
-    for plugin in existing_plugins:
-        name = plugin.get('name')
-        if name:
-            plugins_dict[name] = plugin
-
-    # Add new plugins (skip if name already exists)
-    added_count = 0
-    skipped_count = 0
-    for plugin in new_plugins:
-        name = plugin.get('name')
-        if name:
-            if name in plugins_dict:
-                logging.warning(f"Skipping duplicate plugin: {name}")
-                skipped_count += 1
-            else:
-                plugins_dict[name] = plugin
-                added_count += 1
+    if not all(validate_plugin_entry(entry) for entry in entries):
+        logging.error("Refusing to update marketplace with invalid entries")
+        return False
+
+    try:
+        original = Path(marketplace_path).read_text(encoding='utf-8')
+        marketplace = json.loads(original)
+    except Exception as e:
+        logging.error(f"Failed to load marketplace from {marketplace_path}: {e}")
+        return False
+
+    plugins = marketplace.setdefault('plugins', [])
+    positions = {plugin.get('name'): i for i, plugin in enumerate(plugins)}
+
+    added = replaced = skipped = 0
+    for entry in entries:
+        name = entry['name']
+        position = positions.get(name)
+
+        if position is None:
+            positions[name] = len(plugins)
+            plugins.append(entry)
+            added += 1
+        elif not replace_existing:
+            logging.warning(f"Skipping duplicate plugin: {name}")
+            skipped += 1
+        elif plugins[position] != entry:
+            plugins[position] = entry
+            replaced += 1
 
     logging.info(
-        f"Merged plugins: {len(existing_plugins)} existing, "
-        f"{added_count} added, {skipped_count} skipped (duplicates)"
+        f"Merged plugins: {len(positions) - added} existing, "
+        f"{added} added, {replaced} replaced, {skipped} skipped (duplicates)"
     )
 
-    # Convert back to list and sort by name
-    merged_plugins = sorted(plugins_dict.values(), key=lambda p: p.get('name', ''))
+    if not added and not replaced:
+        logging.info(f"Marketplace unchanged, not rewriting {marketplace_path}")
+        return True
 
-    return merged_plugins
+    if sort_plugins:
+        plugins.sort(key=lambda p: p.get('name', ''))
+
+    return save_marketplace(
+        marketplace_path, marketplace, trailing_newline=original.endswith('\n')
+    )
 
 
 def update_marketplace_with_skills(
@@ -201,6 +259,9 @@ def update_marketplace_with_skills(
     """
     Update marketplace.json with new skills.
 
+    Existing plugins take precedence and the plugin list is kept sorted by
+    name. The file is only rewritten when this changes it.
+
     Args:
         marketplace_path: Path to marketplace.json
         skill_configs: List of skill configurations
@@ -210,16 +271,6 @@ def update_marketplace_with_skills(
         True if successful, False otherwise
     """
     try:
-        # Load existing marketplace
-        marketplace = load_marketplace(marketplace_path)
-        if not marketplace:
-            logging.error("Failed to load marketplace")
-            return False
-
-        # Get existing plugins
-        existing_plugins = marketplace.get('plugins', [])
-        logging.info(f"Found {len(existing_plugins)} existing plugins")
-
         # Create new plugin entries
         new_plugins = []
         for skill_config in skill_configs:
@@ -231,26 +282,12 @@ def update_marketplace_with_skills(
 
         logging.info(f"Created {len(new_plugins)} new plugin entries")
 
-        # Merge plugins
-        merged_plugins = merge_plugins(existing_plugins, new_plugins)
-
-        # Update marketplace
-        marketplace['plugins'] = merged_plugins
-
-        # Validate schema
-        if not validate_marketplace_schema(marketplace):
-            logging.error("Marketplace validation failed after update")
-            return False
-
-        # Save marketplace
-        if not save_marketplace(marketplace_path, marketplace):
+        # Merge into the marketplace, writing only if it changed
+        if not update_marketplace_plugins(marketplace_path, new_plugins):
             logging.error("Failed to save updated marketplace")
             return False
 
-        logging.info(
-            f"Successfully updated marketplace: "
-            f"{len(merged_plugins)} total plugins"
-        )
+        logging.info("Successfully updated marketplace")
         return True
 
     except Exception as e:
@@ -262,6 +299,9 @@ def get_plugin_by_name(marketplace_path: str, plugin_name: str) -> Optional[Dict
     """
     Get a specific plugin by name from marketplace.
 
+    Lookups go through the cached marketplace_query index, so the file is
+    only re-read after it changes.
+
     Args:
         marketplace_path: Path to marketplace.json
         plugin_name: Plugin name to search for
@@ -269,16 +309,14 @@ def get_plugin_by_name(marketplace_path: str, plugin_name: str) -> Optional[Dict
     Returns:
         Plugin dict if found, None otherwise
     """
-    marketplace = load_marketplace(marketplace_path)
-    if not marketplace:
-        return None
+    from marketplace_query import load_index
 
-    plugins = marketplace.get('plugins', [])
-    for plugin in plugins:
-        if plugin.get('name') == plugin_name:
-            return plugin
+    index = load_index(marketplace_path)
+    if index is None:
+        return None
 
-    return None
+    plugin = index.get(plugin_name)
+    return dict(plugin) if plugin is not None else None
 
 
 def list_marketplace_plugins(marketplace_path: str) -> List[str]:
@@ -291,9 +329,10 @@ def list_marketplace_plugins(marketplace_path: str) -> List[str]:
     Returns:
         List of plugin names
     """
-    marketplace = load_marketplace(marketplace_path)
-    if not marketplace:
+    from marketplace_query import load_index
+
+    index = load_index(marketplace_path)
+    if index is None:
         return []
 
-    plugins = marketplace.get('plugins', [])
-    return [p.get('name') for p in plugins if p.get('name')]
+    return index.names()
@@ -0,0 +1,161 @@
+"""
+Metadata index module for caching parsed SKILL.md frontmatter on disk.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+INDEX_VERSION = 1
+
+
+def default_index_path(base_dir: str) -> str:
+    """
+    Get the standard index location for a skills vault.
+
+    Args:
+        base_dir: Root of the skills vault
+
+    Returns:
+        Path to .cache/skill_metadata.json under base_dir
+    """
+    return str(Path(base_dir) / '.cache' / 'skill_metadata.json')
+
+
+class MetadataIndex:
+    """
+    Parsed SKILL.md frontmatter keyed by file path, mtime and size.
+
+    An entry is reused only while the file's mtime and size are unchanged,
+    so only edited SKILL.md files are parsed again. Safe to share between
+    threads; processes should each look up through the parent (see
+    skill_processor.iter_validation_results).
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize metadata index, loading it if it exists.
+
+        Args:
+            path: JSON file to persist the index in
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = data.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable metadata index {self.path}: {e}")
+
+    @staticmethod
+    def _key(skill_md_path: str) -> str:
+        return str(Path(skill_md_path).resolve())
+
+    @staticmethod
+    def _signature(skill_md_path: str) -> Optional[Dict[str, int]]:
+        try:
+            stat = os.stat(skill_md_path)
+        except OSError:
+            return None
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def lookup(self, skill_md_path: str) -> Optional[Dict]:
+        """
+        Get cached metadata if the file is unchanged since it was indexed.
+
+        Args:
+            skill_md_path: Path to SKILL.md
+
+        Returns:
+            Metadata dict, or None if missing or stale
+        """
+        signature = self._signature(skill_md_path)
+        with self._lock:
+            entry = self.entries.get(self._key(skill_md_path))
+            if signature is None or entry is None:
+                return None
+            if entry['mtime_ns'] != signature['mtime_ns'] or entry['size'] != signature['size']:
+                return None
+            return dict(entry['metadata'])
+
+    def store(self, skill_md_path: str, metadata: Dict) -> Dict:
+        """
+        Record parsed metadata for a file at its current mtime and size.
+
+        Args:
+            skill_md_path: Path to SKILL.md
+            metadata: Parsed frontmatter
+
+        Returns:
+            The metadata as later lookups return it (JSON types only, so
+            dates become strings)
+        """
+        # Round-trip through JSON so cached and stored values look alike
+        metadata = json.loads(json.dumps(metadata, ensure_ascii=False, default=str))
+
+        signature = self._signature(skill_md_path)
+        if signature is None:
+            return metadata
+
+        with self._lock:
+            self.entries[self._key(skill_md_path)] = dict(signature, metadata=metadata)
+            self.dirty = True
+        return dict(metadata)
+
+    def get(self, skill_md_path: str, parse: Callable[[str], Dict]) -> Dict:
+        """
+        Get metadata, parsing and indexing the file only if it changed.
+
+        Args:
+            skill_md_path: Path to SKILL.md
+            parse: Function parsing a SKILL.md path into metadata
+
+        Returns:
+            Metadata dict, the same on a hit or a miss
+        """
+        metadata = self.lookup(skill_md_path)
+        if metadata is not None:
+            with self._lock:
+                self.hits += 1
+            return metadata
+
+        with self._lock:
+            self.misses += 1
+        return self.store(skill_md_path, parse(skill_md_path))
+
+    def save(self):
+        """Write the index atomically, dropping entries for deleted files."""
+        with self._lock:
+            stale = [key for key in self.entries if not os.path.exists(key)]
+            for key in stale:
+                del self.entries[key]
+
+            if not (self.dirty or stale):
+                return
+
+            data = {'version': INDEX_VERSION, 'entries': dict(self.entries)}
+            self.dirty = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.metadata_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            logging.debug(f"Saved metadata index: {self.path}")
+        except Exception as e:
+            Path(tmp_path).unlink(missing_ok=True)
+            logging.warning(f"Failed to save metadata index {self.path}: {e}")
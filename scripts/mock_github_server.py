@@ -0,0 +1,482 @@
+"""
+Local stand-in for the parts of GitHub the skill fetcher talks to.
+
+Serves the REST endpoints (repos, commits, git trees, contents,
+rate_limit), the GraphQL queries built by github_graphql, raw file
+downloads and repository tarballs (with byte range support) for a set
+of generated repositories. Latency and errors can be injected, and every
+request is counted so benchmarks can report request counts and bytes
+transferred without touching the network.
+
+Point GitHubFetcher at it through the environment:
+
+    GITHUB_API_URL=<url>/api GITHUB_SERVER_URL=<url>/web GITHUB_RAW_URL=<url>/raw
+
+GraphQL is served at <url>/api/graphql, where GraphQLResolver looks for it.
+"""
+import hashlib
+import io
+import json
+import random
+import re
+import tarfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+class MockRepository:
+    """An in-memory repository: a fixed set of files at a single commit."""
+
+    def __init__(
+        self,
+        owner: str,
+        name: str,
+        files: Dict[str, bytes],
+        branch: str = 'main',
+        stars: int = 0
+    ):
+        """
+        Initialize mock repository.
+
+        Args:
+            owner: Repository owner
+            name: Repository name
+            files: Mapping of POSIX path to file content
+            branch: Default branch name
+            stars: Stargazer count reported through GraphQL
+        """
+        self.owner = owner
+        self.name = name
+        self.files = files
+        self.branch = branch
+        self.stars = stars
+
+        digest = hashlib.sha1()
+        for path in sorted(files):
+            digest.update(path.encode() + b'\0' + files[path])
+        self.commit_sha = digest.hexdigest()
+        self._tarball: Optional[bytes] = None
+
+    def blob_sha(self, content: bytes) -> str:
+        """Git blob SHA of a file's content."""
+        return hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+    def tree_sha(self, path: str = '') -> str:
+        """Stable stand-in for the tree SHA of a directory."""
+        prefix = path.strip('/') + '/' if path.strip('/') else ''
+        digest = hashlib.sha1(prefix.encode())
+        for file_path in sorted(self.files):
+            if file_path.startswith(prefix):
+                digest.update(file_path.encode() + b'\0' + self.files[file_path])
+        return digest.hexdigest()
+
+    def resolves(self, ref: str) -> bool:
+        """Check whether a ref names this repository's only commit."""
+        return ref in ('HEAD', self.branch, self.commit_sha)
+
+    def tarball(self) -> bytes:
+        """Build (once) the gzip tarball GitHub would serve for the commit."""
+        if self._tarball is None:
+            buffer = io.BytesIO()
+            root = f'{self.name}-{self.commit_sha[:7]}'
+            with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+                info = tarfile.TarInfo(root)
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                tar.addfile(info)
+
+                for path in sorted(self.files):
+                    info = tarfile.TarInfo(f'{root}/{path}')
+                    info.size = len(self.files[path])
+                    info.mode = 0o644
+                    tar.addfile(info, io.BytesIO(self.files[path]))
+            self._tarball = buffer.getvalue()
+        return self._tarball
+
+    def list_directory(self, path: str) -> Optional[list]:
+        """Contents API listing of a directory, or None if it does not exist."""
+        prefix = path.strip('/') + '/' if path.strip('/') else ''
+        entries = {}
+
+        for file_path, content in self.files.items():
+            if not file_path.startswith(prefix):
+                continue
+            name, _, rest = file_path[len(prefix):].partition('/')
+            if rest:
+                entries[name] = {'name': name, 'type': 'dir', 'sha': self.tree_sha(prefix + name)}
+            else:
+                entries[name] = {
+                    'name': name,
+                    'type': 'file',
+                    'size': len(content),
+                    'sha': self.blob_sha(content)
+                }
+
+        if not entries:
+            return None
+        return [entries[name] for name in sorted(entries)]
+
+
+class MockGitHubServer:
+    """Threaded HTTP server emulating GitHub for a set of repositories."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: int = 5000,
+        seed: int = 0
+    ):
+        """
+        Initialize mock server.
+
+        Args:
+            latency: Seconds to wait before answering each request
+            error_rate: Probability of answering a download with 502
+            rate_limit: API requests allowed per window
+            seed: Seed for error injection
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_time = int(time.time()) + 3600
+        self.repos: Dict[str, MockRepository] = {}
+
+        self.counts: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add_repository(self, repo: MockRepository):
+        """Serve a repository."""
+        self.repos[f'{repo.owner}/{repo.name}'] = repo
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables pointing GitHubFetcher at this server."""
+        return {
+            'GITHUB_API_URL': f'{self.url}/api',
+            'GITHUB_SERVER_URL': f'{self.url}/web',
+            'GITHUB_RAW_URL': f'{self.url}/raw'
+        }
+
+    def start(self) -> 'MockGitHubServer':
+        """Start serving on an ephemeral localhost port."""
+        handler = type('Handler', (_MockGitHubHandler,), {'mock': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, kind: str, body_bytes: int = 0):
+        """Record a served request."""
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            self.bytes_sent += body_bytes
+
+    def consume_api_request(self) -> int:
+        """Take one request from the API budget and return what is left."""
+        with self._lock:
+            self.remaining = max(0, self.remaining - 1)
+            return self.remaining
+
+    def should_fail(self) -> bool:
+        """Decide whether to inject an error into this response."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def stats(self) -> Dict:
+        """Request counts by kind, total requests and bytes sent."""
+        with self._lock:
+            return {
+                'requests': sum(self.counts.values()),
+                'by_kind': dict(sorted(self.counts.items())),
+                'bytes_sent': self.bytes_sent
+            }
+
+
+class _MockGitHubHandler(BaseHTTPRequestHandler):
+    """Routes requests to the owning MockGitHubServer's repositories."""
+
+    mock: MockGitHubServer = None
+    protocol_version = 'HTTP/1.1'
+
+    API_ROUTES = [
+        (re.compile(r'^/api/rate_limit$'), '_rate_limit'),
+        (re.compile(r'^/api/repos/([^/]+)/([^/]+)$'), '_repo'),
+        (re.compile(r'^/api/repos/([^/]+)/([^/]+)/commits/(.+)$'), '_commit'),
+        (re.compile(r'^/api/repos/([^/]+)/([^/]+)/git/trees/(.+)$'), '_tree'),
+        (re.compile(r'^/api/repos/([^/]+)/([^/]+)/contents/?(.*)$'), '_contents'),
+    ]
+    RAW_ROUTE = re.compile(r'^/raw/([^/]+)/([^/]+)/([^/]+)/(.+)$')
+    TARBALL_ROUTE = re.compile(
+        r'^/web/([^/]+)/([^/]+)/archive/(?:refs/heads/)?(.+)\.tar\.gz$'
+    )
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        self.query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        for pattern, method in self.API_ROUTES:
+            match = pattern.match(path)
+            if match:
+                return self._api(method, *match.groups())
+
+        match = self.RAW_ROUTE.match(path)
+        if match:
+            return self._raw(*match.groups())
+
+        match = self.TARBALL_ROUTE.match(path)
+        if match:
+            return self._tarball(*match.groups())
+
+        self._send(404, b'Not Found', 'text/plain', 'not_found')
+
+    def do_POST(self):
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if unquote(urlparse(self.path).path) != '/api/graphql':
+            self._send(404, b'Not Found', 'text/plain', 'not_found')
+            return
+
+        try:
+            variables = json.loads(body).get('variables') or {}
+        except ValueError:
+            self._send(400, b'{"message": "Problems parsing JSON"}', 'application/json', 'graphql')
+            return
+
+        remaining = self.mock.consume_api_request()
+        self._send(
+            200, json.dumps(self._graphql(variables, remaining)).encode(), 'application/json',
+            'graphql', rate_headers=True, resource='graphql'
+        )
+
+    def _graphql(self, variables: Dict[str, str], remaining: int) -> Dict:
+        """
+        Answer a github_graphql query from its variables alone.
+
+        The query shape is fixed by github_graphql.build_query: $o{i}/$n{i}
+        name repository r{i}, $c{i}_{j} a commit and $p{i}_{j} a tree in it.
+        """
+        reset_at = datetime.fromtimestamp(self.mock.reset_time, timezone.utc)
+        data = {'rateLimit': {
+            'limit': self.mock.rate_limit,
+            'remaining': remaining,
+            'resetAt': reset_at.strftime('%Y-%m-%dT%H:%M:%SZ')
+        }}
+        errors = []
+
+        for key, owner in variables.items():
+            if not re.fullmatch(r'o\d+', key):
+                continue
+            i = key[1:]
+            name = variables.get(f'n{i}', '')
+            repo = self._find_repo(owner, name)
+            if repo is None:
+                data[f'r{i}'] = None
+                errors.append({
+                    'type': 'NOT_FOUND',
+                    'path': [f'r{i}'],
+                    'message': f"Could not resolve to a Repository with the name '{owner}/{name}'."
+                })
+                continue
+
+            node = {'defaultBranchRef': {'name': repo.branch}, 'stargazerCount': repo.stars}
+            for field, value in variables.items():
+                match = re.fullmatch(rf'([cp]){i}_(\d+)', field)
+                if not match:
+                    continue
+                kind, j = match.groups()
+                ref, _, path = value.partition(':')
+                if not repo.resolves(ref):
+                    node[f'{kind}{j}'] = None
+                elif kind == 'c':
+                    node[f'c{j}'] = {'oid': repo.commit_sha, 'tree': {'oid': repo.tree_sha()}}
+                elif repo.list_directory(path) is not None:
+                    node[f'p{j}'] = {'oid': repo.tree_sha(path)}
+                else:
+                    node[f'p{j}'] = None
+            data[f'r{i}'] = node
+
+        response = {'data': data}
+        if errors:
+            response['errors'] = errors
+        return response
+
+    def _find_repo(self, owner: str, name: str, ref: Optional[str] = None) -> Optional[MockRepository]:
+        repo = self.mock.repos.get(f'{owner}/{name}')
+        if repo is None or (ref is not None and not repo.resolves(ref)):
+            return None
+        return repo
+
+    def _api(self, method: str, *args):
+        result = getattr(self, method)(*args)
+        if result is None:
+            self._send(404, b'{"message": "Not Found"}', 'application/json', 'api')
+            return
+
+        kind, body, content_type = result
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        counted = kind != 'rate_limit'
+
+        if self.headers.get('If-None-Match') == etag:
+            # Conditional hits do not count against the budget
+            self._send(304, b'', None, 'not_modified', {'ETag': etag}, rate_headers=True)
+            return
+
+        if counted:
+            self.mock.consume_api_request()
+        self._send(200, body, content_type, kind, {'ETag': etag}, rate_headers=True)
+
+    def _rate_limit(self):
+        rate = {
+            'limit': self.mock.rate_limit,
+            'remaining': self.mock.remaining,
+            'reset': self.mock.reset_time,
+            'used': self.mock.rate_limit - self.mock.remaining
+        }
+        return 'rate_limit', json.dumps({'resources': {'core': rate}, 'rate': rate}).encode(), 'application/json'
+
+    def _repo(self, owner, name):
+        repo = self._find_repo(owner, name)
+        if repo is None:
+            return None
+        body = {'full_name': f'{owner}/{name}', 'default_branch': repo.branch}
+        return 'repo', json.dumps(body).encode(), 'application/json'
+
+    def _commit(self, owner, name, ref):
+        repo = self._find_repo(owner, name, ref)
+        if repo is None:
+            return None
+        if 'sha' in self.headers.get('Accept', ''):
+            return 'commit', repo.commit_sha.encode(), 'application/vnd.github.sha'
+        body = {'sha': repo.commit_sha, 'commit': {'tree': {'sha': repo.tree_sha()}}}
+        return 'commit', json.dumps(body).encode(), 'application/json'
+
+    def _tree(self, owner, name, ref):
+        repo = self._find_repo(owner, name, ref)
+        if repo is None:
+            return None
+        tree = [
+            {
+                'path': path,
+                'mode': '100644',
+                'type': 'blob',
+                'sha': repo.blob_sha(content),
+                'size': len(content)
+            }
+            for path, content in sorted(repo.files.items())
+        ]
+        body = {'sha': repo.tree_sha(), 'tree': tree, 'truncated': False}
+        return 'tree', json.dumps(body).encode(), 'application/json'
+
+    def _contents(self, owner, name, path):
+        ref = self.query.get('ref')
+        repo = self._find_repo(owner, name, ref)
+        if repo is None:
+            return None
+
+        entries = repo.list_directory(path)
+        if entries is None:
+            return None
+
+        base = self.mock.url
+        for entry in entries:
+            entry_path = f'{path.strip("/")}/{entry["name"]}'.lstrip('/')
+            entry['path'] = entry_path
+            entry['download_url'] = (
+                f'{base}/raw/{owner}/{name}/{ref or repo.branch}/{entry_path}'
+                if entry['type'] == 'file' else None
+            )
+        return 'contents', json.dumps(entries).encode(), 'application/json'
+
+    def _raw(self, owner, name, ref, path):
+        repo = self._find_repo(owner, name, ref)
+        if repo is None or path not in repo.files:
+            self._send(404, b'404: Not Found', 'text/plain', 'not_found')
+        elif self.mock.should_fail():
+            self._send(502, b'Bad Gateway', 'text/plain', 'error')
+        else:
+            self._send(200, repo.files[path], 'text/plain', 'raw')
+
+    def _tarball(self, owner, name, ref):
+        repo = self._find_repo(owner, name, ref)
+        if repo is None:
+            self._send(404, b'404: Not Found', 'text/plain', 'not_found')
+        elif self.mock.should_fail():
+            self._send(502, b'Bad Gateway', 'text/plain', 'error')
+        else:
+            body = repo.tarball()
+            match = re.match(r'^bytes=(\d+)-$', self.headers.get('Range', ''))
+            if match is None:
+                self._send(200, body, 'application/x-gzip', 'tarball', {'Accept-Ranges': 'bytes'})
+            elif int(match.group(1)) >= len(body):
+                self._send(416, b'', None, 'tarball', {'Content-Range': f'bytes */{len(body)}'})
+            else:
+                start = int(match.group(1))
+                self._send(206, body[start:], 'application/x-gzip', 'tarball', {
+                    'Accept-Ranges': 'bytes',
+                    'Content-Range': f'bytes {start}-{len(body) - 1}/{len(body)}'
+                })
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: Optional[str],
+        kind: str,
+        headers: Optional[Dict[str, str]] = None,
+        rate_headers: bool = False,
+        resource: str = 'core'
+    ):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if rate_headers:
+            self.send_header('X-RateLimit-Limit', str(self.mock.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(self.mock.remaining))
+            self.send_header('X-RateLimit-Reset', str(self.mock.reset_time))
+            self.send_header('X-RateLimit-Resource', resource)
+        self.end_headers()
+        self.wfile.write(body)
+        self.mock.count(kind, len(body))
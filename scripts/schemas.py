@@ -0,0 +1,187 @@
+"""
+Schemas module with the JSON schemas used by the scripts and cached validators for them.
+
+Validators are built (and the schema itself checked) once per process.
+If fastjsonschema is installed, valid documents are accepted by its
+generated code; jsonschema is only consulted to list the errors of an
+invalid document.
+"""
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from jsonschema.validators import validator_for
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+# Schema of a single plugin entry in marketplace.json
+PLUGIN_SCHEMA = {
+    "type": "object",
+    "required": ["name", "description", "source", "category"],
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        "source": {"type": "string"},
+        "category": {"type": "string"}
+    }
+}
+
+# Marketplace schema
+MARKETPLACE_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["name", "version", "description", "owner", "plugins"],
+    "properties": {
+        "name": {"type": "string"},
+        "version": {"type": "string"},
+        "description": {"type": "string"},
+        "owner": {
+            "type": "object",
+            "required": ["name", "email"],
+            "properties": {
+                "name": {"type": "string"},
+                "email": {"type": "string"}
+            }
+        },
+        "plugins": {
+            "type": "array",
+            "items": PLUGIN_SCHEMA
+        }
+    }
+}
+
+# Schema of a single skill in external_skills_config.json
+SKILL_CONFIG_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["id", "github_url", "repo_type", "target_folder", "extraction_config"],
+    "properties": {
+        "id": {"type": "string", "pattern": "^[A-Za-z0-9][A-Za-z0-9._-]*$"},
+        "name": {"type": "string"},
+        "github_url": {"type": "string", "pattern": "^https?://[^/]+/[^/]+/[^/]+"},
+        "repo_type": {"enum": ["standalone", "multi_skill"]},
+        "target_folder": {"type": "string", "minLength": 1},
+        "category": {"type": "string"},
+        "description": {"type": "string"},
+        "author": {"type": "string"},
+        "extraction_config": {
+            "type": "object",
+            "properties": {
+                "type": {"type": "string"},
+                "subfolder_path": {"type": "string"},
+                "exclude_patterns": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+# Schema of external_skills_config.json; skills are checked one by one
+# against SKILL_CONFIG_SCHEMA so a bad entry does not reject the others
+SKILLS_CONFIG_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["skills"],
+    "properties": {
+        "version": {"type": "string"},
+        "github_token_env": {"type": "string"},
+        "output_directory": {"type": "string"},
+        "skills": {
+            "type": "array",
+            "items": {"type": "object"}
+        }
+    }
+}
+
+SCHEMAS = {
+    'plugin': PLUGIN_SCHEMA,
+    'marketplace': MARKETPLACE_SCHEMA,
+    'skill_config': SKILL_CONFIG_SCHEMA,
+    'skills_config': SKILLS_CONFIG_SCHEMA
+}
+
+
+def json_pointer(path) -> str:
+    """
+    Format a jsonschema error path as a JSON pointer (RFC 6901).
+
+    Examples:
+        deque(['plugins', 3, 'name']) → "/plugins/3/name"
+
+    Args:
+        path: Sequence of keys and indices
+
+    Returns:
+        JSON pointer string ("" for the document root)
+    """
+    return ''.join(
+        '/' + str(part).replace('~', '~0').replace('/', '~1')
+        for part in path
+    )
+
+
+@lru_cache(maxsize=None)
+def get_validator(name: str):
+    """
+    Get the jsonschema validator for a named schema, built once.
+
+    Args:
+        name: Key in SCHEMAS
+
+    Returns:
+        jsonschema validator instance
+    """
+    schema = SCHEMAS[name]
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+@lru_cache(maxsize=None)
+def get_fast_validator(name: str) -> Optional[Callable]:
+    """
+    Get fastjsonschema's generated validator for a named schema.
+
+    Args:
+        name: Key in SCHEMAS
+
+    Returns:
+        Validation function, or None if fastjsonschema is not installed
+    """
+    if fastjsonschema is None:
+        return None
+    return fastjsonschema.compile(SCHEMAS[name])
+
+
+def schema_errors(name: str, instance) -> List[str]:
+    """
+    Validate a document and describe every error in it.
+
+    Args:
+        name: Key in SCHEMAS
+        instance: Document to validate
+
+    Returns:
+        List of "<JSON pointer>: <message>" strings, empty if valid
+    """
+    fast = get_fast_validator(name)
+    if fast is not None:
+        try:
+            fast(instance)
+            return []
+        except fastjsonschema.JsonSchemaException:
+            pass
+
+    errors = sorted(
+        get_validator(name).iter_errors(instance),
+        key=lambda e: list(map(str, e.absolute_path))
+    )
+    return [
+        f"{json_pointer(error.absolute_path) or '(root)'}: {error.message}"
+        for error in errors
+    ]
@@ -0,0 +1,141 @@
+"""
+Skill lockfile module for recording which upstream revision each skill was fetched at.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+
+LOCKFILE_VERSION = 1
+
+# Skill config fields that change what gets extracted
+EXTRACTION_FIELDS = ('github_url', 'repo_type', 'extraction_config')
+
+
+def extraction_digest(skill_config: Dict) -> str:
+    """
+    Digest of the config fields that affect a skill's extracted files.
+
+    Args:
+        skill_config: Skill configuration dict
+
+    Returns:
+        SHA-256 hex digest
+    """
+    fields = {key: skill_config.get(key) for key in EXTRACTION_FIELDS}
+    encoded = json.dumps(fields, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def lockfile_path_for(config_path: str) -> str:
+    """
+    Get the lockfile path that belongs to a config file.
+
+    Examples:
+        "config/external_skills_config.json"
+        → "config/external_skills_config.lock.json"
+
+    Args:
+        config_path: Path to external_skills_config.json
+
+    Returns:
+        Path to the lockfile next to the config
+    """
+    path = Path(config_path)
+    return str(path.with_name(f'{path.stem}.lock.json'))
+
+
+class SkillLockfile:
+    """Upstream commit and tree SHA of each fetched skill, and the config it was extracted with."""
+
+    def __init__(self, path: str):
+        """
+        Initialize lockfile, loading it if it exists.
+
+        Args:
+            path: Path to the lockfile
+        """
+        self.path = Path(path)
+        self.skills: Dict[str, Dict] = {}
+        self.dirty = False
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.skills = json.load(f).get('skills', {})
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable lockfile {self.path}: {e}")
+
+    def get(self, skill_id: str) -> Optional[Dict]:
+        """Get the locked entry for a skill, if any."""
+        return self.skills.get(skill_id)
+
+    def is_current(self, skill_config: Dict, revision: Dict[str, str]) -> bool:
+        """
+        Check whether a skill is locked at the given upstream tree and config.
+
+        Args:
+            skill_config: Skill configuration dict
+            revision: Dict with the current upstream 'tree' SHA
+
+        Returns:
+            True if the locked tree SHA and extraction config digest match;
+            entries recorded without a digest never match
+        """
+        entry = self.skills.get(skill_config['id'])
+        return (
+            bool(entry)
+            and entry.get('tree') == revision.get('tree')
+            and entry.get('config_digest') == extraction_digest(skill_config)
+        )
+
+    def record(self, skill_config: Dict, revision: Dict[str, str]):
+        """
+        Record that a skill was fetched at a revision.
+
+        Args:
+            skill_config: Skill configuration dict
+            revision: Dict with 'commit' and 'tree' SHAs
+        """
+        self.skills[skill_config['id']] = {
+            'github_url': skill_config['github_url'],
+            'commit': revision['commit'],
+            'tree': revision['tree'],
+            'config_digest': extraction_digest(skill_config),
+            'fetched_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        }
+        self.dirty = True
+
+    def save(self) -> bool:
+        """
+        Write the lockfile atomically if anything changed.
+
+        Returns:
+            True if successful (or nothing to write), False otherwise
+        """
+        if not self.dirty:
+            return True
+
+        data = {
+            'version': LOCKFILE_VERSION,
+            'skills': dict(sorted(self.skills.items()))
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.lock_')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+            logging.info(f"Saved lockfile: {self.path}")
+            return True
+        except Exception as e:
+            Path(tmp_path).unlink(missing_ok=True)
+            logging.error(f"Failed to save lockfile {self.path}: {e}")
+            return False
@@ -1,13 +1,27 @@
 """
 Skill processor module for validating and normalizing skills.
 """
+import argparse
+import json
 import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, List
-import frontmatter
+from typing import Optional, Dict, Iterator, List, Tuple
 
+from frontmatter_reader import load_frontmatter
+from metadata_index import MetadataIndex, default_index_path
 
-def validate_skill(skill_path: str) -> Dict[str, any]:
+
+# Directories never searched for skills
+IGNORED_DIRS = {'node_modules', '__pycache__', 'venv', 'logs', 'scripts', 'config'}
+
+# Below this many skills a process pool costs more than it saves
+MIN_PARALLEL_SKILLS = 16
+
+
+def validate_skill(skill_path: str, index: Optional[MetadataIndex] = None) -> Dict[str, any]:
     """
     Validate a skill directory.
 
@@ -18,6 +32,7 @@ def validate_skill(skill_path: str) -> Dict[str, any]:
 
     Args:
         skill_path: Path to skill directory
+        index: Metadata index to reuse unchanged frontmatter from (optional)
 
     Returns:
         Dict with validation results:
@@ -52,9 +67,12 @@ def validate_skill(skill_path: str) -> Dict[str, any]:
         result['errors'].append(f"SKILL.md not found in {skill_path}")
         return result
 
-    # Parse frontmatter
+    # Parse frontmatter; a parse error fails validation and is not indexed
     try:
-        metadata = parse_skill_frontmatter(str(skill_md))
+        if index is not None:
+            metadata = index.get(str(skill_md), load_frontmatter)
+        else:
+            metadata = load_frontmatter(str(skill_md))
         result['metadata'] = metadata
 
         # Check required fields
@@ -92,9 +110,7 @@ def parse_skill_frontmatter(skill_md_path: str) -> Dict:
         Dict with frontmatter metadata
     """
     try:
-        with open(skill_md_path, 'r', encoding='utf-8') as f:
-            post = frontmatter.load(f)
-            return dict(post.metadata)
+        return load_frontmatter(skill_md_path)
     except Exception as e:
         logging.error(f"Failed to parse frontmatter from {skill_md_path}: {e}")
         return {}
@@ -122,16 +138,21 @@ def check_name_conflicts(
     return None
 
 
-def get_existing_skills(base_dir: str) -> List[str]:
+def get_existing_skills(base_dir: str, recursive: bool = False) -> List[str]:
     """
     Get list of existing skill directory names.
 
     Args:
         base_dir: Base directory containing skills
+        recursive: Search all subdirectories (e.g. category folders) and
+            return paths relative to base_dir
 
     Returns:
         List of skill folder names
     """
+    if recursive:
+        return discover_skills(base_dir)
+
     base_path = Path(base_dir)
     if not base_path.exists():
         return []
@@ -146,6 +167,40 @@ def get_existing_skills(base_dir: str) -> List[str]:
     return skills
 
 
+def discover_skills(base_dir: str) -> List[str]:
+    """
+    Find every skill directory below base_dir.
+
+    Hidden directories and tooling directories (see IGNORED_DIRS) are not
+    searched.
+
+    Examples:
+        "development/skill-creator"
+        "document-skills/pdf"
+
+    Args:
+        base_dir: Root of the skills vault
+
+    Returns:
+        Sorted POSIX-style paths of skill directories, relative to base_dir
+    """
+    base_path = Path(base_dir)
+    if not base_path.is_dir():
+        return []
+
+    skills = []
+    for root, dirs, files in os.walk(base_path):
+        dirs[:] = [
+            d for d in dirs
+            if not d.startswith('.') and d not in IGNORED_DIRS
+        ]
+
+        if 'SKILL.md' in files and Path(root) != base_path:
+            skills.append(Path(root).relative_to(base_path).as_posix())
+
+    return sorted(skills)
+
+
 def normalize_skill_metadata(
     skill_config: Dict,
     parsed_metadata: Optional[Dict] = None
@@ -183,28 +238,87 @@ def normalize_skill_metadata(
 
 def validate_all_skills(
     skills_dir: str,
-    skill_names: Optional[List[str]] = None
+    skill_names: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    index: Optional[MetadataIndex] = None
 ) -> Dict[str, Dict]:
     """
     Validate multiple skills.
 
     Args:
         skills_dir: Base directory containing skills
-        skill_names: List of specific skill names to validate (None = all)
+        skill_names: List of specific skill names to validate (None = all
+            skills found recursively)
+        workers: Number of validation processes (None = CPU count)
+        index: Metadata index to reuse unchanged frontmatter from (optional)
 
     Returns:
-        Dict mapping skill names to validation results
+        Dict mapping skill names to validation results, in name order
     """
-    results = {}
-
     if skill_names is None:
-        skill_names = get_existing_skills(skills_dir)
+        skill_names = discover_skills(skills_dir)
 
-    for skill_name in skill_names:
-        skill_path = Path(skills_dir) / skill_name
-        results[skill_name] = validate_skill(str(skill_path))
+    results = dict(iter_validation_results(skills_dir, skill_names, workers, index))
+    return {name: results[name] for name in skill_names}
 
-    return results
+
+def iter_validation_results(
+    skills_dir: str,
+    skill_names: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    index: Optional[MetadataIndex] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Validate skills on a process pool, yielding results as they complete.
+
+    Small batches are validated in-process, where starting a pool would
+    cost more than it saves. With an index, skills whose SKILL.md is
+    unchanged are validated in-process from the index and only the rest
+    are sent to the pool; their metadata is indexed as results arrive.
+
+    Args:
+        skills_dir: Base directory containing skills
+        skill_names: List of specific skill names to validate (None = all
+            skills found recursively)
+        workers: Number of validation processes (None = CPU count)
+        index: Metadata index to reuse unchanged frontmatter from (optional)
+
+    Yields:
+        Tuples of (skill name, validation result) in completion order
+    """
+    if skill_names is None:
+        skill_names = discover_skills(skills_dir)
+
+    workers = workers or os.cpu_count() or 1
+    paths = {name: str(Path(skills_dir) / name) for name in skill_names}
+
+    changed = skill_names
+    if index is not None:
+        changed = []
+        for name in skill_names:
+            if index.lookup(str(Path(paths[name]) / 'SKILL.md')) is None:
+                changed.append(name)
+            else:
+                yield name, validate_skill(paths[name], index)
+
+    if workers <= 1 or len(changed) < MIN_PARALLEL_SKILLS:
+        for name in changed:
+            yield name, validate_skill(paths[name], index)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(validate_skill, paths[name]): name
+            for name in changed
+        }
+        for future in as_completed(futures):
+            name, result = futures[future], future.result()
+            if index is not None and result['metadata'] is not None:
+                # Yield what a later run would read back from the index
+                result['metadata'] = index.store(
+                    str(Path(paths[name]) / 'SKILL.md'), result['metadata']
+                )
+            yield name, result
 
 
 def generate_validation_report(validation_results: Dict[str, Dict]) -> str:
@@ -276,3 +390,91 @@ def generate_validation_report(validation_results: Dict[str, Dict]) -> str:
     lines.append("=" * 70)
 
     return '\n'.join(lines)
+
+
+def generate_validation_report_json(validation_results: Dict[str, Dict]) -> str:
+    """
+    Generate machine-readable validation report.
+
+    Args:
+        validation_results: Dict of validation results from validate_all_skills
+
+    Returns:
+        JSON string with a summary and the per-skill results
+    """
+    total = len(validation_results)
+    valid = sum(1 for r in validation_results.values() if r['valid'])
+
+    report = {
+        'summary': {
+            'total': total,
+            'valid': valid,
+            'invalid': total - valid,
+            'with_warnings': sum(
+                1 for r in validation_results.values()
+                if r['valid'] and r['warnings']
+            )
+        },
+        'skills': validation_results
+    }
+
+    # Frontmatter may contain YAML dates and other non-JSON scalars
+    return json.dumps(report, indent=2, ensure_ascii=False, default=str)
+
+
+def main():
+    """Validate every skill in the vault."""
+    parser = argparse.ArgumentParser(
+        description='Validate all skills in the vault'
+    )
+    parser.add_argument(
+        'base_dir',
+        nargs='?',
+        default='.',
+        help='Root of the skills vault (default: current directory)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='Number of validation processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--json',
+        metavar='PATH',
+        help='Also write a JSON report to PATH'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Re-parse every SKILL.md instead of using the metadata index'
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    skill_names = discover_skills(args.base_dir)
+    index = None if args.no_index else MetadataIndex(default_index_path(args.base_dir))
+    results = {}
+
+    for name, result in iter_validation_results(args.base_dir, skill_names, args.workers, index):
+        results[name] = result
+        print(f"{'✓' if result['valid'] else '✗'} {name}", flush=True)
+
+    if index is not None:
+        index.save()
+
+    results = {name: results[name] for name in skill_names}
+    print('\n' + generate_validation_report(results))
+
+    if args.json:
+        Path(args.json).write_text(
+            generate_validation_report_json(results) + '\n', encoding='utf-8'
+        )
+        print(f"JSON report written to {args.json}")
+
+    sys.exit(0 if all(r['valid'] for r in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
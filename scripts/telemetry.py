@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Record structured timings of fetch runs and summarize them across runs.
+
+A fetch run appends JSON lines to logs/fetch_telemetry.jsonl under the
+output directory:
+
+    {"type": "span", "run": ..., "skill": ..., "stage": "download", "ms": ...}
+    {"type": "skill", "run": ..., "skill": ..., "status": ..., "bytes": ...,
+     "requests": ..., "connections": ..., "connect_ms": ..., ...}
+    {"type": "run", "run": ..., "ms": ..., "settings": {...}, "stats": {...}}
+
+Stages are download (which contains extract, for tarballs), validate
+and publish. connect_ms is the setup time of the new connections a
+skill opened (DNS lookup, TCP connect and TLS handshake together), so
+connections and connect_ms show how well connections are reused. Run
+this module to print p50/p95 per stage.
+
+Usage:
+    python telemetry.py [path] [options]
+
+Options:
+    --runs N    Only summarize the last N runs (default: all)
+    --json      Print the summary as JSON
+"""
+import argparse
+import json
+import logging
+import math
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+# Per-skill counters, in report order
+COUNTERS = ('bytes', 'requests', 'not_modified', 'connections', 'connect_ms', 'cache_hits')
+
+
+def default_telemetry_path(base_dir: str) -> str:
+    """
+    Get the standard telemetry location for a skills vault.
+
+    Args:
+        base_dir: Root of the skills vault
+
+    Returns:
+        Path to logs/fetch_telemetry.jsonl under base_dir
+    """
+    return str(Path(base_dir) / 'logs' / 'fetch_telemetry.jsonl')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Sample (need not be sorted)
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        Value at the percentile, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * fraction))
+    return ordered[rank - 1]
+
+
+class Telemetry:
+    """
+    Append timing spans and per-skill counters of one run to a JSON-lines file.
+
+    A skill's stages run on different threads, so counters are kept per
+    skill and attributed through the span open on the current thread.
+    Counting outside a span does nothing. Safe to share between threads.
+    """
+
+    def __init__(self, path: str, run_id: Optional[str] = None):
+        """
+        Initialize telemetry. The file is opened on the first record.
+
+        Args:
+            path: JSON-lines file to append to
+            run_id: Identifier of the run (default: a new random one)
+        """
+        self.path = Path(path)
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.counters: Dict[str, Dict[str, float]] = {}
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = None
+        self._disabled = False
+
+    def _write(self, record: Dict):
+        line = json.dumps(dict(record, run=self.run_id), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None and not self._disabled:
+                try:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                except OSError as e:
+                    logging.warning(f"Telemetry disabled, cannot open {self.path}: {e}")
+                    self._disabled = True
+            if self._file is None:
+                return
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    @contextmanager
+    def span(self, skill_id: str, stage: str) -> Iterator[None]:
+        """
+        Time a stage of a skill and attribute counts on this thread to it.
+
+        Args:
+            skill_id: Skill ID
+            stage: Stage name
+        """
+        previous = getattr(self._local, 'skill', None)
+        self._local.skill = skill_id
+        start = time.time()
+        perf_start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            self._local.skill = previous
+            self._write({
+                'type': 'span',
+                'skill': skill_id,
+                'stage': stage,
+                'start': round(start, 3),
+                'ms': round((time.perf_counter() - perf_start) * 1000, 2),
+                'status': status
+            })
+
+    def current(self) -> Optional[str]:
+        """Skill of the span open on this thread, if any."""
+        return getattr(self._local, 'skill', None)
+
+    def count(self, skill_id: Optional[str] = None, **amounts: float):
+        """
+        Add to a skill's counters.
+
+        Args:
+            skill_id: Skill to count for (default: the current span's)
+            **amounts: Counter increments, e.g. requests=1, bytes=512
+        """
+        skill_id = skill_id or self.current()
+        if skill_id is None:
+            return
+        with self._lock:
+            counters = self.counters.setdefault(skill_id, {})
+            for key, amount in amounts.items():
+                counters[key] = counters.get(key, 0) + amount
+
+    def finish_skill(self, skill_id: str, status: Optional[str]):
+        """
+        Write a skill's counters.
+
+        Args:
+            skill_id: Skill ID
+            status: Outcome ('successful', 'failed', 'skipped' or None)
+        """
+        with self._lock:
+            counters = self.counters.pop(skill_id, {})
+        record = {'type': 'skill', 'skill': skill_id, 'status': status}
+        for key in COUNTERS:
+            value = counters.get(key, 0)
+            record[key] = round(value, 2) if isinstance(value, float) else value
+        self._write(record)
+
+    def finish_run(self, settings: Dict, stats: Dict):
+        """
+        Write the run record and close the file.
+
+        Args:
+            settings: Concurrency settings of the run
+            stats: Final run stats
+        """
+        self._write({
+            'type': 'run',
+            'start': round(self.started, 3),
+            'ms': round((time.time() - self.started) * 1000, 2),
+            'settings': settings,
+            'stats': stats
+        })
+        self.close()
+
+    def close(self):
+        """Close the file; later records are dropped."""
+        with self._lock:
+            self._disabled = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_records(path: str, runs: Optional[int] = None) -> List[Dict]:
+    """
+    Read telemetry records, skipping malformed lines.
+
+    Args:
+        path: JSON-lines telemetry file
+        runs: Only keep records of the last this many runs (None = all)
+
+    Returns:
+        List of records in file order
+    """
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+
+    if runs is not None:
+        order = list(dict.fromkeys(r.get('run') for r in records))
+        keep = set(order[-runs:]) if runs > 0 else set()
+        records = [r for r in records if r.get('run') in keep]
+    return records
+
+
+def summarize(records: List[Dict]) -> Dict:
+    """
+    Aggregate records into per-stage and per-skill percentiles.
+
+    Args:
+        records: Telemetry records
+
+    Returns:
+        Dict with 'runs' (run records), 'stages' (count, p50, p95 and max
+        ms per stage) and 'skills' (p50, p95 and total of each counter)
+    """
+    stage_ms: Dict[str, List[float]] = {}
+    counters: Dict[str, List[float]] = {key: [] for key in COUNTERS}
+    runs = []
+
+    for record in records:
+        kind = record.get('type')
+        if kind == 'span':
+            stage_ms.setdefault(record['stage'], []).append(record['ms'])
+        elif kind == 'skill':
+            for key in COUNTERS:
+                counters[key].append(record.get(key, 0))
+        elif kind == 'run':
+            runs.append(record)
+
+    stages = {
+        stage: {
+            'count': len(values),
+            'p50_ms': percentile(values, 0.5),
+            'p95_ms': percentile(values, 0.95),
+            'max_ms': max(values)
+        }
+        for stage, values in stage_ms.items()
+    }
+    skills = {
+        key: {
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'total': round(sum(values), 2)
+        }
+        for key, values in counters.items() if values
+    }
+    return {'runs': runs, 'stages': stages, 'skills': skills}
+
+
+def format_summary(summary: Dict) -> str:
+    """Format a summarize() result as a text report."""
+    lines = [f"Runs: {len(summary['runs'])}"]
+    for run in summary['runs']:
+        settings = ', '.join(f"{k}={v}" for k, v in run.get('settings', {}).items())
+        stats = run.get('stats', {})
+        lines.append(
+            f"  {run['run']}  {run['ms'] / 1000:7.2f}s  "
+            f"{stats.get('successful', 0)} ok, {stats.get('failed', 0)} failed  ({settings})"
+        )
+
+    lines.append("")
+    lines.append(f"{'Stage':<12}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}")
+    for stage, row in summary['stages'].items():
+        lines.append(
+            f"{stage:<12}{row['count']:>7}{row['p50_ms']:>11.1f}"
+            f"{row['p95_ms']:>11.1f}{row['max_ms']:>11.1f}"
+        )
+
+    if summary['skills']:
+        lines.append("")
+        lines.append(f"{'Per skill':<14}{'p50':>12}{'p95':>12}{'total':>14}")
+        for key, row in summary['skills'].items():
+            lines.append(f"{key:<14}{row['p50']:>12g}{row['p95']:>12g}{row['total']:>14g}")
+
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Summarize fetch run telemetry')
+    parser.add_argument(
+        'path',
+        nargs='?',
+        default=default_telemetry_path('.'),
+        help='Telemetry file (default: logs/fetch_telemetry.jsonl)'
+    )
+    parser.add_argument('--runs', type=int, help='Only summarize the last N runs')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    try:
+        records = load_records(args.path, args.runs)
+    except OSError as e:
+        logging.error(f"Failed to read telemetry from {args.path}: {e}")
+        sys.exit(1)
+
+    summary = summarize(records)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
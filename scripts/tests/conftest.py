@@ -0,0 +1,47 @@
+"""
+Shared setup for the scripts tests.
+
+Puts scripts/ on the import path and provides a local HTTP server.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture
+def http_server():
+    """
+    Start local HTTP servers for the test, shut down when it ends.
+
+    Yields a function taking a BaseHTTPRequestHandler subclass that returns
+    the running server. The server's base URL is in its 'url' attribute,
+    and handlers can record requests in its 'requests' list.
+    """
+    servers = []
+
+    def start(handler):
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        httpd.daemon_threads = True
+        httpd.requests = []
+        httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+        return httpd
+
+    yield start
+
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
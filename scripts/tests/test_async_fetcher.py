@@ -0,0 +1,74 @@
+"""
+Tests for AsyncDownloader.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import asyncio
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import async_fetcher
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Fail /fail at once; trickle the body of any other path."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/fail':
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Length', '1000')
+        self.end_headers()
+        try:
+            for _ in range(100):
+                self.wfile.write(b'x' * 10)
+                self.wfile.flush()
+                time.sleep(0.02)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def base_url(http_server):
+    return http_server(_Handler).url
+
+
+class _SlowUnwindDownloader(async_fetcher.AsyncDownloader):
+    """Downloader whose cancelled downloads take a while to clean up."""
+
+    finished = 0
+
+    async def _download_one(self, url, path, on_connect=None):
+        try:
+            await super()._download_one(url, path, on_connect)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.2)
+            type(self).finished += 1
+            raise
+
+
+def test_failure_waits_for_cancelled_downloads(base_url, tmp_path):
+    pytest.importorskip('httpx')
+    downloader = _SlowUnwindDownloader()
+    items = [(f'{base_url}/slow/{i}', tmp_path / f'slow-{i}') for i in range(3)]
+    items.append((f'{base_url}/fail', tmp_path / 'fail'))
+
+    try:
+        with pytest.raises(Exception) as raised:
+            downloader.download(items)
+        assert '500' in str(raised.value)
+        # Every cancelled download finished before the error reached us
+        assert _SlowUnwindDownloader.finished == 3
+    finally:
+        downloader.close()
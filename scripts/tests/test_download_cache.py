@@ -0,0 +1,50 @@
+"""
+Tests for DownloadCache.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import json
+import shutil
+from pathlib import Path
+
+import download_cache
+from download_cache import DownloadCache
+
+
+def _tree(root: Path, content: bytes) -> str:
+    root.mkdir(parents=True)
+    (root / 'SKILL.md').write_bytes(content)
+    return str(root)
+
+
+def test_get_defers_index_write_to_save(tmp_path):
+    cache = DownloadCache(str(tmp_path / 'cache'))
+    cache.put('a', _tree(tmp_path / 'src', b'skill'))
+    written = json.loads(cache.index_path.read_text())['a']['last_used']
+
+    assert cache.get('a', str(tmp_path / 'out'))
+    assert (tmp_path / 'out' / 'SKILL.md').read_bytes() == b'skill'
+    assert json.loads(cache.index_path.read_text())['a']['last_used'] == written
+
+    cache.save()
+    assert json.loads(cache.index_path.read_text())['a']['last_used'] > written
+
+
+def test_entry_being_copied_is_not_evicted(tmp_path, monkeypatch):
+    cache = DownloadCache(str(tmp_path / 'cache'), max_bytes=8)
+    cache.put('a', _tree(tmp_path / 'a', b'12345678'))
+    copytree = shutil.copytree
+
+    def copy_while_evicting(source, target, **kwargs):
+        # Another worker caches a tree that pushes the cache over its cap
+        monkeypatch.setattr(download_cache.shutil, 'copytree', copytree)
+        cache.put('b', _tree(tmp_path / 'b', b'abcdefgh'))
+        return copytree(source, target, **kwargs)
+
+    monkeypatch.setattr(download_cache.shutil, 'copytree', copy_while_evicting)
+    assert cache.get('a', str(tmp_path / 'out'))
+
+    assert (tmp_path / 'out' / 'SKILL.md').read_bytes() == b'12345678'
+    assert 'a' in cache.index
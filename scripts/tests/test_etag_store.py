@@ -0,0 +1,41 @@
+"""
+Tests for ETagStore eviction.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import json
+import time
+
+from etag_store import ETagStore
+
+
+def test_save_drops_stale_entries(tmp_path):
+    path = tmp_path / 'etags.json'
+    old = int(time.time()) - 40 * 24 * 3600
+    path.write_text(json.dumps({
+        ' https://api/stale': {'etag': '"a"', 'body': 'x', 'used': old},
+        ' https://api/legacy': {'etag': '"b"', 'body': 'y'},
+        ' https://api/kept': {'etag': '"c"', 'body': 'z', 'used': old}
+    }))
+
+    store = ETagStore(str(path))
+    assert store.lookup('https://api/kept')['etag'] == '"c"'
+    store.store('https://api/new', None, '"d"', 'w')
+    store.save()
+
+    saved = json.loads(path.read_text())
+    assert sorted(saved) == [' https://api/kept', ' https://api/new']
+
+
+def test_save_keeps_most_recently_used(tmp_path):
+    path = tmp_path / 'etags.json'
+    store = ETagStore(str(path), max_entries=2)
+    for i in range(3):
+        store.store(f'https://api/{i}', None, f'"{i}"', 'body')
+        store.entries[store.make_key(f'https://api/{i}')]['used'] -= 10 - i
+    store.lookup('https://api/0')
+    store.save()
+
+    assert sorted(json.loads(path.read_text())) == [' https://api/0', ' https://api/2']
@@ -0,0 +1,236 @@
+"""
+Tests for resumable fetch runs: the journal and partial tarball downloads.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import io
+import os
+import tarfile
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+import fetch_journal
+from fetch_external_skills import SkillFetcher, SkillJob
+from fetch_journal import FetchJournal
+from github_fetcher import GitHubFetcher
+
+ARCHIVE = bytes(range(256)) * 64
+SHA = 'a' * 40
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serve ARCHIVE at any path, honouring 'Range: bytes=N-'."""
+
+    honor_range = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('Range'))
+        body = ARCHIVE
+        requested = self.headers.get('Range')
+        if requested and self.honor_range:
+            start = int(requested[len('bytes='):].rstrip('-'))
+            if start >= len(ARCHIVE):
+                self.send_response(416)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = ARCHIVE[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(ARCHIVE) - 1}/{len(ARCHIVE)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _NoRangeHandler(_RangeHandler):
+    honor_range = False
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    fetcher = GitHubFetcher()
+    yield fetcher
+    fetcher.close()
+
+
+def _download(fetcher, server, archive_dir: Path, name: str) -> Path:
+    return fetcher._download_archive(f'{server.url}/tarball/{name}', archive_dir)
+
+
+def test_partial_download_resumes_with_range(http_server, fetcher, tmp_path):
+    server = http_server(_RangeHandler)
+    (tmp_path / f'{SHA}.tar.gz.part').write_bytes(ARCHIVE[:1000])
+
+    path = _download(fetcher, server, tmp_path, f'{SHA}.tar.gz')
+
+    assert path.read_bytes() == ARCHIVE
+    assert server.requests == ['bytes=1000-']
+    assert sorted(os.listdir(tmp_path)) == [f'{SHA}.tar.gz']
+
+
+def test_complete_part_file_is_kept(http_server, fetcher, tmp_path):
+    server = http_server(_RangeHandler)
+    (tmp_path / f'{SHA}.tar.gz.part').write_bytes(ARCHIVE)
+
+    path = _download(fetcher, server, tmp_path, f'{SHA}.tar.gz')
+
+    assert path.read_bytes() == ARCHIVE
+    assert server.requests == [f'bytes={len(ARCHIVE)}-']
+
+
+def test_ignored_range_downloads_again(http_server, fetcher, tmp_path):
+    server = http_server(_NoRangeHandler)
+    (tmp_path / f'{SHA}.tar.gz.part').write_bytes(b'stale prefix')
+
+    path = _download(fetcher, server, tmp_path, f'{SHA}.tar.gz')
+
+    assert path.read_bytes() == ARCHIVE
+
+
+def test_unpinned_archive_is_not_resumed(http_server, fetcher, tmp_path):
+    server = http_server(_RangeHandler)
+    (tmp_path / 'main.tar.gz.part').write_bytes(ARCHIVE[:1000])
+
+    path = _download(fetcher, server, tmp_path, 'main.tar.gz')
+
+    assert path.read_bytes() == ARCHIVE
+    assert server.requests == [None]
+
+
+def test_journal_survives_reload_until_reset(tmp_path):
+    path = tmp_path / 'fetch_journal.json'
+    journal = FetchJournal(str(path))
+    journal.mark('demo', 'downloading', {'commit': SHA})
+    journal.mark('demo', 'downloaded')
+    journal.mark('other', 'moved')
+    journal.work_dir('demo').mkdir(parents=True)
+
+    reloaded = FetchJournal(str(path))
+    assert reloaded.get('demo')['state'] == 'downloaded'
+    assert reloaded.get('demo')['revision'] == {'commit': SHA}
+    assert reloaded.in_target() == ['other']
+
+    reloaded.reset()
+    assert not path.exists()
+    assert not reloaded.work_root.exists()
+    assert FetchJournal(str(path)).get('demo') is None
+
+
+@pytest.mark.parametrize('skill_id', ['..', '.', '../escape', ''])
+def test_work_dir_stays_inside_work_root(tmp_path, skill_id):
+    journal = FetchJournal(str(tmp_path / '.cache' / 'fetch_journal.json'))
+
+    with pytest.raises(ValueError):
+        journal.work_dir(skill_id)
+
+
+def _tarball(tmp_path) -> bytes:
+    """A gzipped repository tarball that does not compress much."""
+    root = tmp_path / 'src' / f'repo-{SHA}'
+    root.mkdir(parents=True)
+    (root / 'SKILL.md').write_text('---\nname: demo\n---\n')
+    (root / 'data.bin').write_bytes(os.urandom(256 * 1024))
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        tar.add(root, arcname=root.name)
+    return buffer.getvalue()
+
+
+class _InterruptedHandler(BaseHTTPRequestHandler):
+    """Serve the server's tarball, cutting it short once if 'interrupt' is set."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = self.server.tarball
+        requested = self.headers.get('Range')
+        self.server.requests.append(requested)
+
+        if requested:
+            start = int(requested[len('bytes='):].rstrip('-'))
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+            self.send_header('Content-Length', str(len(body) - start))
+            self.end_headers()
+            self.wfile.write(body[start:])
+            self.server.resumed_bytes = len(body) - start
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.server.interrupt:
+            self.server.interrupt = False
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+def _skill_fetcher(fetcher, base_dir: Path, resume: bool) -> SkillFetcher:
+    skill_fetcher = SkillFetcher(str(base_dir / 'config.json'), resume=resume)
+    skill_fetcher.base_dir = str(base_dir)
+    skill_fetcher.journal = FetchJournal(fetch_journal.default_journal_path(str(base_dir)))
+    skill_fetcher.fetcher = fetcher
+    return skill_fetcher
+
+
+def _job(base_dir: Path) -> SkillJob:
+    config = {
+        'id': 'demo',
+        'github_url': 'https://github.com/owner/repo',
+        'repo_type': 'standalone',
+        'target_folder': 'demo',
+        'extraction_config': {}
+    }
+    return SkillJob(1, 1, config, str(base_dir), revision={'commit': SHA, 'tree': 'b' * 40})
+
+
+def test_interrupted_run_resumes_with_range(http_server, fetcher, tmp_path):
+    server = http_server(_InterruptedHandler)
+    server.tarball = _tarball(tmp_path)
+    server.interrupt = True
+    fetcher.web_base = server.url
+    fetcher.default_branches[('owner', 'repo')] = 'main'
+
+    # A plain run streams the tarball and is cut off
+    first = _job(tmp_path)
+    _skill_fetcher(fetcher, tmp_path, resume=False)._download_skill(first)
+    assert first.status == 'failed'
+    part = tmp_path / '.cache' / 'fetch_work' / 'demo' / 'archive' / f'{SHA}.tar.gz.part'
+    offset = part.stat().st_size
+    assert 0 < offset < len(server.tarball)
+
+    # The --resume run asks only for the rest
+    resumed = _job(tmp_path)
+    _skill_fetcher(fetcher, tmp_path, resume=True)._download_skill(resumed)
+    assert resumed.status is None
+    assert server.requests == [None, f'bytes={offset}-']
+    assert server.resumed_bytes == len(server.tarball) - offset
+    assert (Path(resumed.temp_dir) / 'SKILL.md').read_text() == '---\nname: demo\n---\n'
+
+
+def test_streamed_download_keeps_the_archive(http_server, fetcher, tmp_path):
+    server = http_server(_InterruptedHandler)
+    server.tarball = _tarball(tmp_path)
+    server.interrupt = False
+    fetcher.web_base = server.url
+    archive_dir = tmp_path / 'archive'
+
+    assert fetcher.fetch_standalone_repo('owner', 'repo', SHA, str(tmp_path / 'skill'),
+                                         archive_dir=str(archive_dir))
+    assert os.listdir(archive_dir) == [f'{SHA}.tar.gz']
+    assert (archive_dir / f'{SHA}.tar.gz').read_bytes() == server.tarball
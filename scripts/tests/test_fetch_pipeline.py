@@ -0,0 +1,81 @@
+"""
+Tests for the fetch pipeline.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import threading
+import time
+
+import pytest
+
+from fetch_pipeline import Pipeline
+
+
+class _Item:
+    def __init__(self, n):
+        self.n = n
+        self.stages = []
+        self.error = None
+
+
+def _stage(name, fail_on=None):
+    def run(item):
+        if item.n == fail_on:
+            item.error = f'{name} failed'
+        if item.error is None:
+            item.stages.append(name)
+    return run
+
+
+def test_items_pass_through_stages_in_order():
+    pipeline = Pipeline(
+        [('download', _stage('download'), 3), ('validate', _stage('validate'), 2),
+         ('publish', _stage('publish'), 1)],
+        queue_size=2
+    )
+
+    done = list(pipeline.run(_Item(n) for n in range(20)))
+
+    assert sorted(item.n for item in done) == list(range(20))
+    assert all(item.stages == ['download', 'validate', 'publish'] for item in done)
+    assert [t['items'] for t in pipeline.timings().values()] == [20, 20, 20]
+
+
+def test_single_workers_keep_input_order():
+    pipeline = Pipeline([('a', _stage('a'), 1), ('b', _stage('b'), 1)], queue_size=1)
+
+    assert [item.n for item in pipeline.run(_Item(n) for n in range(10))] == list(range(10))
+
+
+def test_item_failures_flow_through_later_stages():
+    pipeline = Pipeline([('download', _stage('download', fail_on=3), 2),
+                         ('publish', _stage('publish'), 1)])
+
+    done = {item.n: item for item in pipeline.run(_Item(n) for n in range(6))}
+
+    assert len(done) == 6
+    assert done[3].error == 'download failed' and done[3].stages == []
+    assert done[4].stages == ['download', 'publish']
+
+
+def test_stage_exception_stops_pipeline_and_is_raised():
+    started = []
+    lock = threading.Lock()
+
+    def explode(item):
+        with lock:
+            started.append(item.n)
+        if item.n == 2:
+            raise RuntimeError('boom')
+        time.sleep(0.01)
+
+    pipeline = Pipeline([('download', explode, 1), ('publish', _stage('publish'), 1)],
+                        queue_size=1)
+
+    with pytest.raises(RuntimeError, match='boom'):
+        list(pipeline.run(_Item(n) for n in range(100)))
+
+    # Nothing was processed after the failure
+    assert started == [0, 1, 2]
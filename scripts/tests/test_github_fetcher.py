@@ -0,0 +1,98 @@
+"""
+Tests for GitHubFetcher's HTTP backends.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from github_fetcher import GitHubFetcher
+from telemetry import Telemetry
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    """Serve a small file and record the headers of every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        body = b'hello'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(http_server):
+    return http_server(_RecordingHandler)
+
+
+def _download(server, tmp_path, token):
+    fetcher = GitHubFetcher(token=token, backend='httpx')
+    try:
+        url = f'{server.url}/raw/file.txt'
+        assert fetcher.downloader.download([(url, tmp_path / 'file.txt')]) == 1
+    finally:
+        fetcher.close()
+    assert (tmp_path / 'file.txt').read_bytes() == b'hello'
+    return server.requests[-1]
+
+
+def test_httpx_backend_sends_token(server, tmp_path, monkeypatch):
+    pytest.importorskip('httpx')
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+
+    headers = _download(server, tmp_path, 'secret')
+
+    assert headers.get('Authorization') == 'token secret'
+    assert headers.get('Accept') == 'application/vnd.github.v3+json'
+
+
+def test_httpx_backend_without_token(server, tmp_path, monkeypatch):
+    pytest.importorskip('httpx')
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+
+    headers = _download(server, tmp_path, None)
+
+    assert 'Authorization' not in headers
+
+
+def _connect_counts(fetcher, telemetry, fetch):
+    with telemetry.span('demo', 'download'):
+        fetch()
+    fetcher.close()
+    return telemetry.counters['demo']
+
+
+def test_requests_backend_times_new_connections(server, tmp_path, monkeypatch):
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    telemetry = Telemetry(str(tmp_path / 'telemetry.jsonl'))
+    fetcher = GitHubFetcher(telemetry=telemetry)
+    url = f'{server.url}/raw/file.txt'
+
+    # The test server closes every connection, so each request opens one
+    counters = _connect_counts(fetcher, telemetry, lambda: [fetcher._send(url) for _ in range(2)])
+
+    assert counters['requests'] == 2
+    assert counters['connections'] == 2
+    assert counters['connect_ms'] > 0
+
+
+def test_httpx_backend_times_new_connections(server, tmp_path, monkeypatch):
+    pytest.importorskip('httpx')
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    telemetry = Telemetry(str(tmp_path / 'telemetry.jsonl'))
+    fetcher = GitHubFetcher(backend='httpx', telemetry=telemetry)
+    items = [(f'{server.url}/raw/{i}.txt', tmp_path / f'{i}.txt') for i in range(3)]
+
+    counters = _connect_counts(fetcher, telemetry, lambda: fetcher._download_async(items))
+
+    assert counters['requests'] == 3
+    assert 1 <= counters['connections'] <= 3
+    assert counters['connect_ms'] > 0
@@ -0,0 +1,165 @@
+"""
+Tests for batched GraphQL metadata lookups.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import logging
+import re
+
+import pytest
+
+from github_graphql import GraphQLResolver
+from mock_github_server import MockGitHubServer, MockRepository
+
+
+class _FakeTransport:
+    """Answer resolver queries for repositories named 'repo<N>' from variables alone."""
+
+    def __init__(self, missing_repos=(), missing_paths=()):
+        self.missing_repos = set(missing_repos)
+        self.missing_paths = set(missing_paths)
+        self.calls = []
+
+    def __call__(self, query, variables):
+        self.calls.append(variables)
+        data = {'rateLimit': {'limit': 5000, 'remaining': 4000, 'resetAt': '2030-01-01T00:00:00Z'}}
+        errors = []
+        for key, owner in variables.items():
+            if not re.fullmatch(r'o\d+', key):
+                continue
+            i = key[1:]
+            name = variables[f'n{i}']
+            if name in self.missing_repos:
+                data[f'r{i}'] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [f'r{i}'],
+                               'message': f'Could not resolve {owner}/{name}'})
+                continue
+
+            node = {'defaultBranchRef': {'name': 'main'}, 'stargazerCount': 7}
+            for field, value in variables.items():
+                match = re.fullmatch(rf'([cp]){i}_(\d+)', field)
+                if not match:
+                    continue
+                kind, j = match.groups()
+                if kind == 'c':
+                    node[f'c{j}'] = {'oid': f'{name}-commit', 'tree': {'oid': f'{name}-root'}}
+                elif value.partition(':')[2] in self.missing_paths:
+                    node[f'p{j}'] = None
+                else:
+                    node[f'p{j}'] = {'oid': f'{name}-{value.partition(":")[2]}'}
+            data[f'r{i}'] = node
+
+        response = {'data': data}
+        if errors:
+            response['errors'] = errors
+        return response
+
+
+def _repos_per_call(transport):
+    return [sum(1 for key in call if re.fullmatch(r'o\d+', key)) for call in transport.calls]
+
+
+def test_batches_stay_within_the_alias_limit():
+    transport = _FakeTransport()
+    resolver = GraphQLResolver(transport=transport, batch_size=2)
+    targets = [('owner', f'repo{i}', None, None) for i in range(5)]
+    # A second target of the same repository shares its alias
+    targets.append(('owner', 'repo0', 'main', 'skills/pdf'))
+
+    results = resolver.resolve(targets)
+
+    assert _repos_per_call(transport) == [2, 2, 1]
+    assert resolver.requests == 3
+    assert results[('owner', 'repo3', None, None)] == {
+        'default_branch': 'main',
+        'branch': 'main',
+        'commit': 'repo3-commit',
+        'tree': 'repo3-root',
+        'stars': 7
+    }
+    assert results[('owner', 'repo0', 'main', 'skills/pdf')]['tree'] == 'repo0-skills/pdf'
+    assert resolver.rate_limit.limit == 5000
+
+
+def test_missing_repository_and_path_resolve_to_none(caplog):
+    transport = _FakeTransport(missing_repos={'gone'}, missing_paths={'skills/missing'})
+    resolver = GraphQLResolver(transport=transport)
+    kept = ('owner', 'repo1', None, 'skills/pdf')
+    no_path = ('owner', 'repo1', None, 'skills/missing')
+    no_repo = ('owner', 'gone', None, None)
+
+    with caplog.at_level(logging.WARNING):
+        results = resolver.resolve([kept, no_path, no_repo])
+
+    assert results[kept]['tree'] == 'repo1-skills/pdf'
+    assert results[no_path] is None
+    assert results[no_repo] is None
+    assert 'Could not resolve owner/gone' in caplog.text
+    assert 'Path skills/missing not found' in caplog.text
+
+
+def test_errors_without_data_leave_targets_unresolved(caplog):
+    def transport(query, variables):
+        return {'data': None, 'errors': [{'message': 'Bad credentials'}]}
+
+    resolver = GraphQLResolver(transport=transport)
+    targets = [('owner', 'repo1', None, None), ('owner', 'repo2', 'dev', 'a')]
+
+    with caplog.at_level(logging.WARNING):
+        results = resolver.resolve(targets)
+
+    assert results == {target: None for target in targets}
+    assert 'GraphQL: Bad credentials' in caplog.text
+
+
+def test_transport_failure_leaves_targets_unresolved():
+    def transport(query, variables):
+        raise ConnectionError('down')
+
+    resolver = GraphQLResolver(transport=transport)
+
+    assert resolver.resolve([('owner', 'repo1', None, None)]) == {('owner', 'repo1', None, None): None}
+
+
+@pytest.fixture
+def mock_github(monkeypatch):
+    server = MockGitHubServer(rate_limit=100)
+    server.add_repository(MockRepository('owner', 'vault', {
+        'README.md': b'# vault',
+        'skills/pdf/SKILL.md': b'---\nname: pdf\n---\n'
+    }, branch='trunk', stars=3))
+    with server:
+        for name, value in server.environment().items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.delenv('GITHUB_GRAPHQL_URL', raising=False)
+        yield server
+
+
+def test_resolves_through_mock_server(mock_github):
+    repo = mock_github.repos['owner/vault']
+    resolver = GraphQLResolver(token='test-token', batch_size=1)
+    whole = ('owner', 'vault', None, None)
+    subfolder = ('owner', 'vault', 'trunk', 'skills/pdf')
+    no_path = ('owner', 'vault', None, 'skills/missing')
+    no_repo = ('owner', 'missing', None, None)
+
+    try:
+        results = resolver.resolve([whole, subfolder, no_path, no_repo])
+    finally:
+        resolver.close()
+
+    assert results[whole] == {
+        'default_branch': 'trunk',
+        'branch': 'trunk',
+        'commit': repo.commit_sha,
+        'tree': repo.tree_sha(),
+        'stars': 3
+    }
+    assert results[subfolder]['tree'] == repo.tree_sha('skills/pdf')
+    assert results[no_path] is None
+    assert results[no_repo] is None
+    # One request per repository at batch_size=1
+    assert mock_github.stats()['by_kind']['graphql'] == 2
+    assert resolver.rate_limit.remaining == 98
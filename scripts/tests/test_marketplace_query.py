@@ -0,0 +1,107 @@
+"""
+Tests for the marketplace query index.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import json
+
+from marketplace_query import MarketplaceIndex, export_compact_index, tokenize
+
+
+PLUGINS = [
+    {'name': 'pdf-tools', 'description': 'Fill and merge forms', 'category': 'documents'},
+    {'name': 'form-filler', 'description': 'Fill PDF forms automatically', 'category': 'documents'},
+    {'name': 'pdfkit-notes', 'description': 'Take notes', 'category': 'productivity'},
+    {'name': 'chart-maker', 'description': '数据分析 and charts', 'category': 'data'},
+    {'name': 'table-reader', 'description': '分析表格', 'category': 'data'},
+]
+
+
+def _names(results):
+    return [plugin['name'] for plugin, _ in results]
+
+
+def test_tokenize_splits_words_and_cjk():
+    assert tokenize('PDF-form filler for the web') == ['pdf', 'form', 'filler', 'web']
+    assert tokenize('数据分析') == ['数', '据', '分', '析', '数据', '据分', '分析']
+    assert tokenize('数据分析', for_query=True) == ['数据', '据分', '分析']
+    assert tokenize('表', for_query=True) == ['表']
+    assert tokenize('AI数据') == ['ai', '数', '据', '数据']
+    assert tokenize('使用Python', for_query=True) == ['使用', 'python']
+
+
+def test_name_match_outranks_description_match():
+    index = MarketplaceIndex(PLUGINS)
+
+    assert _names(index.search('pdf', prefix=False)) == ['pdf-tools', 'form-filler']
+
+
+def test_exact_match_outranks_prefix_match():
+    index = MarketplaceIndex(PLUGINS)
+
+    scores = {plugin['name']: score for plugin, score in index.search('pdf')}
+    assert scores['pdf-tools'] > scores['pdfkit-notes']
+    assert 'pdfkit-notes' not in _names(index.search('pdf', prefix=False))
+
+
+def test_every_query_term_must_match():
+    index = MarketplaceIndex(PLUGINS)
+
+    assert _names(index.search('fill forms')) == ['form-filler', 'pdf-tools']
+    assert index.search('fill charts') == []
+
+
+def test_category_filter_and_limit():
+    index = MarketplaceIndex(PLUGINS)
+
+    assert _names(index.search('', category='data')) == ['chart-maker', 'table-reader']
+    assert _names(index.search('pdf', category='productivity')) == ['pdfkit-notes']
+    assert len(index.search('', limit=2)) == 2
+
+
+def test_cjk_query_matches_character_pairs():
+    index = MarketplaceIndex(PLUGINS)
+
+    assert _names(index.search('分析')) == ['chart-maker', 'table-reader']
+    assert _names(index.search('数据分析')) == ['chart-maker']
+    assert _names(index.search('表')) == ['table-reader']
+    # CJK terms never match as prefixes
+    assert index.search('数据分析表') == []
+
+
+def _write_marketplace(tmp_path):
+    path = tmp_path / 'marketplace.json'
+    plugins = [dict(plugin, source=f"./{plugin['category']}/{plugin['name']}") for plugin in PLUGINS]
+    path.write_text(json.dumps({'name': 'test', 'plugins': plugins}, indent=2, ensure_ascii=False),
+                    encoding='utf-8')
+    return path, plugins
+
+
+def test_compact_index_searches_like_the_full_index(tmp_path):
+    marketplace, plugins = _write_marketplace(tmp_path)
+    output = tmp_path / 'index.json'
+
+    assert export_compact_index(str(marketplace), str(output))
+
+    compact = MarketplaceIndex.from_compact(json.loads(output.read_text(encoding='utf-8')))
+    index = MarketplaceIndex(plugins)
+    assert compact.postings == index.postings
+    assert compact.plugins == plugins
+    for query in ('pdf', 'fill forms', '分析', '表', '数据分析', 'notes', ''):
+        assert compact.search(query) == index.search(query)
+
+
+def test_compact_index_shares_posting_lists():
+    index = MarketplaceIndex([
+        {'name': 'alpha', 'description': 'shared words', 'category': 'a'},
+        {'name': 'beta', 'description': 'beta only', 'category': 'b'},
+        {'name': 'gamma', 'description': 'shared words', 'category': 'a'},
+    ])
+
+    postings = dict(index.to_compact()['postings'])
+
+    # Plugin positions 0 and 2 are stored as gaps 0 and 2
+    assert postings['shared words'] == [0, 1, 2, 1]
+    assert postings['beta'] == [1, 4]
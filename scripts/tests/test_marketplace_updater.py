@@ -0,0 +1,70 @@
+"""
+Tests for marketplace.json updates.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import json
+
+import pytest
+
+import marketplace_updater
+from marketplace_updater import update_marketplace_plugins
+
+
+# Unsorted and without a trailing newline, like .claude-plugin/marketplace.json
+MARKETPLACE = {
+    'name': 'test-marketplace',
+    'owner': {'name': 'Tests'},
+    'plugins': [
+        {'name': 'pdf-tools', 'description': 'Fill forms', 'source': './pdf-tools', 'category': 'documents'},
+        {'name': 'chart-maker', 'description': 'Draw charts', 'source': './chart-maker', 'category': 'data'},
+    ]
+}
+
+NEW_PLUGIN = {'name': 'notes', 'description': 'Take notes', 'source': './notes', 'category': 'productivity'}
+
+
+@pytest.fixture
+def marketplace_path(tmp_path):
+    path = tmp_path / 'marketplace.json'
+    path.write_text(json.dumps(MARKETPLACE, indent=2, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def test_unchanged_marketplace_is_not_rewritten(marketplace_path):
+    original = marketplace_path.read_bytes()
+    mtime = marketplace_path.stat().st_mtime_ns
+
+    assert update_marketplace_plugins(str(marketplace_path), [MARKETPLACE['plugins'][0]])
+    assert update_marketplace_plugins(
+        str(marketplace_path), [dict(MARKETPLACE['plugins'][1])], replace_existing=True
+    )
+
+    assert marketplace_path.read_bytes() == original
+    assert marketplace_path.stat().st_mtime_ns == mtime
+    assert not marketplace_path.with_suffix('.json.backup').exists()
+
+
+def test_update_keeps_the_file_format(marketplace_path):
+    assert update_marketplace_plugins(str(marketplace_path), [NEW_PLUGIN])
+
+    text = marketplace_path.read_text(encoding='utf-8')
+    plugins = json.loads(text)['plugins']
+    assert [plugin['name'] for plugin in plugins] == ['chart-maker', 'notes', 'pdf-tools']
+    assert not text.endswith('\n')
+    assert marketplace_path.with_suffix('.json.backup').exists()
+
+
+def test_failed_write_leaves_the_original_intact(marketplace_path, monkeypatch):
+    original = marketplace_path.read_bytes()
+
+    def fail(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(marketplace_updater.os, 'replace', fail)
+
+    assert not update_marketplace_plugins(str(marketplace_path), [NEW_PLUGIN])
+    assert marketplace_path.read_bytes() == original
+    assert not list(marketplace_path.parent.glob('.marketplace_*'))
@@ -0,0 +1,25 @@
+"""
+Tests for the persistent frontmatter metadata index.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import datetime
+
+from metadata_index import MetadataIndex
+
+
+def test_get_returns_same_types_on_hit_and_miss(tmp_path):
+    skill_md = tmp_path / 'SKILL.md'
+    skill_md.write_text('---\nname: demo\n---\n')
+    index = MetadataIndex(str(tmp_path / 'index.json'))
+
+    def parse(path):
+        return {'name': 'demo', 'updated': datetime.date(2024, 1, 2)}
+
+    miss = index.get(str(skill_md), parse)
+    hit = index.get(str(skill_md), parse)
+
+    assert miss == hit == {'name': 'demo', 'updated': '2024-01-02'}
+    assert (index.hits, index.misses) == (1, 1)
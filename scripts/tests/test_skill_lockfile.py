@@ -0,0 +1,51 @@
+"""
+Tests for SkillLockfile.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import copy
+
+from skill_lockfile import SkillLockfile
+
+
+SKILL = {
+    'id': 'demo',
+    'github_url': 'https://github.com/owner/demo',
+    'repo_type': 'standalone',
+    'target_folder': 'demo',
+    'extraction_config': {'exclude_patterns': ['.git']}
+}
+REVISION = {'commit': 'c' * 40, 'tree': 't' * 40}
+
+
+def test_is_current_after_record(tmp_path):
+    lockfile = SkillLockfile(str(tmp_path / 'skills.lock.json'))
+    assert not lockfile.is_current(SKILL, REVISION)
+
+    lockfile.record(SKILL, REVISION)
+    assert lockfile.is_current(SKILL, REVISION)
+    assert not lockfile.is_current(SKILL, dict(REVISION, tree='u' * 40))
+
+
+def test_extraction_config_change_makes_skill_stale(tmp_path):
+    path = tmp_path / 'skills.lock.json'
+    lockfile = SkillLockfile(str(path))
+    lockfile.record(SKILL, REVISION)
+    assert lockfile.save()
+
+    changed = copy.deepcopy(SKILL)
+    changed['extraction_config']['exclude_patterns'].append('tests')
+    reloaded = SkillLockfile(str(path))
+    assert reloaded.is_current(SKILL, REVISION)
+    assert not reloaded.is_current(changed, REVISION)
+
+    # Fields that do not affect extraction leave the skill current
+    assert reloaded.is_current(dict(SKILL, description='New description'), REVISION)
+
+
+def test_entry_without_digest_is_stale(tmp_path):
+    lockfile = SkillLockfile(str(tmp_path / 'skills.lock.json'))
+    lockfile.skills['demo'] = {'github_url': SKILL['github_url'], **REVISION}
+    assert not lockfile.is_current(SKILL, REVISION)
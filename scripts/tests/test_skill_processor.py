@@ -0,0 +1,46 @@
+"""
+Tests for skill validation with the metadata index.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import skill_processor
+from metadata_index import MetadataIndex
+
+SKILL_MD = '---\nname: {name}\ndescription: A skill for tests\nupdated: 2024-01-02\n---\n\nBody text\n'
+
+
+def _make_skills(root, count):
+    for i in range(count):
+        skill = root / f'skill-{i}'
+        skill.mkdir()
+        (skill / 'SKILL.md').write_text(SKILL_MD.format(name=f'skill-{i}'))
+
+
+def test_pool_results_match_index_hits(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_processor, 'MIN_PARALLEL_SKILLS', 1)
+    _make_skills(tmp_path, 3)
+    index = MetadataIndex(str(tmp_path / 'index.json'))
+
+    cold = dict(skill_processor.iter_validation_results(str(tmp_path), workers=2, index=index))
+    warm = dict(skill_processor.iter_validation_results(str(tmp_path), workers=2, index=index))
+
+    assert index.hits == 3
+    assert cold == warm
+    assert cold['skill-0']['metadata']['updated'] == '2024-01-02'
+
+
+def test_parse_errors_fail_validation_and_are_not_indexed(tmp_path):
+    skill = tmp_path / 'broken'
+    skill.mkdir()
+    (skill / 'SKILL.md').write_text('---\nname: [unclosed\n---\n\nBody text that is long enough\n')
+    index = MetadataIndex(str(tmp_path / 'index.json'))
+
+    for _ in range(2):
+        result = skill_processor.validate_skill(str(skill), index)
+        assert not result['valid']
+        assert result['errors'][0].startswith('Failed to parse SKILL.md')
+
+    assert index.lookup(str(skill / 'SKILL.md')) is None
+    assert index.hits == 0
@@ -0,0 +1,126 @@
+"""
+Tests for utils.sync_directory.
+
+Run from the repository root:
+
+    python -m pytest scripts/tests
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import utils
+
+
+def _write(root: Path, files: dict):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def _read(root: Path) -> dict:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob('*') if path.is_file()
+    }
+
+
+def test_sync_directory_applies_changes(tmp_path):
+    source, target = tmp_path / 'source', tmp_path / 'skill'
+    _write(target, {
+        'SKILL.md': b'same',
+        'old.py': b'moved content',
+        'changed.txt': b'before',
+        'gone/file.txt': b'deleted'
+    })
+    _write(source, {
+        'SKILL.md': b'same',
+        'scripts/new.py': b'moved content',
+        'changed.txt': b'after',
+        'added.txt': b'new'
+    })
+    past = 1_000_000_000
+    for path in target.rglob('*'):
+        if path.is_file():
+            os.utime(path, (past, past))
+
+    counts = utils.sync_directory(str(source), str(target))
+
+    assert counts == {'written': 2, 'renamed': 1, 'deleted': 1, 'unchanged': 1}
+    assert _read(target) == _read(source)
+    assert not (target / 'gone').exists()
+    assert (target / 'SKILL.md').stat().st_mtime == past
+    assert (target / 'scripts' / 'new.py').stat().st_mtime == past
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['skill', 'source']
+
+
+def test_sync_directory_failure_leaves_target_untouched(tmp_path, monkeypatch):
+    source, target = tmp_path / 'source', tmp_path / 'skill'
+    _write(target, {'SKILL.md': b'old', 'a.txt': b'a'})
+    _write(source, {'SKILL.md': b'new', 'b.txt': b'b'})
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(utils.shutil, 'copy2', fail)
+    with pytest.raises(OSError):
+        utils.sync_directory(str(source), str(target))
+
+    assert _read(target) == {'SKILL.md': b'old', 'a.txt': b'a'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['skill', 'source']
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='RENAME_EXCHANGE is Linux-only')
+def test_sync_directory_exchanges_trees(tmp_path, monkeypatch):
+    source, target = tmp_path / 'source', tmp_path / 'skill'
+    _write(target, {'SKILL.md': b'old'})
+    _write(source, {'SKILL.md': b'new'})
+
+    def no_rename(*args):
+        raise AssertionError('target was renamed away instead of exchanged')
+
+    monkeypatch.setattr(utils.os, 'rename', no_rename)
+    utils.sync_directory(str(source), str(target))
+
+    assert _read(target) == {'SKILL.md': b'new'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['skill', 'source']
+
+
+def test_sync_directory_without_exchange(tmp_path, monkeypatch):
+    source, target = tmp_path / 'source', tmp_path / 'skill'
+    _write(target, {'SKILL.md': b'old'})
+    _write(source, {'SKILL.md': b'new'})
+    monkeypatch.setattr(utils, '_exchange_paths', lambda first, second: False)
+
+    utils.sync_directory(str(source), str(target))
+
+    assert _read(target) == {'SKILL.md': b'new'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['skill', 'source']
+
+
+def test_recover_sync_restores_interrupted_swap(tmp_path):
+    target = tmp_path / 'skill'
+    _write(tmp_path / '.skill.old-abc', {'SKILL.md': b'old'})
+    _write(tmp_path / '.skill.new-def', {'SKILL.md': b'new'})
+
+    assert utils.recover_sync(str(target))
+
+    assert _read(target) == {'SKILL.md': b'old'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['skill']
+    assert not utils.recover_sync(str(target))
+
+
+def test_recover_sync_restores_most_recent_retired_tree(tmp_path):
+    target = tmp_path / 'skill'
+    _write(tmp_path / '.skill.old-zzz', {'SKILL.md': b'older'})
+    _write(tmp_path / '.skill.old-aaa', {'SKILL.md': b'newer'})
+    os.utime(tmp_path / '.skill.old-zzz', ns=(10**18, 10**18))
+
+    assert utils.recover_sync(str(target))
+
+    assert _read(target) == {'SKILL.md': b'newer'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['skill']
+
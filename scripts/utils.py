@@ -1,12 +1,21 @@
 """
 Utility functions for fetching external Claude skills.
 """
+import ctypes
+import errno
+import os
 import re
+import hashlib
 import logging
 import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import urlparse
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 def setup_logging(log_file: str = "fetch_skills.log", level: int = logging.INFO):
@@ -42,6 +51,98 @@ def setup_logging(log_file: str = "fetch_skills.log", level: int = logging.INFO)
     return logger
 
 
+# Thread-local key identifying which unit of work the current thread logs for
+_log_context = threading.local()
+
+
+class OrderedLogBuffer(logging.Handler):
+    """
+    Logging handler that holds records per work key until they are flushed.
+
+    Records emitted outside a log_context() block are forwarded immediately.
+    This lets concurrent workers log freely while the output still appears
+    grouped and in submission order.
+    """
+
+    def __init__(self, targets: List[logging.Handler]):
+        """
+        Initialize log buffer.
+
+        Args:
+            targets: Handlers that buffered records are eventually sent to
+        """
+        super().__init__(logging.DEBUG)
+        self.targets = targets
+        self.buffers: Dict[object, List[logging.LogRecord]] = {}
+        self.buffer_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord):
+        key = getattr(_log_context, 'key', None)
+        if key is None:
+            self._forward(record)
+            return
+
+        with self.buffer_lock:
+            self.buffers.setdefault(key, []).append(record)
+
+    def _forward(self, record: logging.LogRecord):
+        for handler in self.targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def flush_key(self, key: object):
+        """Forward all records buffered under key, in emission order."""
+        with self.buffer_lock:
+            records = self.buffers.pop(key, [])
+
+        for record in records:
+            self._forward(record)
+
+    def flush_all(self):
+        """Forward every remaining buffered record."""
+        with self.buffer_lock:
+            keys = list(self.buffers)
+
+        for key in keys:
+            self.flush_key(key)
+
+
+@contextmanager
+def ordered_log_capture():
+    """
+    Temporarily route root logger output through an OrderedLogBuffer.
+
+    Yields:
+        The OrderedLogBuffer, so callers can flush keys as work completes
+    """
+    root = logging.getLogger()
+    original_handlers = root.handlers[:]
+    log_buffer = OrderedLogBuffer(original_handlers)
+    root.handlers = [log_buffer]
+
+    try:
+        yield log_buffer
+    finally:
+        root.handlers = original_handlers
+        log_buffer.flush_all()
+
+
+@contextmanager
+def log_context(key: object):
+    """
+    Tag log records emitted by the current thread with a work key.
+
+    Args:
+        key: Key records are buffered under (see OrderedLogBuffer)
+    """
+    previous = getattr(_log_context, 'key', None)
+    _log_context.key = key
+    try:
+        yield
+    finally:
+        _log_context.key = previous
+
+
 def to_kebab_case(name: str) -> str:
     """
     Convert a string to kebab-case.
@@ -182,3 +283,225 @@ def remove_directory(path: str, ignore_errors: bool = False) -> bool:
     except Exception as e:
         logging.error(f"Failed to remove directory {path}: {e}")
         return False
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file, reading it in chunks.
+
+    Args:
+        path: Path to file
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _list_files(root: Path) -> Dict[str, Path]:
+    """Map each file's POSIX-style relative path to its full path."""
+    return {
+        path.relative_to(root).as_posix(): path
+        for path in root.rglob('*')
+        if path.is_file()
+    }
+
+
+def _link_or_copy(source: Path, target: Path):
+    """Hard-link source to target, or copy it with its mtime where links fail."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _exchange_paths(first: Path, second: Path) -> bool:
+    """
+    Atomically swap two paths with renameat2(RENAME_EXCHANGE).
+
+    Returns:
+        True if swapped, False where the platform or file system cannot
+        exchange (the paths are then untouched)
+
+    Raises:
+        OSError: The exchange failed for another reason
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (AttributeError, OSError):
+        return False
+
+    renameat2.argtypes = [
+        ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint
+    ]
+    at_fdcwd, rename_exchange = -100, 2
+    result = renameat2(
+        at_fdcwd, os.fsencode(first), at_fdcwd, os.fsencode(second), rename_exchange
+    )
+    if result == 0:
+        return True
+
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(error, os.strerror(error), str(first), None, str(second))
+
+
+def _retired_order(path: Path) -> Tuple[int, int]:
+    """Sort key of a retired tree: the time it was retired, else its mtime."""
+    stamp = path.name.rpartition('.old-')[2].split('-', 1)[0]
+    if stamp.isdigit():
+        return int(stamp), 0
+    try:
+        return 0, path.stat().st_mtime_ns
+    except OSError:
+        return 0, 0
+
+
+def recover_sync(target_dir: str) -> bool:
+    """
+    Clean up after a sync_directory() call that was interrupted.
+
+    If target_dir is missing but a retired tree of it is left over, that
+    tree is put back. Any other staging or retired trees of target_dir are
+    deleted. Call this while no sync of target_dir is running.
+
+    Args:
+        target_dir: Directory that was being updated
+
+    Returns:
+        True if anything was restored or deleted
+    """
+    target_root = Path(target_dir)
+    if not target_root.parent.is_dir():
+        return False
+
+    # Oldest first, so the most recently retired tree is the one restored
+    retired = sorted(
+        target_root.parent.glob(f'.{target_root.name}.old-*'),
+        key=_retired_order
+    )
+    staged = sorted(target_root.parent.glob(f'.{target_root.name}.new-*'))
+
+    recovered = False
+    if not target_root.exists() and retired:
+        os.rename(retired.pop(), target_root)
+        logging.warning(f"Restored {target_root} from an interrupted update")
+        recovered = True
+
+    for leftover in retired + staged:
+        logging.info(f"Removing leftover of an interrupted update: {leftover}")
+        shutil.rmtree(leftover, ignore_errors=True)
+        recovered = True
+
+    return recovered
+
+
+def sync_directory(source_dir: str, target_dir: str) -> Dict[str, int]:
+    """
+    Make target_dir match source_dir, rewriting only files that differ.
+
+    The new tree is built in a staging directory beside target_dir, so a
+    failure before the swap leaves target_dir untouched. On Linux the two
+    trees are then exchanged with renameat2(RENAME_EXCHANGE), so target_dir
+    always holds either the complete old or the complete new tree.
+    Elsewhere they are swapped with two renames, which leaves target_dir
+    missing for a moment; if the process dies in between, recover_sync()
+    puts the old tree back.
+    Files are compared by size, then content hash. Unchanged files are
+    hard-linked into the staging tree, so they keep their mtimes; a
+    deleted file whose content reappears under a new name is linked
+    rather than rewritten. Only changed and new files are copied.
+
+    Args:
+        source_dir: Directory with the desired contents
+        target_dir: Directory to update
+
+    Returns:
+        Dict with counts of 'written', 'renamed', 'deleted' and 'unchanged'
+        files
+    """
+    source_root = Path(source_dir)
+    target_root = Path(target_dir)
+    recover_sync(target_dir)
+    target_root.mkdir(parents=True, exist_ok=True)
+
+    source_files = _list_files(source_root)
+    target_files = _list_files(target_root)
+    counts = {'written': 0, 'renamed': 0, 'deleted': 0, 'unchanged': 0}
+
+    staging = Path(tempfile.mkdtemp(dir=target_root.parent, prefix=f'.{target_root.name}.new-'))
+    try:
+        shutil.copystat(target_root, staging)
+        for path in source_root.rglob('*'):
+            if path.is_dir():
+                (staging / path.relative_to(source_root)).mkdir(parents=True, exist_ok=True)
+
+        # Index removed files by content so moves reuse the old file
+        removed: Dict[Tuple[int, str], List[str]] = {}
+        for rel_path in sorted(target_files.keys() - source_files.keys()):
+            target = target_files[rel_path]
+            key = (target.stat().st_size, file_digest(target))
+            removed.setdefault(key, []).append(rel_path)
+
+        for rel_path in sorted(source_files):
+            source = source_files[rel_path]
+            target = target_files.get(rel_path)
+            staged = staging / rel_path
+
+            if target is not None:
+                if (source.stat().st_size == target.stat().st_size
+                        and file_digest(source) == file_digest(target)):
+                    _link_or_copy(target, staged)
+                    counts['unchanged'] += 1
+                    continue
+            else:
+                candidates = removed.get((source.stat().st_size, file_digest(source)))
+                if candidates:
+                    _link_or_copy(target_files[candidates.pop()], staged)
+                    counts['renamed'] += 1
+                    continue
+
+            staged.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, staged)
+            counts['written'] += 1
+
+        counts['deleted'] = sum(len(rel_paths) for rel_paths in removed.values())
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Swap the trees; after an exchange the staging path holds the old one
+    try:
+        exchanged = _exchange_paths(staging, target_root)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if exchanged:
+        shutil.rmtree(staging, ignore_errors=True)
+        return counts
+
+    # Restore the old tree if the new one cannot go in
+    retired = Path(tempfile.mkdtemp(
+        dir=target_root.parent,
+        prefix=f'.{target_root.name}.old-{time.time_ns()}-'
+    ))
+    retired.rmdir()
+    os.rename(target_root, retired)
+    try:
+        os.rename(staging, target_root)
+    except Exception:
+        os.rename(retired, target_root)
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    shutil.rmtree(retired, ignore_errors=True)
+
+    return counts